@@ -0,0 +1,69 @@
+"""Aggregation Agent - Builds catalog-level group-by content blocks."""
+
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from .base_agent import BaseAgent
+from ..models import ProductModel, Question, ContentBlock
+from ..content_logic.aggregate_blocks import CatalogIndex, generate_aggregate_blocks, iter_aggregate_blocks
+from ..pipeline.spill import MemoryBudget
+
+
+class AggregationAgent(BaseAgent):
+    """Agent responsible for category-level content across the catalog.
+    
+    Products are fed in one at a time with ``add`` as the batch runs, so the
+    group-by index is built in the same pass as per-product generation.
+    During a batch a product is first ``stage``d while its pages are built
+    and only posted by ``commit`` once they are written, so products whose
+    write failed never appear on aggregate pages. Index postings are held
+    within ``budget`` and spill to disk beyond it.
+    """
+    
+    def __init__(self, min_products: int = 1, budget: Optional[MemoryBudget] = None):
+        super().__init__("Aggregation")
+        self.min_products = min_products
+        self.index = CatalogIndex(budget)
+        self._staged: Dict[str, Tuple[ProductModel, List[Question]]] = {}
+    
+    def add(self, product: ProductModel, questions: List[Question]) -> None:
+        """Post one product to the catalog index."""
+        self.index.add(product, questions)
+    
+    def stage(self, product: ProductModel, questions: List[Question]) -> None:
+        """Hold a product until ``commit`` or ``discard`` is called with its key."""
+        self._staged[product.key] = (product, questions)
+    
+    def commit(self, key: str) -> None:
+        """Post a staged product to the catalog index."""
+        staged = self._staged.pop(key, None)
+        if staged is not None:
+            self.add(*staged)
+    
+    def discard(self, key: str) -> None:
+        """Drop a staged product without posting it."""
+        self._staged.pop(key, None)
+    
+    def process(self, input_data: Dict[str, Any]) -> Dict[str, ContentBlock]:
+        """Generate aggregate blocks, first indexing any ``products`` given as input.
+        
+        ``products`` is an iterable of ``(ProductModel, questions)`` pairs.
+        """
+        self.log_processing("Starting aggregation")
+        
+        products: Iterable = input_data.get('products', [])
+        for product, questions in products:
+            if not isinstance(product, ProductModel):
+                raise ValueError("Invalid product data")
+            self.add(product, questions)
+        
+        blocks = generate_aggregate_blocks(self.index, self.min_products)
+        self.log_processing("Aggregation completed", f"Generated {len(blocks)} aggregate blocks")
+        return blocks
+    
+    def iter_blocks(self) -> Iterator[Tuple[str, ContentBlock]]:
+        """Stream aggregate blocks one group at a time, then release the index."""
+        try:
+            yield from iter_aggregate_blocks(self.index, self.min_products)
+        finally:
+            if self.index.budget.spilled:
+                self.logger.info("Aggregation spilled %d postings to disk", self.index.budget.spilled)
+            self.index.close()
@@ -0,0 +1,157 @@
+"""Async Orchestrator Agent - Overlaps parsing, generation and output I/O."""
+
+import asyncio
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .orchestrator_agent import OrchestratorAgent
+from ..output.base import OutputWriter
+from ..pipeline.checkpoint import ProgressManifest, FAILED
+from ..pipeline.progress import ProgressReporter
+from ..settings import Settings
+
+# Marks the end of a stage's input
+_DONE = object()
+
+
+class AsyncOrchestratorAgent(OrchestratorAgent):
+    """Orchestrator variant that runs batch stages as an asyncio pipeline.
+    
+    Parsing, page generation and output writing are connected by bounded
+    queues, so the next product is parsed while the current one is generated
+    and the previous one is written. File writes run in a thread pool; when
+    the disk falls behind, the full queues stall the upstream stages and keep
+    the number of in-flight products bounded.
+    """
+    
+    def __init__(self, competitors: Optional[List[Dict[str, Any]]] = None,
+                 settings: Optional[Settings] = None,
+                 queue_size: int = 16, write_workers: int = 4):
+        super().__init__(competitors, settings)
+        self.agent_id = "AsyncOrchestrator"
+        self.queue_size = queue_size
+        self.write_workers = write_workers
+    
+    def process_batch(self, product_records: Iterable[Dict[str, Any]],
+                      output_dir: str = "output", total: Optional[int] = None,
+                      progress_interval: float = 5.0,
+                      manifest: Optional[ProgressManifest] = None,
+                      writer: Optional[OutputWriter] = None,
+                      aggregate: bool = False,
+                      locales: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Synchronous entry point that runs the async pipeline to completion."""
+        return asyncio.run(self.process_batch_async(
+            product_records, output_dir, total, progress_interval, manifest, writer, aggregate, locales
+        ))
+    
+    async def process_batch_async(self, product_records: Iterable[Dict[str, Any]],
+                                  output_dir: str = "output", total: Optional[int] = None,
+                                  progress_interval: float = 5.0,
+                                  manifest: Optional[ProgressManifest] = None,
+                                  writer: Optional[OutputWriter] = None,
+                                  aggregate: bool = False,
+                                  locales: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Run the batch pipeline with overlapped stages.
+        
+        ``writer.write`` is called from worker threads, so custom writers
+        must be thread-safe. With ``locales``, each product's pages are
+        written once per locale under ``<product key>/<locale>``.
+        """
+        writer = writer or self.create_writer(output_dir, durable=manifest is not None)
+        views = writer.accepts_views
+        if manifest is not None:
+            # Products reach the manifest only after their pages are durable
+            manifest.before_flush = writer.flush
+        aggregator = self._create_aggregator() if aggregate else None
+        progress = ProgressReporter(self.logger, total=total, interval=progress_interval)
+        failures: List[Dict[str, Any]] = []
+        parsed_queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        write_queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        
+        def fail(index: int, error: Exception, key: Optional[str] = None) -> None:
+            self.logger.warning("Product #%d failed: %s", index, error)
+            failures.append({"index": index, "error": str(error)})
+            progress.update(succeeded=False)
+            if key is not None:
+                if aggregator is not None:
+                    aggregator.discard(key)
+                if manifest is not None:
+                    manifest.record(key, FAILED)
+        
+        async def parse_stage() -> None:
+            for index, raw_data in enumerate(product_records):
+                try:
+                    product = self.parse_product(raw_data)
+                except Exception as e:
+                    fail(index, e)
+                else:
+                    if manifest is not None and manifest.is_completed(product.key):
+                        if aggregator is not None:
+                            aggregator.add(product, self._questions(product))
+                        progress.update(skipped=True)
+                    else:
+                        await parsed_queue.put((index, product))
+                # Yield so downstream stages interleave with parsing
+                await asyncio.sleep(0)
+            await parsed_queue.put(_DONE)
+        
+        async def generate_stage() -> None:
+            while True:
+                item = await parsed_queue.get()
+                if item is _DONE:
+                    break
+                index, product = item
+                try:
+                    if locales:
+                        localized_pages = self._build_localized_pages(product, locales, aggregator, views)
+                        writes = [(f"{product.key}/{locale}", pages)
+                                  for locale, pages in localized_pages.items()]
+                    else:
+                        writes = [(product.key, self._build_pages(product, aggregator, views))]
+                except Exception as e:
+                    fail(index, e, product.key)
+                else:
+                    await write_queue.put((index, product, writes))
+                await asyncio.sleep(0)
+            for _ in range(self.write_workers):
+                await write_queue.put(_DONE)
+        
+        def write_all(writes: List[Tuple[str, Dict[str, Any]]], digest) -> None:
+            for key, pages in writes:
+                writer.write(key, pages, digest)
+        
+        async def write_stage(executor: ThreadPoolExecutor) -> None:
+            loop = asyncio.get_running_loop()
+            while True:
+                item = await write_queue.get()
+                if item is _DONE:
+                    break
+                index, product, writes = item
+                digest = hashlib.sha256()
+                try:
+                    await loop.run_in_executor(executor, write_all, writes, digest)
+                except Exception as e:
+                    fail(index, e, product.key)
+                else:
+                    if aggregator is not None:
+                        aggregator.commit(product.key)
+                    progress.update()
+                    if manifest is not None:
+                        manifest.record(product.key, output_hash=digest.hexdigest())
+        
+        with ThreadPoolExecutor(self.write_workers, thread_name_prefix="page-writer") as executor:
+            await asyncio.gather(
+                parse_stage(),
+                generate_stage(),
+                *(write_stage(executor) for _ in range(self.write_workers))
+            )
+        
+        if manifest is not None:
+            manifest.flush()
+        progress.finish()
+        return {
+            "completed": progress.completed,
+            "failed": sorted(failures, key=lambda failure: failure["index"]),
+            "aggregate_pages": self._write_aggregates(aggregator, writer)
+        }
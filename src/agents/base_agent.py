@@ -24,6 +24,11 @@ class BaseAgent(ABC):
             return False
         return True
     
-    def log_processing(self, stage: str, details: str = ""):
-        """Log processing stage."""
-        self.logger.info("[%s] %s: %s", self.agent_id, stage, details)
\ No newline at end of file
+    def log_processing(self, stage: str, details: str = "", level: int = logging.DEBUG):
+        """Log processing stage.
+
+        Stage messages are per-product chatter, so they default to DEBUG;
+        batch runs report aggregated progress instead.
+        """
+        if self.logger.isEnabledFor(level):
+            self.logger.log(level, "[%s] %s: %s", self.agent_id, stage, details)
\ No newline at end of file
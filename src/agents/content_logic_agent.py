@@ -1,17 +1,24 @@
 """Content Logic Agent - Applies transformation rules to create content blocks."""
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Optional
 from .base_agent import BaseAgent
 from ..models import ProductModel, Question, ContentBlock
 from ..content_logic.content_blocks import ContentLogicBlocks
+from ..content_logic.product_facts import ComparisonFacts
 
 
 class ContentLogicAgent(BaseAgent):
     """Agent responsible for creating reusable content blocks."""
     
-    def __init__(self):
+    def __init__(self, enabled_blocks: Optional[Iterable[str]] = None):
         super().__init__("ContentLogic")
         self.content_blocks = ContentLogicBlocks()
+        # None enables every block type; otherwise unlisted blocks are never computed
+        self.enabled_blocks = frozenset(enabled_blocks) if enabled_blocks is not None else None
+    
+    def is_enabled(self, block_type: str) -> bool:
+        """Whether ``block_type`` is generated by this agent."""
+        return self.enabled_blocks is None or block_type in self.enabled_blocks
     
     def process(self, input_data: Dict[str, Any]) -> Dict[str, ContentBlock]:
         """Generate content blocks from product data and questions."""
@@ -20,6 +27,7 @@ class ContentLogicAgent(BaseAgent):
         product = input_data.get('product')
         questions = input_data.get('questions', [])
         comparison_product = input_data.get('comparison_product')
+        competitors = input_data.get('competitors', [])
         
         if not isinstance(product, ProductModel):
             raise ValueError("Invalid product data")
@@ -27,21 +35,96 @@ class ContentLogicAgent(BaseAgent):
         content_blocks = {}
         
         # Generate core content blocks
-        content_blocks['benefits'] = self.content_blocks.generate_benefits_block(product)
-        content_blocks['usage'] = self.content_blocks.generate_usage_block(product)
-        content_blocks['safety'] = self.content_blocks.generate_safety_block(product)
-        content_blocks['ingredients'] = self.content_blocks.generate_ingredients_block(product)
+        if self.is_enabled('benefits'):
+            content_blocks['benefits'] = self.content_blocks.generate_benefits_block(product)
+        if self.is_enabled('usage'):
+            content_blocks['usage'] = self.content_blocks.generate_usage_block(product)
+        if self.is_enabled('safety'):
+            content_blocks['safety'] = self.content_blocks.generate_safety_block(product)
+        if self.is_enabled('ingredients'):
+            content_blocks['ingredients'] = self.content_blocks.generate_ingredients_block(product)
         
         # Generate FAQ block if questions provided
-        if questions:
+        if questions and self.is_enabled('faq'):
             content_blocks['faq'] = self.content_blocks.generate_faq_block(questions)
         
+        comparison_product = comparison_product if self.is_enabled('comparison') else None
+        competitors = competitors if self.is_enabled('multi_comparison') else []
+        
+        # Normalize the product once for every comparison it takes part in
+        if comparison_product or competitors:
+            product_facts = ComparisonFacts.from_product(product)
+        
         # Generate comparison block if comparison product provided
         if comparison_product:
             content_blocks['comparison'] = self.content_blocks.generate_comparison_block(
-                product, comparison_product
+                product_facts, comparison_product
+            )
+        
+        # Generate multi-product comparison block if competitors provided
+        if competitors:
+            content_blocks['multi_comparison'] = self.content_blocks.generate_multi_comparison_block(
+                product_facts, competitors
             )
         
         self.log_processing("Content block generation completed", 
                           f"Generated {len(content_blocks)} blocks")
-        return content_blocks
\ No newline at end of file
+        return content_blocks
+    
+    def process_batch(self, input_data: Dict[str, Any]) -> List[Dict[str, ContentBlock]]:
+        """Generate content blocks for many products with one call per block type.
+        
+        ``input_data`` holds ``products`` and optionally ``questions`` (one
+        list per product), ``comparison_product`` and ``competitors``. Returns
+        one block dict per product, matching ``process`` product by product.
+        """
+        products = list(input_data.get('products', []))
+        question_lists = input_data.get('questions') or [[] for _ in products]
+        comparison_product = input_data.get('comparison_product')
+        competitors = input_data.get('competitors', [])
+        
+        if not all(isinstance(product, ProductModel) for product in products):
+            raise ValueError("Invalid product data")
+        if len(question_lists) != len(products):
+            raise ValueError("Expected one question list per product")
+        
+        self.log_processing("Starting batch content block generation", f"{len(products)} products")
+        
+        columns: Dict[str, List[Optional[ContentBlock]]] = {}
+        if self.is_enabled('benefits'):
+            columns['benefits'] = self.content_blocks.generate_benefits_blocks(products)
+        if self.is_enabled('usage'):
+            columns['usage'] = self.content_blocks.generate_usage_blocks(products)
+        if self.is_enabled('safety'):
+            columns['safety'] = self.content_blocks.generate_safety_blocks(products)
+        if self.is_enabled('ingredients'):
+            columns['ingredients'] = self.content_blocks.generate_ingredients_blocks(products)
+        if self.is_enabled('faq'):
+            columns['faq'] = [
+                self.content_blocks.generate_faq_block(questions) if questions else None
+                for questions in question_lists
+            ]
+        
+        comparison_product = comparison_product if self.is_enabled('comparison') else None
+        competitors = competitors if self.is_enabled('multi_comparison') else []
+        
+        # Normalize each product once for every comparison it takes part in
+        if comparison_product or competitors:
+            product_facts = [ComparisonFacts.from_product(product) for product in products]
+        if comparison_product:
+            columns['comparison'] = self.content_blocks.generate_comparison_blocks(
+                product_facts, comparison_product
+            )
+        if competitors:
+            columns['multi_comparison'] = self.content_blocks.generate_multi_comparison_blocks(
+                product_facts, competitors
+            )
+        
+        results = [
+            {block_type: blocks[i] for block_type, blocks in columns.items() if blocks[i] is not None}
+            for i in range(len(products))
+        ]
+        
+        self.log_processing("Batch content block generation completed",
+                          f"Generated {sum(len(blocks) for blocks in results)} blocks")
+        return results
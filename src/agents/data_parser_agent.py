@@ -3,6 +3,7 @@
 from typing import Dict, Any
 from .base_agent import BaseAgent
 from ..models import ProductModel
+from ..pipeline.feed import MalformedRecord
 
 
 class DataParserAgent(BaseAgent):
@@ -15,6 +16,8 @@ class DataParserAgent(BaseAgent):
         """Convert raw product data into structured ProductModel."""
         self.log_processing("Starting data parsing")
         
+        if isinstance(raw_data, MalformedRecord):
+            raise raw_data.to_error()
         if not self.validate_input(raw_data, dict):
             raise ValueError("Invalid input data format")
         
@@ -1,63 +1,332 @@
 """Orchestrator Agent - Coordinates the entire multi-agent workflow."""
 
-import json
-import os
-from typing import Dict, Any
+import hashlib
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 from datetime import datetime
 from .base_agent import BaseAgent
 from .data_parser_agent import DataParserAgent
 from .question_generator_agent import QuestionGeneratorAgent
 from .content_logic_agent import ContentLogicAgent
 from .template_engine_agent import TemplateEngineAgent
-from ..models import ProductModel
+from .aggregation_agent import AggregationAgent
+from ..models import ProductModel, GeneratedPage, ContentBlock
+from ..content_logic.product_facts import ComparisonFacts
+from ..output.base import OutputWriter
+from ..output.json_files import JsonFileWriter, PageOrView
+from ..output.streaming import page_view
+from ..pipeline.checkpoint import ProgressManifest, FAILED
+from ..pipeline.feed import MalformedRecord
+from ..pipeline.progress import ProgressReporter
+from ..pipeline.spill import MemoryBudget
+from ..settings import Settings
+
+
+# Product key under which catalog-level aggregate pages are written
+AGGREGATES_KEY = "_aggregates"
 
 
 class OrchestratorAgent(BaseAgent):
-    """Main orchestrator that coordinates all agents in the pipeline."""
+    """Main orchestrator that coordinates all agents in the pipeline.
+    
+    The stage list is derived from ``settings``: disabled agents, content
+    blocks, question categories, templates and metadata are never computed.
+    Without settings every stage runs.
+    """
     
-    def __init__(self):
+    def __init__(self, competitors: Optional[List[Dict[str, Any]]] = None,
+                 settings: Optional[Settings] = None):
         super().__init__("Orchestrator")
+        self.settings = settings or Settings()
+        
+        parser_config = self.settings.agent('data_parser')
+        question_config = self.settings.agent('question_generator')
+        content_config = self.settings.agent('content_logic')
+        template_config = self.settings.agent('template_engine')
+        self.output_options = {
+            'indent': self.settings.output.get('indent', 2),
+            'ensure_ascii': self.settings.output.get('ensure_ascii', False),
+            'include_metadata': self.settings.output.get('include_metadata', True)
+        }
         
         # Initialize all agents
         self.data_parser = DataParserAgent()
-        self.question_generator = QuestionGeneratorAgent()
-        self.content_logic = ContentLogicAgent()
-        self.template_engine = TemplateEngineAgent()
+        self.question_generator = QuestionGeneratorAgent(categories=question_config.get('categories'))
+        self.content_logic = ContentLogicAgent(content_config.get('content_blocks'))
+        self.template_engine = TemplateEngineAgent(
+            templates=template_config.get('templates'),
+            include_metadata=self.output_options['include_metadata']
+        )
+        
+        # Build the stage list
+        self.parser_enabled = parser_config.get('enabled', True)
+        self.content_logic_enabled = content_config.get('enabled', True)
+        self.template_engine_enabled = template_config.get('enabled', True)
+        # Questions only feed the FAQ block, so skip them when it cannot be built
+        self.questions_enabled = (
+            question_config.get('enabled', True)
+            and self.content_logic_enabled and self.content_logic.is_enabled('faq')
+        )
+        
+        # The fictional comparator is identical for every product
+        self.comparison_product = self._create_fictional_comparison_product()
+        
+        # Comparators are normalized once and reused for every product page
+        self.comparison_facts = ComparisonFacts.from_product(self.comparison_product)
+        self.competitor_facts = [
+            ComparisonFacts.from_product(self.parse_product(dict(raw_data)))
+            for raw_data in competitors or []
+        ]
     
     def process(self, input_data: Dict[str, Any]) -> Dict[str, str]:
         """Execute the complete multi-agent pipeline."""
         self.log_processing("Starting multi-agent pipeline")
         
+        product = self.parse_product(input_data['product_data'])
+        page_views = self._build_pages(product, views=True)
+        
+        # Step 6: Write output files
+        output_files = self._write_output_files(
+            page_views, input_data.get('output_dir', 'output')
+        )
+        
+        self.log_processing("Pipeline completed successfully")
+        return output_files
+    
+    def process_batch(self, product_records: Iterable[Dict[str, Any]],
+                      output_dir: str = "output", total: Optional[int] = None,
+                      progress_interval: float = 5.0,
+                      manifest: Optional[ProgressManifest] = None,
+                      writer: Optional[OutputWriter] = None,
+                      aggregate: bool = False,
+                      locales: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Run the pipeline over many products, one output directory per product.
+        
+        Progress is logged at a fixed rate rather than per product; individual
+        failures are recorded and do not abort the batch. With a ``manifest``,
+        products it lists as completed are skipped and every outcome is
+        checkpointed so an interrupted run can resume. ``writer`` replaces the
+        default per-product JSON files under ``output_dir``. With
+        ``aggregate``, catalog-level group pages are built in the same pass
+        and written under ``AGGREGATES_KEY`` at the end. With ``locales``,
+        each product's pages are written once per locale under
+        ``<product key>/<locale>``. Writers that accept lazy page views are
+        streamed pages straight from the content blocks.
+        """
+        writer = writer or self.create_writer(output_dir, durable=manifest is not None)
+        views = writer.accepts_views
+        if manifest is not None:
+            # Products reach the manifest only after their pages are durable
+            manifest.before_flush = writer.flush
+        aggregator = self._create_aggregator() if aggregate else None
+        progress = ProgressReporter(self.logger, total=total, interval=progress_interval)
+        failures = []
+        
+        for index, raw_data in enumerate(product_records):
+            product = None
+            try:
+                product = self.parse_product(raw_data)
+                if manifest is not None and manifest.is_completed(product.key):
+                    if aggregator is not None:
+                        aggregator.add(product, self._questions(product))
+                    progress.update(skipped=True)
+                    continue
+                
+                digest = hashlib.sha256()
+                if locales:
+                    localized_pages = self._build_localized_pages(product, locales, aggregator, views)
+                    for locale, generated_pages in localized_pages.items():
+                        writer.write(f"{product.key}/{locale}", generated_pages, digest)
+                else:
+                    writer.write(product.key, self._build_pages(product, aggregator, views), digest)
+            except Exception as e:
+                self.logger.warning("Product #%d failed: %s", index, e)
+                failures.append({"index": index, "error": str(e)})
+                progress.update(succeeded=False)
+                if product is not None:
+                    if aggregator is not None:
+                        aggregator.discard(product.key)
+                    if manifest is not None:
+                        manifest.record(product.key, FAILED)
+            else:
+                if aggregator is not None:
+                    aggregator.commit(product.key)
+                progress.update()
+                if manifest is not None:
+                    manifest.record(product.key, output_hash=digest.hexdigest())
+        
+        if manifest is not None:
+            manifest.flush()
+        progress.finish()
+        return {
+            "completed": progress.completed,
+            "failed": failures,
+            "aggregate_pages": self._write_aggregates(aggregator, writer)
+        }
+    
+    def parse_product(self, product_data: Dict[str, Any]) -> ProductModel:
+        """Parse raw data with the Data Parser, or trust pre-normalized data if it is disabled."""
+        if self.parser_enabled:
+            return self.data_parser.process(product_data)
+        if isinstance(product_data, ProductModel):
+            return product_data
+        if isinstance(product_data, MalformedRecord):
+            raise product_data.to_error()
+        return ProductModel.from_raw_data(product_data)
+    
+    def create_writer(self, output_dir: str = "output", per_product_dirs: bool = True,
+                      durable: bool = False) -> JsonFileWriter:
+        """JSON file writer using the configured output options."""
+        return JsonFileWriter(output_dir, per_product_dirs, durable=durable, **self.output_options)
+    
+    def generate_pages(self, product_data: Dict[str, Any]) -> Dict[str, GeneratedPage]:
+        """Run the agent stages for one product without writing any output."""
+        return self._run_stages(product_data)[1]
+    
+    def generate_pages_batch(self, records: List[Dict[str, Any]]) -> List[Any]:
+        """Generate pages for several products with one content logic call.
+        
+        Returns, in order, each record's pages or the exception it raised, so
+        one bad record does not fail the others.
+        """
+        results: List[Any] = [None] * len(records)
+        positions, products, question_lists = [], [], []
+        for position, product_data in enumerate(records):
+            try:
+                product = self.parse_product(product_data)
+                question_lists.append(self._questions(product))
+            except Exception as e:
+                results[position] = e
+                continue
+            positions.append(position)
+            products.append(product)
+        
+        for position, product, content_blocks in zip(
+                positions, products, self._content_blocks_batch(products, question_lists)):
+            try:
+                results[position] = self._render_pages(content_blocks, product)
+            except Exception as e:
+                results[position] = e
+        return results
+    
+    def generate_localized_pages(self, product_data: Dict[str, Any],
+                                 locales: List[str]) -> Dict[str, Dict[str, GeneratedPage]]:
+        """Generate one product's pages for several locales in a single pass."""
+        product = self.parse_product(product_data)
+        return self._build_localized_pages(product, locales)
+    
+    def _run_stages(self, product_data: Dict[str, Any]) -> Tuple[ProductModel, Dict[str, GeneratedPage]]:
+        """Run parsing through templating, returning the parsed product and its pages."""
         # Step 1: Parse raw product data
-        product = self.data_parser.process(input_data['product_data'])
+        product = self.parse_product(product_data)
+        return product, self._build_pages(product)
+    
+    def _build_pages(self, product: ProductModel, aggregator: Optional[AggregationAgent] = None,
+                     views: bool = False) -> Dict[str, PageOrView]:
+        """Run question generation, content logic and templating for a parsed product.
         
-        # Step 2: Generate comparison product (fictional)
-        comparison_product = self._create_fictional_comparison_product()
+        If an ``aggregator`` is given the product is also staged for its
+        index; the caller commits it once the pages are written.
+        With ``views``, lazy page views are returned instead of GeneratedPages.
+        """
+        # Step 2: Generate questions
+        questions = self._questions(product)
+        if aggregator is not None:
+            aggregator.stage(product, questions)
+        
+        # Step 3: Generate content blocks against the shared comparators
+        content_blocks = self._content_blocks(product, questions)
+        
+        # Step 4: Generate pages using templates
+        return self._render_pages(content_blocks, product, views=views)
+    
+    def _build_localized_pages(self, product: ProductModel, locales: List[str],
+                               aggregator: Optional[AggregationAgent] = None,
+                               views: bool = False) -> Dict[str, Dict[str, PageOrView]]:
+        """Fan the text-producing stages out over ``locales``.
         
-        # Step 3: Generate questions
-        questions = self.question_generator.process(product)
+        Rule-based content blocks and comparison facts are computed once; only
+        questions, the FAQ block and page templating run per locale.
+        """
+        shared_blocks = self._content_blocks(product, [])
+        if self.questions_enabled:
+            questions_by_locale = self.question_generator.process_locales(product, locales)
+        else:
+            questions_by_locale = {locale: [] for locale in locales}
+        if aggregator is not None:
+            aggregator.stage(product, questions_by_locale[locales[0]])
         
-        # Step 4: Generate content blocks
-        content_input = {
+        localized_pages = {}
+        for locale, questions in questions_by_locale.items():
+            content_blocks = dict(shared_blocks)
+            if questions:
+                content_blocks['faq'] = self.content_logic.content_blocks.generate_faq_block(questions)
+            localized_pages[locale] = self._render_pages(content_blocks, product, locale, views)
+        return localized_pages
+    
+    def _questions(self, product: ProductModel) -> List[Any]:
+        """Questions for the FAQ block, or none when that stage is disabled."""
+        return self.question_generator.process(product) if self.questions_enabled else []
+    
+    def _content_blocks(self, product: ProductModel, questions: List[Any]) -> Dict[str, ContentBlock]:
+        if not self.content_logic_enabled:
+            return {}
+        return self.content_logic.process({
             'product': product,
             'questions': questions,
-            'comparison_product': comparison_product
-        }
-        content_blocks = self.content_logic.process(content_input)
-        
-        # Step 5: Generate pages using templates
+            'comparison_product': self.comparison_facts,
+            'competitors': self.competitor_facts
+        })
+    
+    def _content_blocks_batch(self, products: List[ProductModel],
+                              question_lists: List[List[Any]]) -> List[Dict[str, ContentBlock]]:
+        if not self.content_logic_enabled:
+            return [{} for _ in products]
+        return self.content_logic.process_batch({
+            'products': products,
+            'questions': question_lists,
+            'comparison_product': self.comparison_facts,
+            'competitors': self.competitor_facts
+        })
+    
+    def _render_pages(self, content_blocks: Dict[str, ContentBlock], product: ProductModel,
+                      locale: Optional[str] = None, views: bool = False) -> Dict[str, PageOrView]:
+        """Template the blocks into pages, or emit the raw blocks if templating is disabled."""
+        if not self.template_engine_enabled:
+            if views:
+                return {
+                    block_type: page_view(block_type, block.content, {})
+                    for block_type, block in content_blocks.items()
+                }
+            return {
+                block_type: GeneratedPage(page_type=block_type, content=block.content)
+                for block_type, block in content_blocks.items()
+            }
         template_input = {
             'content_blocks': content_blocks,
             'product': product,
-            'comparison_product': comparison_product
+            'comparison_product': self.comparison_product,
+            'locale': locale
         }
-        generated_pages = self.template_engine.process(template_input)
-        
-        # Step 6: Write output files
-        output_files = self._write_output_files(generated_pages)
-        
-        self.log_processing("Pipeline completed successfully")
-        return output_files
+        if views:
+            return self.template_engine.render_views(template_input)
+        return self.template_engine.process(template_input)
+    
+    def _create_aggregator(self) -> AggregationAgent:
+        """Aggregation agent bounded by the configured memory budget."""
+        return AggregationAgent(budget=MemoryBudget.from_megabytes(self.settings.memory_budget_mb))
+    
+    def _write_aggregates(self, aggregator: Optional[AggregationAgent],
+                          writer: OutputWriter) -> int:
+        """Render and write aggregate pages; returns the number of pages."""
+        if aggregator is None:
+            return 0
+        # One group at a time keeps at most one member list in memory
+        written = 0
+        for group_id, block in aggregator.iter_blocks():
+            writer.write(AGGREGATES_KEY, self.template_engine.process_aggregates({group_id: block}))
+            written += 1
+        self.logger.info("Wrote %d aggregate pages", written)
+        return written
     
     def _create_fictional_comparison_product(self) -> ProductModel:
         """Create a fictional comparison product."""
@@ -74,36 +343,17 @@ class OrchestratorAgent(BaseAgent):
         
         return ProductModel.from_raw_data(fictional_data)
     
-    def _write_output_files(self, generated_pages: Dict[str, Any]) -> Dict[str, str]:
-        """Write generated pages to JSON files."""
-        # Create output directory if it doesn't exist
-        output_dir = "output"
-        os.makedirs(output_dir, exist_ok=True)
-        
-        output_files = {}
+    def _write_output_files(self, generated_pages: Dict[str, PageOrView],
+                            output_dir: str = "output", digest=None) -> Dict[str, str]:
+        """Write generated pages to JSON files.
         
-        # Map page types to required filenames
-        filename_mapping = {
-            'faq': 'faq.json',
-            'product': 'product_page.json',
-            'comparison': 'comparison_page.json'
-        }
+        If a hashlib ``digest`` is given it is updated with the bytes written.
+        """
+        output_files = self.create_writer(output_dir, per_product_dirs=False).write(
+            None, generated_pages, digest
+        )
         
-        for page_type, page in generated_pages.items():
-            filename = filename_mapping.get(page_type, f"{page_type}.json")
-            filepath = os.path.join(output_dir, filename)
-            
-            # Convert GeneratedPage to dict for JSON serialization
-            page_data = {
-                "page_type": page.page_type,
-                "content": page.content,
-                "metadata": page.metadata
-            }
-            
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(page_data, f, indent=2, ensure_ascii=False)
-            
-            output_files[page_type] = filepath
+        for page_type, filepath in output_files.items():
             self.log_processing(f"Written {page_type} page", filepath)
         
-        return output_files
\ No newline at end of file
+        return output_files
@@ -1,15 +1,44 @@
 """Question Generator Agent - Creates categorized user questions."""
 
-from typing import List
+from typing import Dict, Iterable, List, Optional, Sequence
 from .base_agent import BaseAgent
 from ..models import ProductModel, Question, QuestionCategory
+from ..locales.string_tables import DEFAULT_LOCALE, get_string_table
+
+# (category, string key) per question, in output order; the question text
+# is "q.<key>" and the answer "a.<key>" in the locale string table
+QUESTION_SPECS = [
+    (QuestionCategory.INFORMATIONAL, "what_is"),
+    (QuestionCategory.INFORMATIONAL, "main_benefits"),
+    (QuestionCategory.INFORMATIONAL, "skin_types"),
+    (QuestionCategory.SAFETY, "side_effects"),
+    (QuestionCategory.SAFETY, "who_side_effects"),
+    (QuestionCategory.USAGE, "how_to_use"),
+    (QuestionCategory.USAGE, "when_to_apply"),
+    (QuestionCategory.USAGE, "how_much"),
+    (QuestionCategory.PURCHASE, "price"),
+    (QuestionCategory.PURCHASE, "worth_price"),
+    (QuestionCategory.COMPARISON, "compare"),
+    (QuestionCategory.COMPARISON, "unique"),
+    (QuestionCategory.INGREDIENTS, "key_ingredients"),
+    (QuestionCategory.INGREDIENTS, "vitamin_c"),
+    (QuestionCategory.INGREDIENTS, "concentration"),
+]
 
 
 class QuestionGeneratorAgent(BaseAgent):
     """Agent responsible for generating categorized questions about products."""
     
-    def __init__(self):
+    def __init__(self, locale: str = DEFAULT_LOCALE, categories: Optional[Iterable[str]] = None):
         super().__init__("QuestionGenerator")
+        self.locale = locale
+        # Questions in categories that are not listed are never rendered
+        if categories is not None:
+            categories = frozenset(categories)
+        self.question_specs = [
+            (category, key) for category, key in QUESTION_SPECS
+            if categories is None or category.value in categories
+        ]
     
     def process(self, product: ProductModel) -> List[Question]:
         """Generate categorized questions based on product data."""
@@ -18,121 +47,41 @@ class QuestionGeneratorAgent(BaseAgent):
         if not self.validate_input(product, ProductModel):
             raise ValueError("Invalid product model")
         
-        questions = []
-        
-        # Generate questions for each category
-        questions.extend(self._generate_informational_questions(product))
-        questions.extend(self._generate_safety_questions(product))
-        questions.extend(self._generate_usage_questions(product))
-        questions.extend(self._generate_purchase_questions(product))
-        questions.extend(self._generate_comparison_questions(product))
-        questions.extend(self._generate_ingredient_questions(product))
+        questions = self._render(self.product_fragments(product), self.locale)
         
         self.log_processing("Question generation completed", f"Generated {len(questions)} questions")
         return questions
     
-    def _generate_informational_questions(self, product: ProductModel) -> List[Question]:
-        """Generate informational questions."""
-        return [
-            Question(
-                text=f"What is {product.name}?",
-                category=QuestionCategory.INFORMATIONAL,
-                answer=f"{product.name} is a {product.concentration} skincare serum designed for {', '.join(product.skin_types).lower()} skin types."
-            ),
-            Question(
-                text=f"What are the main benefits of {product.name}?",
-                category=QuestionCategory.INFORMATIONAL,
-                answer=f"The main benefits include {', '.join([b.lower() if 'fades' not in b.lower() else b.lower().replace('fades', 'fading') for b in product.benefits])}."
-            ),
-            Question(
-                text="What skin types is this product suitable for?",
-                category=QuestionCategory.INFORMATIONAL,
-                answer=f"This product is suitable for {', '.join(product.skin_types).lower()} skin types."
-            )
-        ]
-    
-    def _generate_safety_questions(self, product: ProductModel) -> List[Question]:
-        """Generate safety-related questions."""
-        return [
-            Question(
-                text="Are there any side effects?",
-                category=QuestionCategory.SAFETY,
-                answer=product.side_effects
-            ),
-            Question(
-                text="Who might experience side effects?",
-                category=QuestionCategory.SAFETY,
-                answer="Based on the product information, sensitive skin users may experience the mentioned side effects."
-            )
-        ]
-    
-    def _generate_usage_questions(self, product: ProductModel) -> List[Question]:
-        """Generate usage-related questions."""
-        return [
-            Question(
-                text="How do I use this product?",
-                category=QuestionCategory.USAGE,
-                answer=product.usage_instructions
-            ),
-            Question(
-                text="When should I apply this serum?",
-                category=QuestionCategory.USAGE,
-                answer="Based on the instructions, this should be applied in the morning before sunscreen."
-            ),
-            Question(
-                text="How much product should I use?",
-                category=QuestionCategory.USAGE,
-                answer="Use 2-3 drops as recommended in the usage instructions."
-            )
-        ]
+    def process_locales(self, product: ProductModel, locales: Sequence[str]) -> Dict[str, List[Question]]:
+        """Generate questions for several locales, deriving product fragments once."""
+        if not self.validate_input(product, ProductModel):
+            raise ValueError("Invalid product model")
+        
+        fragments = self.product_fragments(product)
+        return {locale: self._render(fragments, locale) for locale in locales}
     
-    def _generate_purchase_questions(self, product: ProductModel) -> List[Question]:
-        """Generate purchase-related questions."""
-        return [
-            Question(
-                text="What is the price of this product?",
-                category=QuestionCategory.PURCHASE,
-                answer=f"The price is {product.price}."
-            ),
-            Question(
-                text="Is this product worth the price?",
-                category=QuestionCategory.PURCHASE,
-                answer=f"At {product.price}, this product offers {', '.join(product.benefits).lower()} with {product.concentration} active ingredient."
-            )
-        ]
+    @staticmethod
+    def product_fragments(product: ProductModel) -> Dict[str, str]:
+        """Language-independent product values substituted into question templates."""
+        return {
+            "name": product.name,
+            "concentration": product.concentration,
+            "skin_types": ', '.join(product.skin_types).lower(),
+            "benefits": ', '.join([b.lower() if 'fades' not in b.lower() else b.lower().replace('fades', 'fading') for b in product.benefits]),
+            "benefits_plain": ', '.join(product.benefits).lower(),
+            "ingredients": ', '.join(product.key_ingredients),
+            "price": product.price,
+            "side_effects": product.side_effects,
+            "usage_instructions": product.usage_instructions
+        }
     
-    def _generate_comparison_questions(self, product: ProductModel) -> List[Question]:
-        """Generate comparison-related questions."""
-        benefits_text = ', '.join([b.lower() if 'fades' not in b.lower() else b.lower().replace('fades', 'fading') for b in product.benefits])
+    def _render(self, fragments: Dict[str, str], locale: Optional[str]) -> List[Question]:
+        strings = get_string_table(locale or DEFAULT_LOCALE)
         return [
             Question(
-                text="How does this compare to other vitamin C serums?",
-                category=QuestionCategory.COMPARISON,
-                answer=f"This serum contains {product.concentration} and is specifically formulated for {', '.join(product.skin_types).lower()} skin types."
-            ),
-            Question(
-                text="What makes this product unique?",
-                category=QuestionCategory.COMPARISON,
-                answer=f"The combination of {', '.join(product.key_ingredients)} makes this product effective for {benefits_text}."
+                text=strings[f"q.{key}"].format(**fragments),
+                category=category,
+                answer=strings[f"a.{key}"].format(**fragments)
             )
+            for category, key in self.question_specs
         ]
-    
-    def _generate_ingredient_questions(self, product: ProductModel) -> List[Question]:
-        """Generate ingredient-related questions."""
-        return [
-            Question(
-                text="What are the key ingredients?",
-                category=QuestionCategory.INGREDIENTS,
-                answer=f"The key ingredients are {', '.join(product.key_ingredients)}."
-            ),
-            Question(
-                text="What does Vitamin C do for the skin?",
-                category=QuestionCategory.INGREDIENTS,
-                answer="Vitamin C is known for its brightening properties and ability to fade dark spots."
-            ),
-            Question(
-                text="What is the concentration of active ingredients?",
-                category=QuestionCategory.INGREDIENTS,
-                answer=f"This product contains {product.concentration}."
-            )
-        ]
\ No newline at end of file
@@ -1,162 +1,234 @@
 """Template Engine Agent - Assembles content using predefined templates."""
 
-from typing import Dict, Any
+from typing import Dict, Any, Callable, Iterable, Iterator, Optional, Tuple
 import json
 from datetime import datetime
+from functools import partial
 from .base_agent import BaseAgent
 from ..models import ContentBlock, PageTemplate, GeneratedPage, ProductModel
 from ..templates.template_definitions import TemplateDefinitions
+from ..locales.string_tables import DEFAULT_LOCALE, get_string_table
+from ..output.streaming import LazyObject, page_view
+
+# Page content as (field, value) pairs, in output order
+FieldIterator = Iterator[Tuple[str, Any]]
+
+RECOMMENDATION_FACTORS = ("price", "concentration", "skin_type_match", "ingredient_preferences")
 
 
 class TemplateEngineAgent(BaseAgent):
     """Agent responsible for assembling content using templates."""
     
-    def __init__(self):
+    def __init__(self, locale: str = DEFAULT_LOCALE, templates: Optional[Iterable[str]] = None,
+                 include_metadata: bool = True):
         super().__init__("TemplateEngine")
         self.templates = TemplateDefinitions()
+        self.locale = locale
+        # None renders every page type; otherwise unlisted templates are skipped
+        self.enabled_templates = frozenset(templates) if templates is not None else None
+        self.include_metadata = include_metadata
+    
+    def is_enabled(self, template_type: str) -> bool:
+        """Whether pages of ``template_type`` are rendered."""
+        return self.enabled_templates is None or template_type in self.enabled_templates
     
     def process(self, input_data: Dict[str, Any]) -> Dict[str, GeneratedPage]:
         """Generate pages using templates and content blocks."""
         self.log_processing("Starting template-based page generation")
         
+        generated_pages = {
+            page_type: GeneratedPage(
+                page_type=page_type,
+                content=dict(fields()),
+                metadata=self._template_metadata(template_name)
+            )
+            for page_type, template_name, fields in self._page_sources(input_data)
+        }
+        
+        self.log_processing("Page generation completed", 
+                          f"Generated {len(generated_pages)} pages")
+        return generated_pages
+    
+    def render_views(self, input_data: Dict[str, Any]) -> Dict[str, LazyObject]:
+        """Like ``process`` but returns lazy page views for streaming output.
+        
+        Each view encodes like ``GeneratedPage.to_dict()``; its content is
+        read straight from the content blocks and product when it is written.
+        """
+        return {
+            page_type: page_view(page_type, LazyObject(fields), self._template_metadata(template_name))
+            for page_type, template_name, fields in self._page_sources(input_data)
+        }
+    
+    def process_aggregates(self, aggregate_blocks: Dict[str, ContentBlock]) -> Dict[str, GeneratedPage]:
+        """Generate one aggregate page per group block, keyed by group id."""
+        self.log_processing("Starting aggregate page generation")
+        
+        generated_pages = {
+            group_id: GeneratedPage(
+                page_type="aggregate",
+                content=dict(self._aggregate_fields(block)),
+                metadata=self._template_metadata("aggregate_template")
+            )
+            for group_id, block in aggregate_blocks.items()
+        }
+        
+        self.log_processing("Aggregate page generation completed",
+                          f"Generated {len(generated_pages)} pages")
+        return generated_pages
+    
+    def _page_sources(self, input_data: Dict[str, Any]) -> Iterator[Tuple[str, str, Callable[[], FieldIterator]]]:
+        """Yield ``(page_type, template_name, fields)`` for every page to render."""
         content_blocks = input_data.get('content_blocks', {})
         product = input_data.get('product')
         comparison_product = input_data.get('comparison_product')
+        strings = get_string_table(input_data.get('locale') or self.locale)
         
         if not isinstance(content_blocks, dict):
             raise ValueError("Invalid content blocks data")
         
-        generated_pages = {}
-        
-        # Generate FAQ page
-        if 'faq' in content_blocks:
-            generated_pages['faq'] = self._generate_faq_page(
-                content_blocks['faq'], product
+        # FAQ page
+        if 'faq' in content_blocks and self.is_enabled('faq'):
+            yield 'faq', 'faq_template', partial(
+                self._faq_fields, content_blocks['faq'], product, strings
             )
         
-        # Generate product page
-        generated_pages['product'] = self._generate_product_page(
-            content_blocks, product
-        )
+        # Product page
+        if self.is_enabled('product'):
+            yield 'product', 'product_template', partial(
+                self._product_fields, content_blocks, product
+            )
         
-        # Generate comparison page
-        if 'comparison' in content_blocks:
-            generated_pages['comparison'] = self._generate_comparison_page(
-                content_blocks['comparison'], product, comparison_product
+        # Comparison page
+        if 'comparison' in content_blocks and self.is_enabled('comparison'):
+            yield 'comparison', 'comparison_template', partial(
+                self._comparison_fields, content_blocks['comparison'], product, comparison_product, strings
             )
         
-        self.log_processing("Page generation completed", 
-                          f"Generated {len(generated_pages)} pages")
-        return generated_pages
+        # Multi-product comparison page
+        if 'multi_comparison' in content_blocks and self.is_enabled('multi_comparison'):
+            yield 'multi_comparison', 'multi_comparison_template', partial(
+                self._multi_comparison_fields, content_blocks['multi_comparison'], product, strings
+            )
     
-    def _generate_faq_page(self, faq_block: ContentBlock, product: ProductModel) -> GeneratedPage:
-        """Generate FAQ page using template."""
-        template = self.templates.get_faq_template()
-        
-        # Extract data from content block
+    def _page_metadata(self, **extra: str) -> Dict[str, str]:
+        """Run metadata embedded in page content."""
+        return {
+            "generated_at": datetime.now().isoformat(),
+            "source": "automated_generation",
+            **extra
+        }
+    
+    def _template_metadata(self, template_used: str) -> Dict[str, str]:
+        """GeneratedPage metadata; empty when metadata generation is disabled."""
+        return {"template_used": template_used} if self.include_metadata else {}
+    
+    def _faq_fields(self, faq_block: ContentBlock, product: ProductModel,
+                    strings: Dict[str, str]) -> FieldIterator:
+        """FAQ page content fields."""
         faq_content = faq_block.content
         
-        # Populate template
-        page_content = {
-            "title": f"{product.name} - Frequently Asked Questions",
-            "sections": {
-                "overview": {
-                    "total_questions": faq_content["total_questions"],
-                    "categories": faq_content["categories"]
-                },
-                "questions": {
-                    "by_category": faq_content["questions_by_category"],
-                    "featured": faq_content["featured_questions"]
-                }
+        yield "title", strings["page.faq_title"].format(name=product.name)
+        yield "sections", {
+            "overview": {
+                "total_questions": faq_content["total_questions"],
+                "categories": faq_content["categories"]
             },
-            "metadata": {
-                "generated_at": datetime.now().isoformat(),
-                "source": "automated_generation"
+            "questions": {
+                "by_category": faq_content["questions_by_category"],
+                "featured": faq_content["featured_questions"]
             }
         }
-        
-        return GeneratedPage(
-            page_type="faq",
-            content=page_content,
-            metadata={"template_used": "faq_template"}
-        )
+        if self.include_metadata:
+            yield "metadata", self._page_metadata()
     
-    def _generate_product_page(self, content_blocks: Dict[str, ContentBlock], 
-                             product: ProductModel) -> GeneratedPage:
-        """Generate product page using template."""
-        template = self.templates.get_product_template()
-        
-        # Extract data from content blocks
+    def _product_fields(self, content_blocks: Dict[str, ContentBlock], 
+                        product: ProductModel) -> FieldIterator:
+        """Product page content fields."""
         benefits_content = content_blocks.get('benefits', ContentBlock("benefits", {})).content
         usage_content = content_blocks.get('usage', ContentBlock("usage", {})).content
         safety_content = content_blocks.get('safety', ContentBlock("safety", {})).content
         ingredients_content = content_blocks.get('ingredients', ContentBlock("ingredients", {})).content
         
-        # Populate template
-        page_content = {
-            "product_info": {
-                "name": product.name,
-                "concentration": product.concentration,
-                "price": product.price,
-                "skin_types": product.skin_types
-            },
-            "benefits": {
-                "primary_benefits": benefits_content.get("primary_benefits", []),
-                "descriptions": benefits_content.get("benefit_descriptions", {})
-            },
-            "ingredients": {
-                "key_ingredients": ingredients_content.get("key_ingredients", []),
-                "descriptions": ingredients_content.get("ingredient_descriptions", {}),
-                "active_ingredients": ingredients_content.get("active_ingredients", [])
-            },
-            "usage": {
-                "instructions": usage_content.get("instructions", ""),
-                "application_time": usage_content.get("application_time", ""),
-                "amount": usage_content.get("amount", "")
-            },
-            "safety": {
-                "side_effects": safety_content.get("side_effects", ""),
-                "warnings": safety_content.get("warnings", []),
-                "precautions": safety_content.get("precautions", [])
-            },
-            "metadata": {
-                "generated_at": datetime.now().isoformat(),
-                "source": "automated_generation"
-            }
+        yield "product_info", {
+            "name": product.name,
+            "concentration": product.concentration,
+            "price": product.price,
+            "skin_types": product.skin_types
         }
-        
-        return GeneratedPage(
-            page_type="product",
-            content=page_content,
-            metadata={"template_used": "product_template"}
-        )
+        yield "benefits", {
+            "primary_benefits": benefits_content.get("primary_benefits", []),
+            "descriptions": benefits_content.get("benefit_descriptions", {})
+        }
+        yield "ingredients", {
+            "key_ingredients": ingredients_content.get("key_ingredients", []),
+            "descriptions": ingredients_content.get("ingredient_descriptions", {}),
+            "active_ingredients": ingredients_content.get("active_ingredients", [])
+        }
+        yield "usage", {
+            "instructions": usage_content.get("instructions", ""),
+            "application_time": usage_content.get("application_time", ""),
+            "amount": usage_content.get("amount", "")
+        }
+        yield "safety", {
+            "side_effects": safety_content.get("side_effects", ""),
+            "warnings": safety_content.get("warnings", []),
+            "precautions": safety_content.get("precautions", [])
+        }
+        if self.include_metadata:
+            yield "metadata", self._page_metadata()
     
-    def _generate_comparison_page(self, comparison_block: ContentBlock, 
-                                product_a: ProductModel, product_b: ProductModel) -> GeneratedPage:
-        """Generate comparison page using template."""
-        template = self.templates.get_comparison_template()
-        
-        # Extract data from content block
+    def _comparison_fields(self, comparison_block: ContentBlock, 
+                           product_a: ProductModel, product_b: ProductModel,
+                           strings: Dict[str, str]) -> FieldIterator:
+        """Comparison page content fields."""
         comparison_content = comparison_block.content
         
-        # Populate template
-        page_content = {
-            "title": "Product Comparison",
-            "products": comparison_content["products"],
-            "comparison_analysis": comparison_content["comparison_points"],
-            "recommendation": {
-                "summary": "Choose based on your specific skin needs and budget",
-                "factors": ["price", "concentration", "skin_type_match", "ingredient_preferences"]
-            },
-            "metadata": {
-                "generated_at": datetime.now().isoformat(),
-                "source": "automated_generation",
-                "note": "Product B is a fictional comparator created to demonstrate comparison logic"
-            }
+        yield "title", strings["page.comparison_title"]
+        yield "products", comparison_content["products"]
+        yield "comparison_analysis", comparison_content["comparison_points"]
+        yield "recommendation", {
+            "summary": strings["page.recommendation"],
+            "factors": list(RECOMMENDATION_FACTORS)
         }
+        if self.include_metadata:
+            yield "metadata", self._page_metadata(note=strings["page.comparison_note"])
+    
+    def _multi_comparison_fields(self, comparison_block: ContentBlock,
+                                 product: ProductModel,
+                                 strings: Dict[str, str]) -> FieldIterator:
+        """Comparison page content fields against several competitors."""
+        comparison_content = comparison_block.content
         
-        return GeneratedPage(
-            page_type="comparison",
-            content=page_content,
-            metadata={"template_used": "comparison_template"}
-        )
\ No newline at end of file
+        yield "title", strings["page.multi_comparison_title"].format(name=product.name)
+        yield "products", comparison_content["products"]
+        yield "comparison_analysis", {
+            "pairwise": comparison_content["comparisons"],
+            "price_ranking": comparison_content["price_ranking"],
+            "shared_ingredients": comparison_content["shared_ingredients"]
+        }
+        yield "recommendation", {
+            "summary": strings["page.recommendation"],
+            "factors": list(RECOMMENDATION_FACTORS)
+        }
+        if self.include_metadata:
+            yield "metadata", self._page_metadata()
+    
+    def _aggregate_fields(self, aggregate_block: ContentBlock) -> FieldIterator:
+        """Catalog-level aggregate page content fields."""
+        aggregate_content = aggregate_block.content
+        
+        yield "title", aggregate_content["title"]
+        yield "group", {
+            "id": aggregate_content["group_id"],
+            "dimension": aggregate_content["dimension"]
+        }
+        yield "summary", {
+            "product_count": aggregate_content["product_count"],
+            "price_range": aggregate_content["price_range"],
+            "price_ranges": aggregate_content["price_ranges"]
+        }
+        yield "products", aggregate_content["products"]
+        yield "shared_faqs", aggregate_content["shared_faqs"]
+        if self.include_metadata:
+            yield "metadata", self._page_metadata()
@@ -0,0 +1,379 @@
+"""Command-line interface.
+
+Subcommands import the agent stack lazily so short invocations such as
+``validate`` only pay for the modules they use.
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+WRITERS = ("json", "sqlite", "delta", "compact", "compressed-files", "compressed-stream")
+
+# Writers that replace a product's output when it is written again; the
+# others append, so a fingerprint run would leave stale copies behind
+FINGERPRINT_WRITERS = ("json", "sqlite", "delta", "compressed-files")
+
+
+def setup_logging(level=logging.INFO):
+    """Configure logging for the application.
+    
+    Records are pushed onto an in-memory queue and written to the log file
+    and terminal by a background listener thread, so agents never block on
+    disk or terminal I/O. The returned listener must be stopped to flush.
+    """
+    import logging.handlers
+    import queue
+    
+    # Create logs directory if it doesn't exist
+    logs_dir = "logs"
+    os.makedirs(logs_dir, exist_ok=True)
+    
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    handlers = [
+        logging.FileHandler(os.path.join(logs_dir, 'system.log'), encoding='utf-8'),
+        logging.StreamHandler()
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    
+    # Formatting happens on the listener thread; the queue side only merges args
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
+    logging.basicConfig(level=level, handlers=[queue_handler], force=True)
+    listener.start()
+    return listener
+
+
+def load_product_data():
+    """Load the GlowBoost product data."""
+    return {
+        'Product Name': 'GlowBoost Vitamin C Serum',
+        'Concentration': '10% Vitamin C',
+        'Skin Type': 'Oily, Combination',
+        'Key Ingredients': 'Vitamin C, Hyaluronic Acid',
+        'Benefits': 'Brightening, Fades dark spots',
+        'How to Use': 'Apply 2–3 drops in the morning before sunscreen',
+        # 'Side Effects': 'Mild tingling for sensitive skin',
+        'Price': '₹699'
+    }
+
+
+def _load_records(path):
+    from .pipeline.feed import MalformedRecord, iter_feed
+    records = list(iter_feed(path)) if path else []
+    for record in records:
+        if isinstance(record, MalformedRecord):
+            raise record.to_error()
+    return records
+
+
+def _fingerprint_context(args, settings, output_dir):
+    """Everything besides a record's own bytes that shapes its batch output."""
+    from .pipeline.fingerprint import fingerprint
+    competitors = None
+    if args.competitors:
+        with open(args.competitors, "rb") as f:
+            competitors = fingerprint(f.read()).hex()
+    return {
+        "settings": settings,
+        "competitors": competitors,
+        "locales": args.locales,
+        "writer": args.writer,
+        "store": args.store,
+        "codec": args.codec,
+        "level": args.level,
+        "output_dir": os.path.abspath(output_dir)
+    }
+
+
+def _make_writer(args, orchestrator, output_dir):
+    """Output backend selected with ``--writer``."""
+    if args.writer == "json":
+        return orchestrator.create_writer(output_dir, durable=bool(args.manifest))
+    if args.writer == "sqlite":
+        from .output.sqlite_store import SQLitePageStore
+        os.makedirs(output_dir, exist_ok=True)
+        return SQLitePageStore(args.store or os.path.join(output_dir, "pages.db"))
+    if args.writer == "delta":
+        from .output.delta import DeltaWriter
+        from .output.sqlite_store import SQLitePageStore
+        os.makedirs(output_dir, exist_ok=True)
+        store = SQLitePageStore(args.store or os.path.join(output_dir, "pages.db"))
+        return DeltaWriter(store, os.path.join(output_dir, f"delta-{store.run_id:06d}.ndjson"))
+    if args.writer == "compact":
+        from .output.compact import CompactCatalogWriter
+        os.makedirs(output_dir, exist_ok=True)
+        return CompactCatalogWriter(os.path.join(output_dir, "catalog.ndjson"))
+    
+    from .output.compressed import CompressedFileWriter, CompressedStreamWriter
+    if args.writer == "compressed-files":
+        return CompressedFileWriter(output_dir, args.codec, args.level, threaded=True)
+    return CompressedStreamWriter(output_dir, args.codec, args.level,
+                                  shard_size=args.shard_size, threaded=True)
+
+
+def cmd_run(args, settings):
+    """Generate pages for one product."""
+    import json
+    from .agents.orchestrator_agent import OrchestratorAgent
+    
+    logger = logging.getLogger("Main")
+    logger.info("Starting Multi-Agent Content Generation System")
+    
+    try:
+        # Load product data
+        if args.input:
+            with open(args.input, "r", encoding="utf-8") as f:
+                product_data = json.load(f)
+        else:
+            product_data = load_product_data()
+        logger.info("Loaded product data for: %s", product_data.get('Product Name', product_data.get('name')))
+        
+        # Initialize orchestrator and execute pipeline
+        orchestrator = OrchestratorAgent(_load_records(args.competitors), settings)
+        output_files = orchestrator.process({
+            'product_data': product_data,
+            'output_dir': args.output_dir or settings.output_directory
+        })
+        logger.info("Generated %d pages", len(output_files))
+        
+        # Display final results
+        print("Content Generation Completed Successfully!")
+        print("\nGenerated Files:")
+        for page_type, filepath in output_files.items():
+            print(f"  {page_type.upper()}: {filepath}")
+        
+        print(f"\nSystem Performance:")
+        print(f"  Total Pages Generated: {len(output_files)}")
+        print(f"  Agent Pipeline: Data Parser -> Question Generator -> Content Logic -> Template Engine")
+        print(f"  Output Format: Machine-readable JSON")
+        
+        print("\nNext Steps:")
+        print("  Review generated JSON files in the output/ directory")
+        print("  Validate content structure and completeness")
+        print("  Test system extensibility with additional products")
+        
+    except Exception as e:
+        logger.error("Pipeline execution failed: %s", str(e))
+        print(f"Error: {str(e)}")
+        return 1
+    
+    return 0
+
+
+def cmd_batch(args, settings):
+    """Generate pages for every product in a feed."""
+    from .pipeline.feed import iter_feed
+    
+    if args.use_async:
+        from .agents.async_orchestrator_agent import AsyncOrchestratorAgent as Orchestrator
+    else:
+        from .agents.orchestrator_agent import OrchestratorAgent as Orchestrator
+    
+    if args.fingerprints:
+        conflict = None
+        if args.aggregate:
+            conflict = "--aggregate"
+        elif args.manifest:
+            conflict = "--manifest"
+        elif args.writer not in FINGERPRINT_WRITERS:
+            conflict = f"--writer {args.writer}"
+        if conflict:
+            print(f"--fingerprints skips unchanged products, so it cannot be combined with {conflict}",
+                  file=sys.stderr)
+            return 2
+    
+    output_dir = args.output_dir or settings.output_directory
+    orchestrator = Orchestrator(_load_records(args.competitors), settings)
+    options = {"aggregate": args.aggregate}
+    if args.locales:
+        options["locales"] = args.locales.split(",")
+    
+    manifest = None
+    if args.manifest:
+        from .pipeline.checkpoint import ProgressManifest
+        manifest = ProgressManifest(args.manifest)
+    
+    fingerprints = None
+    records = iter_feed(args.feed)
+    if args.fingerprints:
+        from .pipeline.fingerprint import FingerprintFilter
+        fingerprints = FingerprintFilter(args.fingerprints, _fingerprint_context(args, settings, output_dir))
+        records = fingerprints.iter_changed(args.feed)
+    
+    writer = _make_writer(args, orchestrator, output_dir)
+    try:
+        result = orchestrator.process_batch(
+            records, output_dir, manifest=manifest, writer=writer, **options
+        )
+    finally:
+        # The manifest flushes the writer before its last entries are written
+        if manifest is not None:
+            manifest.close()
+        writer.close()
+    
+    if fingerprints is not None:
+        # Only written after a finished batch; failed records stay out so they are retried
+        fingerprints.save(failure["index"] for failure in result["failed"])
+        print(f"Unchanged: {fingerprints.unchanged} of {fingerprints.total}")
+    print(f"Completed: {result['completed']}  Failed: {len(result['failed'])}  "
+          f"Aggregate pages: {result['aggregate_pages']}")
+    return 1 if result["failed"] else 0
+
+
+def cmd_validate(args, settings):
+    """Check that every record in a feed parses, without generating pages."""
+    from .agents.data_parser_agent import DataParserAgent
+    from .pipeline.feed import iter_feed
+    
+    parser = DataParserAgent()
+    valid = invalid = 0
+    for index, record in enumerate(iter_feed(args.feed)):
+        try:
+            parser.process(record)
+        except Exception as e:
+            invalid += 1
+            print(f"#{index}: {e}")
+        else:
+            valid += 1
+    
+    print(f"Valid: {valid}  Invalid: {invalid}")
+    return 1 if invalid else 0
+
+
+def cmd_work(args, settings):
+    """Queue a feed into a SQLite work queue and drain it with local worker processes."""
+    from .pipeline.work_queue import SQLiteWorkQueue, enqueue_catalog, run_workers
+    
+    if args.feed:
+        from .pipeline.feed import iter_feed
+        work_queue = SQLiteWorkQueue(args.queue, lease_seconds=args.lease_seconds)
+        try:
+            print(f"Queued: {enqueue_catalog(work_queue, iter_feed(args.feed))}")
+        finally:
+            work_queue.close()
+    
+    counts = run_workers(args.queue, args.output_dir or settings.output_directory,
+                         args.processes, args.batch_size, args.lease_seconds, args.config)
+    print("  ".join(f"{status.capitalize()}: {count}" for status, count in sorted(counts.items())))
+    return 1 if counts.get("failed") else 0
+
+
+def _measure_startup(runs: int = 3) -> float:
+    """Fastest wall time of ``main.py --help`` in a fresh interpreter."""
+    import subprocess
+    main_script = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, main_script, "--help"], check=True, stdout=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def cmd_bench(args, settings):
+    """Report cold-start time and in-memory generation throughput."""
+    startup = _measure_startup()
+    
+    import_started = time.perf_counter()
+    from .agents.orchestrator_agent import OrchestratorAgent
+    orchestrator = OrchestratorAgent(settings=settings)
+    construct = time.perf_counter() - import_started
+    
+    product_data = load_product_data()
+    started = time.perf_counter()
+    for i in range(args.products):
+        orchestrator.generate_pages({**product_data, 'Product Name': f"Bench Product {i}"})
+    elapsed = time.perf_counter() - started
+    
+    print(f"CLI startup:            {startup * 1000:.1f} ms")
+    print(f"Agent import+construct: {construct * 1000:.1f} ms")
+    print(f"Generation:             {args.products / elapsed:.0f} products/s "
+          f"({elapsed / args.products * 1e6:.0f} us/product)")
+    return 0
+
+
+def cmd_serve(args, settings):
+    """Run the localhost generation service."""
+    from .service.http_service import serve
+    serve(args.host, args.port, args.max_batch_size, args.max_wait_ms / 1000.0, settings)
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="main.py", description="Multi-agent content generation")
+    parser.add_argument("--config", default="config.json", help="Path to config.json")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log per-product stage details")
+    subparsers = parser.add_subparsers(dest="command")
+    
+    run = subparsers.add_parser("run", help="Generate pages for one product")
+    run.add_argument("--input", help="Product JSON file (defaults to the bundled sample)")
+    run.add_argument("--output-dir")
+    run.add_argument("--competitors", help="Feed of competitor products for a multi-comparison page")
+    run.set_defaults(handler=cmd_run)
+    
+    batch = subparsers.add_parser("batch", help="Generate pages for a product feed")
+    batch.add_argument("feed", help="JSON Lines feed or JSON array of products")
+    batch.add_argument("--output-dir")
+    batch.add_argument("--manifest", help="Progress manifest for resumable runs")
+    batch.add_argument("--fingerprints", help="Fingerprint index; only records changed since the last run are generated")
+    batch.add_argument("--async", dest="use_async", action="store_true",
+                       help="Overlap parsing, generation and writes")
+    batch.add_argument("--aggregate", action="store_true", help="Also build catalog-level pages")
+    batch.add_argument("--locales", help="Comma-separated locales, e.g. en,es,fr")
+    batch.add_argument("--competitors", help="Feed of competitor products for multi-comparison pages")
+    batch.add_argument("--writer", choices=WRITERS, default="json")
+    batch.add_argument("--store", help="SQLite page store path for the sqlite and delta writers")
+    batch.add_argument("--codec", choices=("gzip", "bz2", "lzma"), default="gzip")
+    batch.add_argument("--level", type=int, help="Compression level")
+    batch.add_argument("--shard-size", type=int, default=10000)
+    batch.set_defaults(handler=cmd_batch)
+    
+    validate = subparsers.add_parser("validate", help="Check a product feed without generating")
+    validate.add_argument("feed")
+    validate.set_defaults(handler=cmd_validate)
+    
+    work = subparsers.add_parser("work", help="Drain a shared SQLite work queue")
+    work.add_argument("queue", help="Work queue database, shared by all workers")
+    work.add_argument("--feed", help="Feed to add to the queue before working")
+    work.add_argument("--output-dir")
+    work.add_argument("--processes", type=int, default=0, help="Worker processes (default: CPU count)")
+    work.add_argument("--batch-size", type=int, default=50)
+    work.add_argument("--lease-seconds", type=float, default=300.0)
+    work.set_defaults(handler=cmd_work)
+    
+    bench = subparsers.add_parser("bench", help="Measure startup time and throughput")
+    bench.add_argument("--products", type=int, default=1000)
+    bench.set_defaults(handler=cmd_bench)
+    
+    serve = subparsers.add_parser("serve", help="Run the localhost generation service")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--max-batch-size", type=int, default=32)
+    serve.add_argument("--max-wait-ms", type=float, default=5.0)
+    serve.set_defaults(handler=cmd_serve)
+    
+    return parser
+
+
+def main(argv=None):
+    """Parse arguments and dispatch; with no subcommand, ``run`` the bundled product."""
+    from .settings import load_settings
+    
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command is None:
+        args = parser.parse_args(list(argv if argv is not None else sys.argv[1:]) + ["run"])
+    
+    settings = load_settings(args.config)
+    listener = setup_logging(logging.DEBUG if args.verbose else logging.INFO)
+    try:
+        return args.handler(args, settings)
+    finally:
+        listener.stop()
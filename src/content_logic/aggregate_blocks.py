@@ -0,0 +1,280 @@
+"""Catalog-level group-by indexes and aggregate content blocks."""
+
+import re
+import struct
+import sys
+import zlib
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from ..models import ContentBlock, ProductModel, Question
+from ..pipeline.spill import MemoryBudget, SpillableList, estimate_size
+from .product_facts import parse_price, product_type
+
+# Titles per group dimension
+GROUP_TITLES = {
+    "product_type": "All {type}s",
+    "skin_type": "Products for {skin_type} Skin",
+    "ingredient": "Products with {ingredient}",
+    "product_type+skin_type": "{type}s for {skin_type} Skin",
+}
+
+
+# On-disk partitions that spilled group postings are spread over by group id
+_PARTITIONS = 64
+
+_POINTER_SIZE = struct.calcsize("P")
+
+
+def _slug(text: str) -> str:
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')
+
+
+class _GroupPosting:
+    """Running aggregate for one group; updated once per member product."""
+    
+    __slots__ = ("dimension", "labels", "products", "price_ranges", "shared_faqs", "reserved")
+    
+    def __init__(self, dimension: str, labels: Dict[str, str]):
+        self.dimension = dimension
+        self.labels = labels
+        # (name, key, price) per member
+        self.products: List[Tuple[str, str, str]] = []
+        # currency -> [min, max]; prices are only compared within a currency,
+        # and the first currency seen comes first
+        self.price_ranges: Dict[str, List[float]] = {}
+        self.shared_faqs: Optional[Set[Tuple[str, str]]] = None
+        # Bytes charged to the budget for this posting
+        self.reserved = 0
+    
+    def add(self, member: Tuple[str, str, str], price: Optional[float], currency: str,
+            faqs: Set[Tuple[str, str]]) -> None:
+        self.products.append(member)
+        if price is not None:
+            self._add_range(currency, price, price)
+        # Intersect instead of counting so memory stays bounded by the first member's FAQs
+        self.shared_faqs = set(faqs) if self.shared_faqs is None else self.shared_faqs & faqs
+    
+    def merge(self, other: '_GroupPosting') -> None:
+        """Fold in a later part of the same group."""
+        self.products.extend(other.products)
+        for currency, (low, high) in other.price_ranges.items():
+            self._add_range(currency, low, high)
+        self.shared_faqs = other.shared_faqs if self.shared_faqs is None else self.shared_faqs & other.shared_faqs
+    
+    def _add_range(self, currency: str, low: float, high: float) -> None:
+        price_range = self.price_ranges.get(currency)
+        if price_range is None:
+            self.price_ranges[currency] = [low, high]
+        else:
+            price_range[0] = min(price_range[0], low)
+            price_range[1] = max(price_range[1], high)
+    
+    def to_record(self) -> tuple:
+        return self.dimension, self.labels, self.products, self.price_ranges, self.shared_faqs
+    
+    @classmethod
+    def from_record(cls, record: tuple) -> '_GroupPosting':
+        posting = cls(record[0], record[1])
+        posting.products, posting.price_ranges, posting.shared_faqs = record[2:]
+        return posting
+
+
+# Fixed cost of a new posting: the object, its empty containers and its dict entry
+_POSTING_SIZE = (sys.getsizeof(_GroupPosting("", {})) + sys.getsizeof([]) + sys.getsizeof({})
+                 + 3 * _POINTER_SIZE)
+
+
+class CatalogIndex:
+    """Group-by indexes built in a single pass over the catalog.
+    
+    Each product is posted to the groups it belongs to (its product type,
+    each skin type, each key ingredient, and type x skin type), so building
+    the index costs O(products x groups per product) rather than rescanning
+    the catalog for every group. Whole group postings count against
+    ``budget``; once it is exhausted every in-memory posting is moved to one
+    of a fixed number of on-disk partitions by group id, so the spill index
+    does not grow with the number of groups. Reading the index back merges
+    one partition at a time.
+    """
+    
+    def __init__(self, budget: Optional[MemoryBudget] = None):
+        self.budget = budget or MemoryBudget()
+        self.groups: Dict[str, _GroupPosting] = {}
+        # (group_id, posting record) per spilled part, created on the first spill
+        self._partitions: List[SpillableList[Tuple[str, tuple]]] = []
+    
+    def add(self, product: ProductModel, questions: Iterable[Question] = ()) -> None:
+        """Post one product and its questions to all of its groups."""
+        currency, price = parse_price(product.price)
+        faqs = {(q.text, q.answer) for q in questions}
+        member = (product.name, product.key, product.price)
+        kind = product_type(product)
+        kind_label = kind.capitalize()
+        
+        memberships = [("product_type", {"type": kind_label}, kind)]
+        for skin_type in product.skin_types:
+            if not skin_type:
+                continue
+            memberships.append(("skin_type", {"skin_type": skin_type.title()}, skin_type))
+            memberships.append((
+                "product_type+skin_type",
+                {"type": kind_label, "skin_type": skin_type.title()},
+                f"{kind} {skin_type}"
+            ))
+        for ingredient in product.key_ingredients:
+            if ingredient:
+                memberships.append(("ingredient", {"ingredient": ingredient}, ingredient))
+        
+        member_size = _POINTER_SIZE + estimate_size(member)
+        range_size = 0
+        if price is not None:
+            range_size = _POINTER_SIZE + estimate_size(currency) + estimate_size([price, price])
+        new_size = _POSTING_SIZE + estimate_size(faqs)
+        for dimension, labels, value in memberships:
+            group_id = f"{_slug(dimension)}-{_slug(value)}"
+            posting = self.groups.get(group_id)
+            size = self._cost(posting, group_id, labels, member_size, new_size, range_size, currency)
+            reserved = self.budget.try_reserve(size)
+            if not reserved:
+                self.spill()
+                posting = None
+                size = self._cost(None, group_id, labels, member_size, new_size, range_size, currency)
+                reserved = self.budget.try_reserve(size)
+            if posting is None:
+                posting = self.groups[group_id] = _GroupPosting(dimension, labels)
+            posting.add(member, price, currency, faqs)
+            if reserved:
+                posting.reserved += size
+            else:
+                # Too large to hold even with everything spilled: write it straight out
+                del self.groups[group_id]
+                self._partition(group_id).append((group_id, posting.to_record()))
+    
+    @staticmethod
+    def _cost(posting: Optional[_GroupPosting], group_id: str, labels: Dict[str, str],
+              member_size: int, new_size: int, range_size: int, currency: str) -> int:
+        """Bytes one membership adds to ``posting`` (a new posting if ``None``)."""
+        if posting is None:
+            return member_size + new_size + range_size + estimate_size(group_id) + estimate_size(labels)
+        if range_size and currency not in posting.price_ranges:
+            return member_size + range_size
+        return member_size
+    
+    def spill(self) -> None:
+        """Move every in-memory posting to its partition on disk."""
+        groups, self.groups = self.groups, {}
+        for group_id, posting in groups.items():
+            self.budget.release(posting.reserved)
+            self._partition(group_id).append((group_id, posting.to_record()))
+        self.budget.spill_all()
+    
+    def iter_postings(self) -> Iterator[Tuple[str, _GroupPosting]]:
+        """Yield ``(group_id, posting)`` for every group, with spilled parts merged.
+        
+        Without spills groups come in first-seen order; otherwise partition
+        by partition, holding one merged partition in memory at a time.
+        """
+        if not self._partitions:
+            yield from self.groups.items()
+            return
+        in_memory: List[Dict[str, _GroupPosting]] = [{} for _ in range(_PARTITIONS)]
+        for group_id, posting in self.groups.items():
+            in_memory[_partition_of(group_id)][group_id] = posting
+        for partition, pending in zip(self._partitions, in_memory):
+            merged: Dict[str, _GroupPosting] = {}
+            for group_id, record in partition:
+                posting = merged.get(group_id)
+                if posting is None:
+                    merged[group_id] = _GroupPosting.from_record(record)
+                else:
+                    posting.merge(_GroupPosting.from_record(record))
+            for group_id, posting in pending.items():
+                if group_id in merged:
+                    merged[group_id].merge(posting)
+                else:
+                    merged[group_id] = posting
+            yield from merged.items()
+    
+    def __len__(self) -> int:
+        if not self._partitions:
+            return len(self.groups)
+        group_ids: List[Set[str]] = [set() for _ in range(_PARTITIONS)]
+        for group_id in self.groups:
+            group_ids[_partition_of(group_id)].add(group_id)
+        return sum(
+            len(ids.union(group_id for group_id, _ in partition))
+            for partition, ids in zip(self._partitions, group_ids)
+        )
+    
+    def close(self) -> None:
+        """Drop all postings and the spill file."""
+        for posting in self.groups.values():
+            self.budget.release(posting.reserved)
+        for partition in self._partitions:
+            partition.close()
+        self.groups.clear()
+        self._partitions = []
+        self.budget.close()
+    
+    def _partition(self, group_id: str) -> SpillableList:
+        if not self._partitions:
+            self._partitions = [SpillableList(self.budget) for _ in range(_PARTITIONS)]
+        return self._partitions[_partition_of(group_id)]
+
+
+def _partition_of(group_id: str) -> int:
+    # crc32 rather than hash() so the partition order is the same in every process
+    return zlib.crc32(group_id.encode("utf-8")) % _PARTITIONS
+
+
+def _format_price(currency: str, amount: Optional[float]) -> Optional[str]:
+    if amount is None:
+        return None
+    return f"{currency}{amount:g}"
+
+
+def _format_range(currency: str, price_range: Optional[List[float]]) -> Dict[str, Optional[str]]:
+    low, high = price_range or (None, None)
+    return {"min": _format_price(currency, low), "max": _format_price(currency, high)}
+
+
+def iter_aggregate_blocks(index: CatalogIndex, min_products: int = 1) -> Iterator[Tuple[str, ContentBlock]]:
+    """Yield ``(group_id, block)`` one group at a time; spilled groups are read back a partition at a time.
+    
+    ``price_range`` covers the members priced in the first currency seen;
+    ``price_ranges`` has one range per currency.
+    """
+    for group_id, posting in index.iter_postings():
+        if len(posting.products) < min_products:
+            continue
+        
+        first_currency = next(iter(posting.price_ranges), "")
+        content = {
+            "group_id": group_id,
+            "dimension": posting.dimension,
+            "title": GROUP_TITLES[posting.dimension].format(**posting.labels),
+            "product_count": len(posting.products),
+            "products": [
+                {"name": name, "key": key, "price": price}
+                for name, key, price in posting.products
+            ],
+            "price_range": _format_range(first_currency, posting.price_ranges.get(first_currency)),
+            "price_ranges": {
+                currency: _format_range(currency, price_range)
+                for currency, price_range in posting.price_ranges.items()
+            },
+            "shared_faqs": [
+                {"question": text, "answer": answer}
+                for text, answer in sorted(posting.shared_faqs or ())
+            ]
+        }
+        yield group_id, ContentBlock(
+            block_type="aggregate",
+            content=content,
+            dependencies=["catalog_index"]
+        )
+
+
+def generate_aggregate_blocks(index: CatalogIndex, min_products: int = 1) -> Dict[str, ContentBlock]:
+    """One aggregate content block per group with at least ``min_products`` members."""
+    return dict(iter_aggregate_blocks(index, min_products))
@@ -1,7 +1,65 @@
 """Reusable content logic blocks for transforming data into content components."""
 
-from typing import Dict, Any, List
+from functools import partial
+from typing import Callable, Dict, Any, List, Sequence, Tuple, TypeVar, Union
 from ..models import ProductModel, Question, ContentBlock
+from .product_facts import ComparisonFacts, comparison_facts
+
+T = TypeVar("T")
+
+VITAMIN_C_BRIGHTENING_DESCRIPTION = "Associated with brightening and fading dark spots as stated in product benefits"
+
+
+def _cached(cache: Dict[str, T], key: str, compute: Callable[[str], T]) -> T:
+    """Look ``key`` up in a per-batch cache, computing it on first use."""
+    try:
+        return cache[key]
+    except KeyError:
+        value = cache[key] = compute(key)
+        return value
+
+
+def _polish_benefit(benefit: str) -> str:
+    """Fix grammar for benefits."""
+    if 'fades' in benefit.lower():
+        return benefit.replace('Fades', 'Fading').replace('fades', 'fading')
+    return benefit
+
+
+def _skin_type_phrase(skin_type: str) -> str:
+    return f"Formulated for {skin_type.lower()} skin"
+
+
+def _usage_rules(instructions: str) -> Tuple[str, str, str]:
+    """Application time, amount and additional notes derived from usage instructions."""
+    lowered = instructions.lower()
+    return (
+        "morning" if "morning" in lowered else "as directed",
+        "2-3 drops" if "2-3 drops" in instructions else "as directed",
+        "Apply before sunscreen" if "sunscreen" in lowered else ""
+    )
+
+
+def _safety_warnings(side_effects: str) -> Tuple[str, ...]:
+    """Specific warnings based on side effects."""
+    if "tingling" in side_effects.lower():
+        return ("May cause mild tingling sensation",)
+    return ()
+
+
+def _mentions_brightening(benefit: str) -> bool:
+    lowered = benefit.lower()
+    return "brightening" in lowered or "dark spots" in lowered
+
+
+def _ingredient_description(ingredient: str) -> str:
+    if ingredient == "Hyaluronic Acid":
+        return "Hydrating ingredient"
+    return f"{ingredient} - ingredient in this formulation"
+
+
+def _is_active_ingredient(ingredient: str) -> bool:
+    return "Vitamin" in ingredient or "Acid" in ingredient
 
 
 class ContentLogicBlocks:
@@ -10,26 +68,40 @@ class ContentLogicBlocks:
     @staticmethod
     def generate_benefits_block(product: ProductModel) -> ContentBlock:
         """Generate benefits content block."""
-        # Fix grammar for benefits
-        polished_benefits = []
-        polished_descriptions = {}
-        
-        for benefit in product.benefits:
-            if 'fades' in benefit.lower():
-                polished = benefit.replace('Fades', 'Fading').replace('fades', 'fading')
-                polished_benefits.append(polished)
-                polished_descriptions[benefit] = polished
-            else:
-                polished_benefits.append(benefit)
-                polished_descriptions[benefit] = benefit
+        return ContentLogicBlocks._benefits_block(
+            product,
+            [_polish_benefit(benefit) for benefit in product.benefits],
+            {skin_type: _skin_type_phrase(skin_type) for skin_type in product.skin_types}
+        )
+    
+    @staticmethod
+    def generate_benefits_blocks(products: Sequence[ProductModel]) -> List[ContentBlock]:
+        """Generate benefits content blocks for many products.
         
+        Benefit polishing and skin type phrases are computed once per
+        distinct string across the batch.
+        """
+        polished_cache: Dict[str, str] = {}
+        skin_type_cache: Dict[str, str] = {}
+        return [
+            ContentLogicBlocks._benefits_block(
+                product,
+                [_cached(polished_cache, benefit, _polish_benefit) for benefit in product.benefits],
+                {
+                    skin_type: _cached(skin_type_cache, skin_type, _skin_type_phrase)
+                    for skin_type in product.skin_types
+                }
+            )
+            for product in products
+        ]
+    
+    @staticmethod
+    def _benefits_block(product: ProductModel, polished_benefits: List[str],
+                        skin_type_benefits: Dict[str, str]) -> ContentBlock:
         content = {
             "primary_benefits": polished_benefits,
-            "benefit_descriptions": polished_descriptions,
-            "skin_type_benefits": {
-                skin_type: f"Formulated for {skin_type.lower()} skin"
-                for skin_type in product.skin_types
-            }
+            "benefit_descriptions": dict(zip(product.benefits, polished_benefits)),
+            "skin_type_benefits": skin_type_benefits
         }
         
         return ContentBlock(
@@ -41,11 +113,27 @@ class ContentLogicBlocks:
     @staticmethod
     def generate_usage_block(product: ProductModel) -> ContentBlock:
         """Generate usage instructions content block."""
+        return ContentLogicBlocks._usage_block(product, _usage_rules(product.usage_instructions))
+    
+    @staticmethod
+    def generate_usage_blocks(products: Sequence[ProductModel]) -> List[ContentBlock]:
+        """Generate usage content blocks, applying the rules once per distinct instruction text."""
+        rules_cache: Dict[str, Tuple[str, str, str]] = {}
+        return [
+            ContentLogicBlocks._usage_block(
+                product, _cached(rules_cache, product.usage_instructions, _usage_rules)
+            )
+            for product in products
+        ]
+    
+    @staticmethod
+    def _usage_block(product: ProductModel, rules: Tuple[str, str, str]) -> ContentBlock:
+        application_time, amount, additional_notes = rules
         content = {
             "instructions": product.usage_instructions,
-            "application_time": "morning" if "morning" in product.usage_instructions.lower() else "as directed",
-            "amount": "2-3 drops" if "2-3 drops" in product.usage_instructions else "as directed",
-            "additional_notes": "Apply before sunscreen" if "sunscreen" in product.usage_instructions.lower() else ""
+            "application_time": application_time,
+            "amount": amount,
+            "additional_notes": additional_notes
         }
         
         return ContentBlock(
@@ -57,17 +145,29 @@ class ContentLogicBlocks:
     @staticmethod
     def generate_safety_block(product: ProductModel) -> ContentBlock:
         """Generate safety information content block."""
+        return ContentLogicBlocks._safety_block(product, _safety_warnings(product.side_effects))
+    
+    @staticmethod
+    def generate_safety_blocks(products: Sequence[ProductModel]) -> List[ContentBlock]:
+        """Generate safety content blocks, deriving warnings once per distinct side effects text."""
+        warnings_cache: Dict[str, Tuple[str, ...]] = {}
+        return [
+            ContentLogicBlocks._safety_block(
+                product, _cached(warnings_cache, product.side_effects, _safety_warnings)
+            )
+            for product in products
+        ]
+    
+    @staticmethod
+    def _safety_block(product: ProductModel, warnings: Tuple[str, ...]) -> ContentBlock:
+        # Lists are built per block so callers can mutate one page safely
         content = {
             "side_effects": product.side_effects,
-            "warnings": [],
+            "warnings": list(warnings),
             "precautions": ["Patch test recommended for sensitive skin"],
             "contraindications": ["Consult healthcare provider if pregnant or nursing"]
         }
         
-        # Add specific warnings based on side effects
-        if "tingling" in product.side_effects.lower():
-            content["warnings"].append("May cause mild tingling sensation")
-        
         return ContentBlock(
             block_type="safety",
             content=content,
@@ -77,21 +177,46 @@ class ContentLogicBlocks:
     @staticmethod
     def generate_ingredients_block(product: ProductModel) -> ContentBlock:
         """Generate ingredients information content block."""
-        # Only use benefits that are actually stated in the product data
-        ingredient_descriptions = {}
-        for ingredient in product.key_ingredients:
-            if ingredient == "Vitamin C" and any("brightening" in benefit.lower() or "dark spots" in benefit.lower() for benefit in product.benefits):
-                ingredient_descriptions[ingredient] = "Associated with brightening and fading dark spots as stated in product benefits"
-            elif ingredient == "Hyaluronic Acid":
-                ingredient_descriptions[ingredient] = "Hydrating ingredient"
-            else:
-                ingredient_descriptions[ingredient] = f"{ingredient} - ingredient in this formulation"
+        return ContentLogicBlocks._ingredients_block(
+            product, _ingredient_description, _is_active_ingredient, _mentions_brightening
+        )
+    
+    @staticmethod
+    def generate_ingredients_blocks(products: Sequence[ProductModel]) -> List[ContentBlock]:
+        """Generate ingredients content blocks for many products.
         
+        Descriptions and the active-ingredient test are looked up once per
+        distinct ingredient, and benefit keyword matches once per distinct
+        benefit, across the batch.
+        """
+        describe = partial(_cached, {}, compute=_ingredient_description)
+        is_active = partial(_cached, {}, compute=_is_active_ingredient)
+        mentions_brightening = partial(_cached, {}, compute=_mentions_brightening)
+        return [
+            ContentLogicBlocks._ingredients_block(product, describe, is_active, mentions_brightening)
+            for product in products
+        ]
+    
+    @staticmethod
+    def _ingredients_block(product: ProductModel, describe: Callable[[str], str],
+                           is_active: Callable[[str], bool],
+                           mentions_brightening: Callable[[str], bool]) -> ContentBlock:
+        # Only use benefits that are actually stated in the product data
+        brightening = "Vitamin C" in product.key_ingredients and any(
+            mentions_brightening(benefit) for benefit in product.benefits
+        )
         content = {
             "key_ingredients": product.key_ingredients,
-            "ingredient_descriptions": ingredient_descriptions,
+            "ingredient_descriptions": {
+                ingredient: VITAMIN_C_BRIGHTENING_DESCRIPTION
+                if ingredient == "Vitamin C" and brightening
+                else describe(ingredient)
+                for ingredient in product.key_ingredients
+            },
             "concentration": product.concentration,
-            "active_ingredients": [ing for ing in product.key_ingredients if "Vitamin" in ing or "Acid" in ing]
+            "active_ingredients": [
+                ingredient for ingredient in product.key_ingredients if is_active(ingredient)
+            ]
         }
         
         return ContentBlock(
@@ -101,34 +226,22 @@ class ContentLogicBlocks:
         )
     
     @staticmethod
-    def generate_comparison_block(product_a: ProductModel, product_b: ProductModel) -> ContentBlock:
-        """Generate comparison content block between two products."""
+    def generate_comparison_block(product_a: Union[ProductModel, ComparisonFacts],
+                                  product_b: Union[ProductModel, ComparisonFacts]) -> ContentBlock:
+        """Generate comparison content block between two products.
+        
+        Either side may be passed as precomputed ComparisonFacts so a product
+        compared many times is only normalized once.
+        """
+        facts_a = comparison_facts(product_a)
+        facts_b = comparison_facts(product_b)
+        
         content = {
             "products": {
-                "product_a": {
-                    "name": product_a.name,
-                    "price": product_a.price,
-                    "concentration": product_a.concentration,
-                    "key_ingredients": product_a.key_ingredients,
-                    "benefits": product_a.benefits,
-                    "skin_types": product_a.skin_types
-                },
-                "product_b": {
-                    "name": product_b.name,
-                    "price": product_b.price,
-                    "concentration": product_b.concentration,
-                    "key_ingredients": product_b.key_ingredients,
-                    "benefits": product_b.benefits,
-                    "skin_types": product_b.skin_types
-                }
+                "product_a": facts_a.summary,
+                "product_b": facts_b.summary
             },
-            "comparison_points": {
-                "price_difference": f"{product_a.price} vs {product_b.price}",
-                "concentration_difference": f"{product_a.concentration} vs {product_b.concentration}",
-                "ingredient_overlap": list(set(product_a.key_ingredients) & set(product_b.key_ingredients)),
-                "unique_benefits_a": list(set(product_a.benefits) - set(product_b.benefits)),
-                "unique_benefits_b": list(set(product_b.benefits) - set(product_a.benefits))
-            }
+            "comparison_points": ContentLogicBlocks._comparison_points(facts_a, facts_b)
         }
         
         return ContentBlock(
@@ -137,6 +250,74 @@ class ContentLogicBlocks:
             dependencies=["product_a_data", "product_b_data"]
         )
     
+    @staticmethod
+    def generate_multi_comparison_block(product: Union[ProductModel, ComparisonFacts],
+                                        competitors: Sequence[Union[ProductModel, ComparisonFacts]]) -> ContentBlock:
+        """Generate a comparison block between one product and K competitors."""
+        facts = comparison_facts(product)
+        competitor_facts = [comparison_facts(competitor) for competitor in competitors]
+        
+        # Prices are only ranked within a currency; the product's currency comes first
+        priced: Dict[str, List[ComparisonFacts]] = {}
+        for f in [facts] + competitor_facts:
+            if f.price_value is not None:
+                priced.setdefault(f.currency, []).append(f)
+        content = {
+            "products": {
+                "primary": facts.summary,
+                "competitors": [competitor.summary for competitor in competitor_facts]
+            },
+            "comparisons": [
+                {"competitor": competitor.name, **ContentLogicBlocks._comparison_points(facts, competitor)}
+                for competitor in competitor_facts
+            ],
+            "price_ranking": {
+                currency: [f.name for f in sorted(group, key=lambda f: f.price_value)]
+                for currency, group in priced.items()
+            },
+            "shared_ingredients": sorted(
+                facts.ingredient_set.intersection(*(c.ingredient_set for c in competitor_facts))
+            ) if competitor_facts else []
+        }
+        
+        return ContentBlock(
+            block_type="multi_comparison",
+            content=content,
+            dependencies=["product_data", "competitor_data"]
+        )
+    
+    @staticmethod
+    def generate_comparison_blocks(products: Sequence[Union[ProductModel, ComparisonFacts]],
+                                   comparison_product: Union[ProductModel, ComparisonFacts]) -> List[ContentBlock]:
+        """Compare many products against one comparator, normalizing it once."""
+        comparator = comparison_facts(comparison_product)
+        return [
+            ContentLogicBlocks.generate_comparison_block(product, comparator)
+            for product in products
+        ]
+    
+    @staticmethod
+    def generate_multi_comparison_blocks(products: Sequence[Union[ProductModel, ComparisonFacts]],
+                                         competitors: Sequence[Union[ProductModel, ComparisonFacts]]) -> List[ContentBlock]:
+        """Compare many products against the same competitors, normalizing them once."""
+        competitor_facts = [comparison_facts(competitor) for competitor in competitors]
+        return [
+            ContentLogicBlocks.generate_multi_comparison_block(product, competitor_facts)
+            for product in products
+        ]
+    
+    @staticmethod
+    def _comparison_points(facts_a: ComparisonFacts, facts_b: ComparisonFacts) -> Dict[str, Any]:
+        """Pairwise comparison points from precomputed facts."""
+        return {
+            "price_difference": f"{facts_a.price} vs {facts_b.price}",
+            "concentration_difference": f"{facts_a.concentration} vs {facts_b.concentration}",
+            # Keep source order so output is identical across runs
+            "ingredient_overlap": [i for i in facts_a.key_ingredients if i in facts_b.ingredient_set],
+            "unique_benefits_a": [b for b in facts_a.benefits if b not in facts_b.benefit_set],
+            "unique_benefits_b": [b for b in facts_b.benefits if b not in facts_a.benefit_set]
+        }
+    
     @staticmethod
     def generate_faq_block(questions: List[Question]) -> ContentBlock:
         """Generate FAQ content block from questions."""
@@ -0,0 +1,112 @@
+"""Language-independent facts derived from product data."""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, FrozenSet, Optional, Tuple, Union
+
+from ..models import ProductModel
+
+_PRICE_PATTERN = re.compile(r'([^\d\s.,]*)\s*(\d[\d,]*(?:\.\d+)?)')
+
+# Recognised product types, matched against words in the product name
+PRODUCT_TYPES = (
+    "serum", "cream", "moisturizer", "cleanser", "toner", "sunscreen",
+    "mask", "oil", "lotion", "gel", "essence", "exfoliant"
+)
+
+
+def parse_price(price: str) -> Tuple[str, Optional[float]]:
+    """Split a price string like ``'₹699'`` into ``('₹', 699.0)``."""
+    match = _PRICE_PATTERN.search(price or "")
+    if not match:
+        return "", None
+    return match.group(1), float(match.group(2).replace(",", ""))
+
+
+def product_type(product: ProductModel) -> str:
+    """Product type inferred from the last recognised word in the name."""
+    words = re.findall(r'[a-z]+', product.name.lower())
+    for word in reversed(words):
+        singular = word[:-1] if word.endswith("s") else word
+        if word in PRODUCT_TYPES:
+            return word
+        if singular in PRODUCT_TYPES:
+            return singular
+    return "other"
+
+
+class FrozenSummary(dict):
+    """Read-only product summary shared by every page that shows the product.
+    
+    A dict subclass, so ``json`` encodes it like any other object without a
+    copy; list fields are held as tuples, which encode as JSON arrays.
+    """
+    
+    __slots__ = ()
+    
+    def _read_only(self, *args: Any, **kwargs: Any) -> None:
+        raise TypeError("Product summaries are shared between pages and cannot be modified")
+    
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+    
+    def __hash__(self) -> int:
+        return hash(tuple(self.items()))
+    
+    def __reduce__(self):
+        return FrozenSummary, (dict(self),)
+
+
+@dataclass(frozen=True)
+class ComparisonFacts:
+    """Normalized per-product facts reused across every comparison it appears in.
+    
+    Every field is immutable, so facts can be shared between threads and
+    used as dict keys. ``summary`` is built once and shared by every page.
+    """
+    name: str
+    concentration: str
+    price: str
+    currency: str
+    price_value: Optional[float]
+    key_ingredients: Tuple[str, ...]
+    benefits: Tuple[str, ...]
+    skin_types: Tuple[str, ...]
+    ingredient_set: FrozenSet[str]
+    benefit_set: FrozenSet[str]
+    # Derived from the fields above, so it takes no part in equality or hashing
+    summary: FrozenSummary = field(init=False, repr=False, compare=False, hash=False)
+    
+    def __post_init__(self):
+        object.__setattr__(self, "summary", FrozenSummary(
+            name=self.name,
+            price=self.price,
+            concentration=self.concentration,
+            key_ingredients=self.key_ingredients,
+            benefits=self.benefits,
+            skin_types=self.skin_types
+        ))
+    
+    @classmethod
+    def from_product(cls, product: ProductModel) -> 'ComparisonFacts':
+        """Compute comparison facts once for a product."""
+        currency, price_value = parse_price(product.price)
+        return cls(
+            name=product.name,
+            concentration=product.concentration,
+            price=product.price,
+            currency=currency,
+            price_value=price_value,
+            key_ingredients=tuple(product.key_ingredients),
+            benefits=tuple(product.benefits),
+            skin_types=tuple(product.skin_types),
+            ingredient_set=frozenset(product.key_ingredients),
+            benefit_set=frozenset(product.benefits)
+        )
+
+
+def comparison_facts(product: Union[ProductModel, ComparisonFacts]) -> ComparisonFacts:
+    """Return precomputed facts as-is, or compute them for a product."""
+    if isinstance(product, ComparisonFacts):
+        return product
+    return ComparisonFacts.from_product(product)
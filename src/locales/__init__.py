@@ -0,0 +1 @@
+# Locale string tables
\ No newline at end of file
@@ -0,0 +1,143 @@
+"""Locale string tables for question and page text.
+
+Values are ``str.format`` templates filled from language-independent
+product fragments: ``name``, ``concentration``, ``skin_types``,
+``benefits``, ``benefits_plain``, ``ingredients``, ``price``,
+``side_effects`` and ``usage_instructions``.
+"""
+
+from functools import lru_cache
+from typing import Dict
+
+DEFAULT_LOCALE = "en"
+
+STRING_TABLES: Dict[str, Dict[str, str]] = {
+    "en": {
+        # Informational
+        "q.what_is": "What is {name}?",
+        "a.what_is": "{name} is a {concentration} skincare serum designed for {skin_types} skin types.",
+        "q.main_benefits": "What are the main benefits of {name}?",
+        "a.main_benefits": "The main benefits include {benefits}.",
+        "q.skin_types": "What skin types is this product suitable for?",
+        "a.skin_types": "This product is suitable for {skin_types} skin types.",
+        # Safety
+        "q.side_effects": "Are there any side effects?",
+        "a.side_effects": "{side_effects}",
+        "q.who_side_effects": "Who might experience side effects?",
+        "a.who_side_effects": "Based on the product information, sensitive skin users may experience the mentioned side effects.",
+        # Usage
+        "q.how_to_use": "How do I use this product?",
+        "a.how_to_use": "{usage_instructions}",
+        "q.when_to_apply": "When should I apply this serum?",
+        "a.when_to_apply": "Based on the instructions, this should be applied in the morning before sunscreen.",
+        "q.how_much": "How much product should I use?",
+        "a.how_much": "Use 2-3 drops as recommended in the usage instructions.",
+        # Purchase
+        "q.price": "What is the price of this product?",
+        "a.price": "The price is {price}.",
+        "q.worth_price": "Is this product worth the price?",
+        "a.worth_price": "At {price}, this product offers {benefits_plain} with {concentration} active ingredient.",
+        # Comparison
+        "q.compare": "How does this compare to other vitamin C serums?",
+        "a.compare": "This serum contains {concentration} and is specifically formulated for {skin_types} skin types.",
+        "q.unique": "What makes this product unique?",
+        "a.unique": "The combination of {ingredients} makes this product effective for {benefits}.",
+        # Ingredients
+        "q.key_ingredients": "What are the key ingredients?",
+        "a.key_ingredients": "The key ingredients are {ingredients}.",
+        "q.vitamin_c": "What does Vitamin C do for the skin?",
+        "a.vitamin_c": "Vitamin C is known for its brightening properties and ability to fade dark spots.",
+        "q.concentration": "What is the concentration of active ingredients?",
+        "a.concentration": "This product contains {concentration}.",
+        # Pages
+        "page.faq_title": "{name} - Frequently Asked Questions",
+        "page.comparison_title": "Product Comparison",
+        "page.multi_comparison_title": "{name} vs Competitors",
+        "page.recommendation": "Choose based on your specific skin needs and budget",
+        "page.comparison_note": "Product B is a fictional comparator created to demonstrate comparison logic",
+    },
+    "es": {
+        "q.what_is": "¿Qué es {name}?",
+        "a.what_is": "{name} es un sérum para el cuidado de la piel con {concentration}, diseñado para pieles de tipo {skin_types}.",
+        "q.main_benefits": "¿Cuáles son los principales beneficios de {name}?",
+        "a.main_benefits": "Los principales beneficios incluyen {benefits}.",
+        "q.skin_types": "¿Para qué tipos de piel es adecuado este producto?",
+        "a.skin_types": "Este producto es adecuado para pieles de tipo {skin_types}.",
+        "q.side_effects": "¿Tiene efectos secundarios?",
+        "a.side_effects": "{side_effects}",
+        "q.who_side_effects": "¿Quién podría experimentar efectos secundarios?",
+        "a.who_side_effects": "Según la información del producto, las personas con piel sensible pueden experimentar los efectos secundarios mencionados.",
+        "q.how_to_use": "¿Cómo uso este producto?",
+        "a.how_to_use": "{usage_instructions}",
+        "q.when_to_apply": "¿Cuándo debo aplicar este sérum?",
+        "a.when_to_apply": "Según las instrucciones, debe aplicarse por la mañana antes del protector solar.",
+        "q.how_much": "¿Cuánto producto debo usar?",
+        "a.how_much": "Usa 2-3 gotas, como se recomienda en las instrucciones de uso.",
+        "q.price": "¿Cuál es el precio de este producto?",
+        "a.price": "El precio es {price}.",
+        "q.worth_price": "¿Vale la pena este producto por su precio?",
+        "a.worth_price": "Por {price}, este producto ofrece {benefits_plain} con {concentration} como ingrediente activo.",
+        "q.compare": "¿Cómo se compara con otros sérums de vitamina C?",
+        "a.compare": "Este sérum contiene {concentration} y está formulado específicamente para pieles de tipo {skin_types}.",
+        "q.unique": "¿Qué hace único a este producto?",
+        "a.unique": "La combinación de {ingredients} hace que este producto sea eficaz para {benefits}.",
+        "q.key_ingredients": "¿Cuáles son los ingredientes clave?",
+        "a.key_ingredients": "Los ingredientes clave son {ingredients}.",
+        "q.vitamin_c": "¿Qué hace la vitamina C por la piel?",
+        "a.vitamin_c": "La vitamina C es conocida por sus propiedades iluminadoras y su capacidad para atenuar las manchas oscuras.",
+        "q.concentration": "¿Cuál es la concentración de ingredientes activos?",
+        "a.concentration": "Este producto contiene {concentration}.",
+        "page.faq_title": "{name} - Preguntas frecuentes",
+        "page.comparison_title": "Comparación de productos",
+        "page.multi_comparison_title": "{name} frente a la competencia",
+        "page.recommendation": "Elige según las necesidades de tu piel y tu presupuesto",
+        "page.comparison_note": "El producto B es un comparador ficticio creado para demostrar la lógica de comparación",
+    },
+    "fr": {
+        "q.what_is": "Qu'est-ce que {name} ?",
+        "a.what_is": "{name} est un sérum de soin à {concentration} conçu pour les peaux de type {skin_types}.",
+        "q.main_benefits": "Quels sont les principaux bienfaits de {name} ?",
+        "a.main_benefits": "Les principaux bienfaits incluent {benefits}.",
+        "q.skin_types": "À quels types de peau ce produit convient-il ?",
+        "a.skin_types": "Ce produit convient aux peaux de type {skin_types}.",
+        "q.side_effects": "Y a-t-il des effets secondaires ?",
+        "a.side_effects": "{side_effects}",
+        "q.who_side_effects": "Qui pourrait ressentir des effets secondaires ?",
+        "a.who_side_effects": "D'après les informations sur le produit, les peaux sensibles peuvent ressentir les effets secondaires mentionnés.",
+        "q.how_to_use": "Comment utiliser ce produit ?",
+        "a.how_to_use": "{usage_instructions}",
+        "q.when_to_apply": "Quand appliquer ce sérum ?",
+        "a.when_to_apply": "D'après les instructions, il doit être appliqué le matin avant la crème solaire.",
+        "q.how_much": "Quelle quantité de produit utiliser ?",
+        "a.how_much": "Utilisez 2 à 3 gouttes, comme recommandé dans le mode d'emploi.",
+        "q.price": "Quel est le prix de ce produit ?",
+        "a.price": "Le prix est de {price}.",
+        "q.worth_price": "Ce produit vaut-il son prix ?",
+        "a.worth_price": "À {price}, ce produit offre {benefits_plain} avec {concentration} comme principe actif.",
+        "q.compare": "Comment se compare-t-il aux autres sérums à la vitamine C ?",
+        "a.compare": "Ce sérum contient {concentration} et est spécialement formulé pour les peaux de type {skin_types}.",
+        "q.unique": "Qu'est-ce qui rend ce produit unique ?",
+        "a.unique": "L'association de {ingredients} rend ce produit efficace pour {benefits}.",
+        "q.key_ingredients": "Quels sont les ingrédients clés ?",
+        "a.key_ingredients": "Les ingrédients clés sont {ingredients}.",
+        "q.vitamin_c": "Quels sont les effets de la vitamine C sur la peau ?",
+        "a.vitamin_c": "La vitamine C est connue pour ses propriétés éclaircissantes et sa capacité à atténuer les taches brunes.",
+        "q.concentration": "Quelle est la concentration en principes actifs ?",
+        "a.concentration": "Ce produit contient {concentration}.",
+        "page.faq_title": "{name} - Foire aux questions",
+        "page.comparison_title": "Comparaison de produits",
+        "page.multi_comparison_title": "{name} face à la concurrence",
+        "page.recommendation": "Choisissez selon les besoins de votre peau et votre budget",
+        "page.comparison_note": "Le produit B est un comparateur fictif créé pour illustrer la logique de comparaison",
+    },
+}
+
+
+@lru_cache(maxsize=None)
+def get_string_table(locale: str = DEFAULT_LOCALE) -> Dict[str, str]:
+    """String table for ``locale``; missing keys fall back to the default locale."""
+    if locale not in STRING_TABLES:
+        raise ValueError(f"Unknown locale: {locale}. Available: {sorted(STRING_TABLES)}")
+    if locale == DEFAULT_LOCALE:
+        return STRING_TABLES[DEFAULT_LOCALE]
+    return {**STRING_TABLES[DEFAULT_LOCALE], **STRING_TABLES[locale]}
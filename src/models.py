@@ -1,5 +1,7 @@
 """Data models for the content generation system."""
 
+import hashlib
+import re
 from dataclasses import dataclass
 from typing import List, Dict, Any, Optional
 from enum import Enum
@@ -40,6 +42,16 @@ class ProductModel:
             price=raw_data.get('price', '')
         )
 
+    @property
+    def key(self) -> str:
+        """Stable slug identifying the product across runs.
+        
+        A short hash of the raw name keeps names that slug alike (``Serum``
+        and ``Serum+``) in separate outputs and manifest entries.
+        """
+        slug = re.sub(r'[^a-z0-9]+', '-', self.name.lower()).strip('-') or 'product'
+        return f"{slug}-{hashlib.blake2b(self.name.encode('utf-8'), digest_size=4).hexdigest()}"
+
 
 @dataclass
 class Question:
@@ -83,4 +95,12 @@ class GeneratedPage:
     
     def __post_init__(self):
         if self.metadata is None:
-            self.metadata = {}
\ No newline at end of file
+            self.metadata = {}
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable representation used for JSON output."""
+        return {
+            "page_type": self.page_type,
+            "content": self.content,
+            "metadata": self.metadata
+        }
\ No newline at end of file
@@ -0,0 +1 @@
+# Output backends
\ No newline at end of file
@@ -0,0 +1,57 @@
+"""Common interface for page output backends."""
+
+import hashlib
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+
+from ..models import GeneratedPage
+
+# Top-level content keys that change on every run (timestamps) and are
+# excluded when deciding whether a page changed
+VOLATILE_CONTENT_KEYS = ("metadata",)
+
+
+def stable_content(content: Dict[str, Any]) -> Dict[str, Any]:
+    """Page content without run-specific fields."""
+    return {key: value for key, value in content.items() if key not in VOLATILE_CONTENT_KEYS}
+
+
+def content_hash(content: Dict[str, Any]) -> str:
+    """Deterministic hash of a page's stable content."""
+    serialized = json.dumps(stable_content(content), sort_keys=True,
+                            ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+class OutputWriter(ABC):
+    """Destination for generated pages, written one product at a time."""
+    
+    # Whether ``write`` also takes lazy page views in place of GeneratedPage
+    accepts_views = False
+    
+    @abstractmethod
+    def write(self, product_key: Optional[str], generated_pages: Dict[str, GeneratedPage],
+              digest=None) -> Dict[str, str]:
+        """Persist a product's pages and return a location per page type.
+        
+        If a hashlib ``digest`` is given it is updated with the bytes written.
+        """
+        pass
+    
+    def flush(self) -> None:
+        """Make every page passed to ``write`` so far durable.
+        
+        Called before a progress manifest records products as done.
+        """
+        pass
+    
+    def close(self) -> None:
+        """Flush buffered pages and release resources."""
+        pass
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,196 @@
+"""Compact catalog encoding with a shared string table for FAQ text."""
+
+import json
+import os
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from .base import OutputWriter
+from ..models import GeneratedPage
+
+_SEPARATORS = (",", ":")
+
+
+class StringTable:
+    """Assigns an integer index to strings that repeat.
+    
+    A string seen for the first time is not interned (``intern`` returns
+    ``None`` and the caller writes it inline); only its second use adds it
+    to the table. The table holds at most ``limit`` strings (the writer
+    resets it when it is full) and the set of strings seen once is
+    forgotten when it reaches four times that.
+    """
+    
+    def __init__(self, limit: int = 65536):
+        self.limit = limit
+        self.strings: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._seen: Set[str] = set()
+    
+    def intern(self, text: str) -> Optional[int]:
+        index = self._index.get(text)
+        if index is not None:
+            return index
+        if text not in self._seen:
+            if len(self._seen) >= 4 * self.limit:
+                self._seen.clear()
+            self._seen.add(text)
+            return None
+        self._seen.discard(text)
+        index = self._index[text] = len(self.strings)
+        self.strings.append(text)
+        return index
+    
+    @property
+    def full(self) -> bool:
+        return len(self.strings) >= self.limit
+    
+    def reset(self) -> None:
+        self.strings = []
+        self._index.clear()
+        self._seen.clear()
+    
+    def __len__(self) -> int:
+        return len(self.strings)
+
+
+def _encode_text(text: str, table: StringTable):
+    index = table.intern(text)
+    return text if index is None else index
+
+
+def _encode_pairs(pairs: List[Dict[str, str]], table: StringTable) -> List[list]:
+    return [[_encode_text(pair["question"], table), _encode_text(pair["answer"], table)]
+            for pair in pairs]
+
+
+def _decode_text(value, strings: List[str]) -> str:
+    return strings[value] if isinstance(value, int) else value
+
+
+def _decode_pairs(pairs: List[list], strings: List[str]) -> List[Dict[str, str]]:
+    return [{"question": _decode_text(q, strings), "answer": _decode_text(a, strings)}
+            for q, a in pairs]
+
+
+def encode_content(page_type: str, content: Dict[str, Any], table: StringTable) -> Dict[str, Any]:
+    """Replace FAQ question/answer pairs with ``[question, answer]`` lists.
+    
+    Each element is a string table index, or the text itself if it has not
+    repeated yet.
+    
+    Other page types are returned unchanged.
+    """
+    if page_type != "faq":
+        return content
+    
+    questions = content["sections"]["questions"]
+    encoded_questions = {
+        "by_category": {
+            category: _encode_pairs(pairs, table)
+            for category, pairs in questions["by_category"].items()
+        },
+        "featured": _encode_pairs(questions["featured"], table)
+    }
+    return {**content, "sections": {**content["sections"], "questions": encoded_questions}}
+
+
+def decode_content(page_type: str, content: Dict[str, Any], strings: List[str]) -> Dict[str, Any]:
+    """Inverse of ``encode_content``."""
+    if page_type != "faq":
+        return content
+    
+    questions = content["sections"]["questions"]
+    decoded_questions = {
+        "by_category": {
+            category: _decode_pairs(pairs, strings)
+            for category, pairs in questions["by_category"].items()
+        },
+        "featured": _decode_pairs(questions["featured"], strings)
+    }
+    return {**content, "sections": {**content["sections"], "questions": decoded_questions}}
+
+
+class CompactCatalogWriter(OutputWriter):
+    """Writes the whole catalog as one compact NDJSON file.
+    
+    Each line holds one page: ``k`` product key, ``t`` page type, ``c``
+    encoded content, ``m`` metadata, and ``s`` with any strings the page
+    added to the table. ``r`` marks a line that starts a fresh table, which
+    happens when the table is full and on the first line appended to an
+    existing file, so a resumed run appends instead of truncating. Appending
+    ``s`` to the table in line order rebuilds it, so the file can be written
+    and read as a stream. After a resume a product may appear twice; its
+    later lines win.
+    """
+    
+    def __init__(self, path: str, table_limit: int = 65536):
+        self.path = path
+        self.table = StringTable(table_limit)
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+        self._reset = self._file.tell() > 0
+        if self._reset:
+            _terminate_last_line(path)
+    
+    def write(self, product_key: Optional[str], generated_pages: Dict[str, GeneratedPage],
+              digest=None) -> Dict[str, str]:
+        with self._lock:
+            lines = []
+            for page_type, page in generated_pages.items():
+                if self.table.full:
+                    self.table.reset()
+                    self._reset = True
+                known = len(self.table)
+                encoded = encode_content(page_type, page.content, self.table)
+                record = {"k": product_key, "t": page_type, "c": encoded, "m": page.metadata}
+                if len(self.table) > known:
+                    record["s"] = self.table.strings[known:]
+                if self._reset:
+                    record["r"] = 1
+                    self._reset = False
+                lines.append(json.dumps(record, ensure_ascii=False, separators=_SEPARATORS))
+            
+            data = "\n".join(lines) + "\n"
+            if digest is not None:
+                digest.update(data.encode("utf-8"))
+            self._file.write(data)
+        return {page_type: self.path for page_type in generated_pages}
+    
+    def flush(self) -> None:
+        with self._lock:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+    
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+def _terminate_last_line(path: str) -> None:
+    """End a line torn by a crash so the next record starts on its own line."""
+    with open(path, "rb+") as f:
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) != b"\n":
+            f.write(b"\n")
+
+
+def expand_catalog(path: str) -> Iterator[Tuple[str, GeneratedPage]]:
+    """Stream ``(product_key, page)`` pairs back out of a compact catalog file."""
+    strings: List[str] = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # Line torn by a crash before a resumed run appended to the file
+                continue
+            if "r" in record:
+                strings = []
+            strings.extend(record.get("s", ()))
+            page_type = record["t"]
+            yield record["k"], GeneratedPage(
+                page_type=page_type,
+                content=decode_content(page_type, record["c"], strings),
+                metadata=record["m"]
+            )
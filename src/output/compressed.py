@@ -0,0 +1,214 @@
+"""Streaming compressed output using stdlib codecs."""
+
+import bz2
+import gzip
+import json
+import logging
+import lzma
+import os
+import queue
+import threading
+from typing import Callable, Dict, Optional
+
+from .base import OutputWriter
+from .json_files import FILENAME_MAPPING
+from ..models import GeneratedPage
+
+# codec name -> (file suffix, opener taking (path, level, mode)); all three
+# codecs read files of several appended streams back as one
+CODECS: Dict[str, tuple] = {
+    "gzip": (".gz", lambda path, level, mode="wb": gzip.open(path, mode, compresslevel=6 if level is None else level)),
+    "bz2": (".bz2", lambda path, level, mode="wb": bz2.open(path, mode, compresslevel=9 if level is None else level)),
+    "lzma": (".xz", lambda path, level, mode="wb": lzma.open(path, mode, preset=level)),
+}
+
+
+def _codec(name: str) -> tuple:
+    try:
+        return CODECS[name]
+    except KeyError:
+        raise ValueError(f"Unknown compression codec: {name}. Expected one of {sorted(CODECS)}")
+
+
+class _CompressionThread:
+    """Runs compression jobs in order on a background thread.
+    
+    The queue is bounded so a slow compressor applies backpressure to the
+    caller. A failure is re-raised from the next ``submit`` or ``close``.
+    """
+    
+    def __init__(self, queue_size: int):
+        self._queue: "queue.Queue[Optional[Callable[[], None]]]" = queue.Queue(queue_size)
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, name="compressor", daemon=True)
+        self._thread.start()
+    
+    def submit(self, job: Callable[[], None]) -> None:
+        self._raise_pending()
+        self._queue.put(job)
+    
+    def wait(self) -> None:
+        """Block until every job submitted so far has run."""
+        self._queue.join()
+        self._raise_pending()
+    
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+        self._raise_pending()
+    
+    def _run(self) -> None:
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+                if self._error is None:
+                    job()
+            except BaseException as e:
+                logging.getLogger("Output.Compression").error("Compression job failed: %s", e)
+                self._error = e
+            finally:
+                self._queue.task_done()
+    
+    def _raise_pending(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+
+class _CompressedWriter(OutputWriter):
+    """Serializes on the calling thread and compresses inline or in the background."""
+    
+    def __init__(self, codec: str, level: Optional[int], threaded: bool, queue_size: int):
+        self.suffix, self._opener = _codec(codec)
+        self.level = level
+        self._background = _CompressionThread(queue_size) if threaded else None
+    
+    def _submit(self, job: Callable[[], None]) -> None:
+        if self._background is None:
+            job()
+        else:
+            self._background.submit(job)
+    
+    def flush(self) -> None:
+        """Wait for queued compression jobs to finish."""
+        if self._background is not None:
+            self._background.wait()
+    
+    def close(self) -> None:
+        if self._background is not None:
+            self._background.close()
+
+
+class CompressedFileWriter(_CompressedWriter):
+    """One compressed JSON file per page, e.g. ``<key>/faq.json.gz``."""
+    
+    def __init__(self, output_dir: str = "output", codec: str = "gzip", level: Optional[int] = None,
+                 threaded: bool = False, queue_size: int = 64):
+        super().__init__(codec, level, threaded, queue_size)
+        self.output_dir = output_dir
+    
+    def write(self, product_key: Optional[str], generated_pages: Dict[str, GeneratedPage],
+              digest=None) -> Dict[str, str]:
+        output_dir = os.path.join(self.output_dir, product_key) if product_key else self.output_dir
+        output_files = {}
+        jobs = []
+        for page_type, page in generated_pages.items():
+            filename = FILENAME_MAPPING.get(page_type, f"{page_type}.json")
+            filepath = os.path.join(output_dir, filename + self.suffix)
+            data = json.dumps(page.to_dict(), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            if digest is not None:
+                digest.update(data)
+            jobs.append((filepath, data))
+            output_files[page_type] = filepath
+        
+        def job():
+            os.makedirs(output_dir, exist_ok=True)
+            for filepath, data in jobs:
+                with self._opener(filepath, self.level) as f:
+                    f.write(data)
+        
+        self._submit(job)
+        return output_files
+
+
+class CompressedStreamWriter(_CompressedWriter):
+    """Compressed NDJSON streams, one per shard of ``shard_size`` products.
+    
+    Shards are named ``pages-00000.ndjson<suffix>``; each line is a page dict
+    with an added ``product_key``. A new writer starts after the highest
+    shard already in ``output_dir``, so a resumed run never overwrites
+    earlier output. ``flush`` ends the current compressed stream and
+    fsyncs the shard; later pages go into a new stream appended to it.
+    """
+    
+    def __init__(self, output_dir: str = "output", codec: str = "gzip", level: Optional[int] = None,
+                 shard_size: int = 10000, threaded: bool = False, queue_size: int = 64):
+        super().__init__(codec, level, threaded, queue_size)
+        self.output_dir = output_dir
+        self.shard_size = shard_size
+        self._lock = threading.Lock()
+        self._shard_products = 0
+        self._stream = None
+        os.makedirs(output_dir, exist_ok=True)
+        self._shard_index = self._next_shard_index()
+    
+    def write(self, product_key: Optional[str], generated_pages: Dict[str, GeneratedPage],
+              digest=None) -> Dict[str, str]:
+        data = "".join(
+            json.dumps({"product_key": product_key, **page.to_dict()},
+                       ensure_ascii=False, separators=(",", ":")) + "\n"
+            for page in generated_pages.values()
+        ).encode("utf-8")
+        if digest is not None:
+            digest.update(data)
+        
+        # Shard assignment happens here so returned locations are exact
+        with self._lock:
+            if self._shard_products >= self.shard_size:
+                self._shard_index += 1
+                self._shard_products = 0
+            self._shard_products += 1
+            shard_path = self._shard_path(self._shard_index)
+            self._submit(lambda: self._append(shard_path, data))
+        return {page_type: shard_path for page_type in generated_pages}
+    
+    def flush(self) -> None:
+        # Queued behind the pending appends, so it ends the stream they write to
+        with self._lock:
+            self._submit(self._end_stream)
+        super().flush()
+    
+    def close(self) -> None:
+        super().close()
+        if self._stream is not None:
+            self._stream[1].close()
+            self._stream = None
+    
+    def _next_shard_index(self) -> int:
+        prefix, suffix = "pages-", f".ndjson{self.suffix}"
+        indexes = [
+            int(name[len(prefix):-len(suffix)]) for name in os.listdir(self.output_dir)
+            if name.startswith(prefix) and name.endswith(suffix)
+            and name[len(prefix):-len(suffix)].isdigit()
+        ]
+        return max(indexes) + 1 if indexes else 0
+    
+    def _shard_path(self, index: int) -> str:
+        return os.path.join(self.output_dir, f"pages-{index:05d}.ndjson{self.suffix}")
+    
+    def _append(self, shard_path: str, data: bytes) -> None:
+        if self._stream is None or self._stream[0] != shard_path:
+            if self._stream is not None:
+                self._stream[1].close()
+            self._stream = (shard_path, self._opener(shard_path, self.level, "ab"))
+        self._stream[1].write(data)
+    
+    def _end_stream(self) -> None:
+        if self._stream is None:
+            return
+        shard_path, stream = self._stream
+        stream.close()
+        self._stream = None
+        with open(shard_path, "rb") as f:
+            os.fsync(f.fileno())
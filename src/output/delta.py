@@ -0,0 +1,74 @@
+"""Delta output: JSON patches against the previous run's pages."""
+
+import json
+import threading
+from typing import Dict, Optional
+
+from .base import OutputWriter, stable_content
+from .json_patch import make_patch
+from .sqlite_store import SQLitePageStore
+from ..models import GeneratedPage
+
+
+class DeltaWriter(OutputWriter):
+    """Emits RFC 6902 patches for pages that changed since the stored version.
+    
+    Each changed page becomes one NDJSON line in ``patch_path``: a ``patch``
+    record for pages the store already holds, or a ``create`` record with
+    the full content for new ones. Unchanged pages produce nothing. Run
+    metadata (timestamps) is excluded from the comparison. New pages are
+    saved to ``store``, and each patch is made against the store's latest
+    version of the page, committed or still buffered, so patches apply in
+    file order even when a product is written twice.
+    """
+    
+    def __init__(self, store: SQLitePageStore, patch_path: str):
+        self.store = store
+        self.patch_path = patch_path
+        self._file = open(patch_path, "w", encoding="utf-8")
+        self._lock = threading.Lock()
+        self.created = 0
+        self.patched = 0
+        self.unchanged = 0
+    
+    def write(self, product_key: Optional[str], generated_pages: Dict[str, GeneratedPage],
+              digest=None) -> Dict[str, str]:
+        lines = []
+        created = patched = unchanged = 0
+        for page_type, page in generated_pages.items():
+            new_content = stable_content(page.content)
+            previous = self.store.get_page(product_key, page_type)
+            
+            if previous is None:
+                record = {"op": "create", "product_key": product_key,
+                          "page_type": page_type, "content": new_content}
+                created += 1
+            else:
+                patch = make_patch(stable_content(previous.content), new_content)
+                if not patch:
+                    unchanged += 1
+                    continue
+                record = {"op": "patch", "product_key": product_key,
+                          "page_type": page_type, "patch": patch}
+                patched += 1
+            lines.append(json.dumps(record, ensure_ascii=False, separators=(",", ":")))
+        
+        self.store.write(product_key, generated_pages, digest)
+        
+        with self._lock:
+            if lines:
+                self._file.write("\n".join(lines) + "\n")
+            self.created += created
+            self.patched += patched
+            self.unchanged += unchanged
+        return {page_type: self.patch_path for page_type in generated_pages}
+    
+    def flush(self) -> None:
+        with self._lock:
+            self._file.flush()
+        self.store.flush()
+    
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+        self.store.close()
@@ -0,0 +1,92 @@
+"""One-JSON-file-per-page output backend."""
+
+import os
+import threading
+from typing import Dict, Optional, Set, Union
+
+from .base import OutputWriter
+from .streaming import LazyObject, page_view, write_json
+from ..models import GeneratedPage
+
+PageOrView = Union[GeneratedPage, LazyObject]
+
+# Map page types to required filenames
+FILENAME_MAPPING = {
+    'faq': 'faq.json',
+    'product': 'product_page.json',
+    'comparison': 'comparison_page.json',
+    'multi_comparison': 'multi_comparison_page.json'
+}
+
+
+class JsonFileWriter(OutputWriter):
+    """Writes each page to its own JSON file.
+    
+    With ``per_product_dirs`` each product gets a subdirectory named after
+    its key; otherwise files land directly in ``output_dir``. Pages may be
+    given as lazy views from ``TemplateEngineAgent.render_views``, which are
+    streamed to disk without ever building the page dict. With ``durable``,
+    ``flush`` fsyncs the files written since the previous flush; otherwise
+    they are left to the operating system.
+    """
+    
+    accepts_views = True
+    
+    def __init__(self, output_dir: str = "output", per_product_dirs: bool = True,
+                 indent: Optional[int] = 2, ensure_ascii: bool = False,
+                 include_metadata: bool = True, durable: bool = False):
+        self.output_dir = output_dir
+        self.per_product_dirs = per_product_dirs
+        self.indent = indent
+        self.ensure_ascii = ensure_ascii
+        self.include_metadata = include_metadata
+        # Compact separators when not pretty-printing
+        self.separators = None if indent is not None else (",", ":")
+        self.durable = durable
+        self._unsynced: Set[str] = set()
+        self._lock = threading.Lock()
+    
+    def write(self, product_key: Optional[str], generated_pages: Dict[str, PageOrView],
+              digest=None) -> Dict[str, str]:
+        output_dir = self.output_dir
+        if self.per_product_dirs and product_key:
+            output_dir = os.path.join(output_dir, product_key)
+        os.makedirs(output_dir, exist_ok=True)
+        
+        output_files = {}
+        for page_type, page in generated_pages.items():
+            filename = FILENAME_MAPPING.get(page_type, f"{page_type}.json")
+            filepath = os.path.join(output_dir, filename)
+            
+            # Encode field by field into the file instead of building the page string
+            if isinstance(page, GeneratedPage):
+                page = page_view(page.page_type, page.content, page.metadata)
+            if not self.include_metadata:
+                page = page.without("metadata")
+            with open(filepath, 'wb') as f:
+                write_json(page, f, digest, indent=self.indent, ensure_ascii=self.ensure_ascii,
+                           separators=self.separators)
+            
+            output_files[page_type] = filepath
+        
+        if self.durable:
+            with self._lock:
+                self._unsynced.update(output_files.values())
+        return output_files
+    
+    def flush(self) -> None:
+        with self._lock:
+            paths, self._unsynced = self._unsynced, set()
+        directories = set()
+        for path in paths:
+            with open(path, 'rb') as f:
+                os.fsync(f.fileno())
+            directories.add(os.path.dirname(path) or ".")
+        # New files are only durable once their directory entries are
+        if hasattr(os, "O_DIRECTORY"):
+            for directory in directories:
+                fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
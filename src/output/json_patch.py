@@ -0,0 +1,104 @@
+"""Minimal RFC 6902 JSON Patch generation and application."""
+
+import copy
+from typing import Any, Dict, List
+
+Patch = List[Dict[str, Any]]
+
+
+def _escape(token: str) -> str:
+    return token.replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def _json_type(value: Any) -> type:
+    if isinstance(value, dict):
+        return dict
+    if isinstance(value, (list, tuple)):
+        return list
+    return type(value)
+
+
+def make_patch(old: Any, new: Any, path: str = "") -> Patch:
+    """Operations that turn ``old`` into ``new``.
+    
+    Objects are diffed key by key and lists element by element, with trailing
+    elements added or removed; ``move``/``copy`` are never emitted. Values of
+    different JSON types are replaced even if Python compares them equal, so
+    ``1`` and ``True`` or ``1`` and ``1.0`` stay distinct; dict subclasses
+    count as objects and tuples as arrays, as ``json`` encodes them.
+    """
+    if _json_type(old) is not _json_type(new):
+        return [{"op": "replace", "path": path, "value": new}]
+    
+    if isinstance(old, dict):
+        operations: Patch = []
+        for key in old:
+            if key not in new:
+                operations.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+        for key, value in new.items():
+            child = f"{path}/{_escape(key)}"
+            if key not in old:
+                operations.append({"op": "add", "path": child, "value": value})
+            else:
+                operations.extend(make_patch(old[key], value, child))
+        return operations
+    
+    if isinstance(old, (list, tuple)):
+        operations = []
+        shared = min(len(old), len(new))
+        for index in range(shared):
+            operations.extend(make_patch(old[index], new[index], f"{path}/{index}"))
+        # Remove from the end so earlier indexes stay valid
+        for index in range(len(old) - 1, shared - 1, -1):
+            operations.append({"op": "remove", "path": f"{path}/{index}"})
+        for value in new[shared:]:
+            operations.append({"op": "add", "path": f"{path}/-", "value": value})
+        return operations
+    
+    if old == new:
+        return []
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+def apply_patch(document: Any, patch: Patch) -> Any:
+    """Return a copy of ``document`` with ``add``/``remove``/``replace`` operations applied."""
+    document = copy.deepcopy(document)
+    for operation in patch:
+        op = operation["op"]
+        if operation["path"] == "":
+            if op == "remove":
+                raise ValueError("Cannot remove the document root")
+            document = copy.deepcopy(operation["value"])
+            continue
+        
+        *parents, last = [_unescape(token) for token in operation["path"].split("/")[1:]]
+        target = document
+        for token in parents:
+            target = target[int(token)] if isinstance(target, list) else target[token]
+        
+        if isinstance(target, list):
+            if op == "add":
+                if last == "-":
+                    target.append(copy.deepcopy(operation["value"]))
+                else:
+                    target.insert(int(last), copy.deepcopy(operation["value"]))
+            elif op == "remove":
+                del target[int(last)]
+            elif op == "replace":
+                target[int(last)] = copy.deepcopy(operation["value"])
+            else:
+                raise ValueError(f"Unsupported patch operation: {op}")
+        else:
+            if op in ("add", "replace"):
+                if op == "replace" and last not in target:
+                    raise ValueError(f"Path does not exist: {operation['path']}")
+                target[last] = copy.deepcopy(operation["value"])
+            elif op == "remove":
+                del target[last]
+            else:
+                raise ValueError(f"Unsupported patch operation: {op}")
+    return document
@@ -0,0 +1,167 @@
+"""SQLite page store with indexed lookups."""
+
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .base import OutputWriter, content_hash
+from ..models import GeneratedPage
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at TEXT NOT NULL,
+    finished_at TEXT
+);
+CREATE TABLE IF NOT EXISTS pages (
+    product_key TEXT NOT NULL,
+    page_type TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    content TEXT NOT NULL,
+    metadata TEXT NOT NULL,
+    run_id INTEGER NOT NULL,
+    changed_run_id INTEGER NOT NULL,
+    PRIMARY KEY (product_key, page_type)
+);
+CREATE INDEX IF NOT EXISTS idx_pages_page_type ON pages (page_type);
+CREATE INDEX IF NOT EXISTS idx_pages_content_hash ON pages (content_hash);
+CREATE INDEX IF NOT EXISTS idx_pages_changed_run ON pages (changed_run_id);
+"""
+
+_UPSERT = """
+INSERT INTO pages (product_key, page_type, content_hash, content, metadata, run_id, changed_run_id)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (product_key, page_type) DO UPDATE SET
+    content = excluded.content,
+    metadata = excluded.metadata,
+    run_id = excluded.run_id,
+    changed_run_id = CASE WHEN pages.content_hash = excluded.content_hash
+                          THEN pages.changed_run_id ELSE excluded.run_id END,
+    content_hash = excluded.content_hash
+"""
+
+
+class SQLitePageStore(OutputWriter):
+    """Stores generated pages as rows keyed by product key and page type.
+    
+    Writes are buffered and committed ``batch_size`` rows per transaction in
+    WAL mode; ``flush`` commits the rest. Each store instance opened for writing registers a run; a page's
+    ``changed_run_id`` only advances when its content hash changes, which lets
+    downstream exporters read incrementally with ``changed_since``.
+    """
+    
+    def __init__(self, path: str, batch_size: int = 500, start_run: bool = True):
+        self.path = path
+        self.batch_size = batch_size
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        
+        self._lock = threading.Lock()
+        # Buffered rows by (product_key, page_type); a later write replaces an earlier one
+        self._pending: Dict[Tuple[str, str], Tuple[Any, ...]] = {}
+        self.run_id: Optional[int] = None
+        if start_run:
+            with self.conn:
+                cursor = self.conn.execute(
+                    "INSERT INTO runs (started_at) VALUES (?)", (datetime.now().isoformat(),)
+                )
+            self.run_id = cursor.lastrowid
+    
+    def write(self, product_key: Optional[str], generated_pages: Dict[str, GeneratedPage],
+              digest=None) -> Dict[str, str]:
+        if self.run_id is None:
+            raise ValueError("Store was opened read-only (start_run=False)")
+        
+        rows = []
+        locations = {}
+        for page_type, page in generated_pages.items():
+            page_hash = content_hash(page.content)
+            if digest is not None:
+                digest.update(page_hash.encode("ascii"))
+            rows.append((
+                product_key, page_type, page_hash,
+                json.dumps(page.content, ensure_ascii=False, separators=(",", ":")),
+                json.dumps(page.metadata, ensure_ascii=False, separators=(",", ":")),
+                self.run_id, self.run_id
+            ))
+            locations[page_type] = f"sqlite:{self.path}#{product_key}/{page_type}"
+        
+        with self._lock:
+            for row in rows:
+                self._pending[row[0], row[1]] = row
+            if len(self._pending) >= self.batch_size:
+                self._flush_locked()
+        return locations
+    
+    def flush(self) -> None:
+        """Commit buffered rows."""
+        with self._lock:
+            self._flush_locked()
+    
+    def close(self) -> None:
+        self.flush()
+        if self.run_id is not None:
+            with self.conn:
+                self.conn.execute(
+                    "UPDATE runs SET finished_at = ? WHERE run_id = ?",
+                    (datetime.now().isoformat(), self.run_id)
+                )
+        self.conn.close()
+    
+    def get_page(self, product_key: str, page_type: str) -> Optional[GeneratedPage]:
+        """Fetch one page by product key and page type, including rows not yet committed."""
+        with self._lock:
+            pending = self._pending.get((product_key, page_type))
+            if pending is not None:
+                return GeneratedPage(page_type=page_type, content=json.loads(pending[3]),
+                                     metadata=json.loads(pending[4]))
+            row = self.conn.execute(
+                "SELECT content, metadata FROM pages WHERE product_key = ? AND page_type = ?",
+                (product_key, page_type)
+            ).fetchone()
+        if row is None:
+            return None
+        return GeneratedPage(page_type=page_type, content=json.loads(row[0]), metadata=json.loads(row[1]))
+    
+    def changed_since(self, run_id: int, page_type: Optional[str] = None) -> Iterator[Tuple[str, str, str]]:
+        """Yield ``(product_key, page_type, content_hash)`` for pages changed after ``run_id``."""
+        query = "SELECT product_key, page_type, content_hash FROM pages WHERE changed_run_id > ?"
+        params: Tuple[Any, ...] = (run_id,)
+        if page_type is not None:
+            query += " AND page_type = ?"
+            params += (page_type,)
+        # Rows are fetched in chunks under the lock, never while yielding
+        with self._lock:
+            cursor = self.conn.execute(query, params)
+        while True:
+            with self._lock:
+                rows = cursor.fetchmany(self.batch_size)
+            if not rows:
+                return
+            yield from rows
+    
+    def find_by_hash(self, page_hash: str) -> List[Tuple[str, str]]:
+        """All ``(product_key, page_type)`` pairs whose content has the given hash."""
+        with self._lock:
+            return self.conn.execute(
+                "SELECT product_key, page_type FROM pages WHERE content_hash = ?", (page_hash,)
+            ).fetchall()
+    
+    def latest_run_id(self) -> Optional[int]:
+        """Most recent finished run, if any."""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT MAX(run_id) FROM runs WHERE finished_at IS NOT NULL"
+            ).fetchone()
+        return row[0]
+    
+    def _flush_locked(self) -> None:
+        if not self._pending:
+            return
+        with self.conn:
+            self.conn.executemany(_UPSERT, self._pending.values())
+        self._pending.clear()
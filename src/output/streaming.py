@@ -0,0 +1,150 @@
+"""Streaming JSON encoding of pages without building page dicts."""
+
+import json
+from typing import Any, Callable, Iterable, Iterator, Optional, Tuple
+
+# Bytes collected before a write to the underlying file
+WRITE_BUFFER_SIZE = 64 * 1024
+
+# Private factory behind json's pure-Python encoder; reusing it is faster for
+# indented output than the public encoder. If a Python release drops it,
+# iter_json falls back to the public one.
+_make_iterencode = getattr(json.encoder, "_make_iterencode", None)
+
+
+class LazyObject:
+    """A JSON object whose string-keyed ``(key, value)`` pairs are produced on demand.
+    
+    ``fields(*args)`` is called each time the object is iterated, so a page
+    can be encoded straight from its content blocks and product fields
+    instead of first being copied into a dict.
+    """
+    
+    __slots__ = ("_fields", "_args")
+    
+    def __init__(self, fields: Callable[..., Iterable[Tuple[str, Any]]], *args: Any):
+        self._fields = fields
+        self._args = args
+    
+    def items(self) -> Iterable[Tuple[str, Any]]:
+        return self._fields(*self._args)
+    
+    def without(self, key: str) -> 'LazyObject':
+        """The same object with ``key`` left out."""
+        return LazyObject(lambda: ((k, v) for k, v in self.items() if k != key))
+    
+    def to_dict(self) -> dict:
+        """Materialize this object; nested lazy objects become dicts too."""
+        return {
+            key: value.to_dict() if isinstance(value, LazyObject) else value
+            for key, value in self.items()
+        }
+
+
+def _page_fields(page_type: str, content: Any, metadata: Any) -> Iterator[Tuple[str, Any]]:
+    yield "page_type", page_type
+    yield "content", content
+    yield "metadata", metadata
+
+
+def page_view(page_type: str, content: Any, metadata: Any) -> LazyObject:
+    """Lazy equivalent of ``GeneratedPage.to_dict()``."""
+    return LazyObject(_page_fields, page_type, content, metadata)
+
+
+def _float_repr(value: float) -> str:
+    """Float encoding used by ``json.dumps`` with ``allow_nan``."""
+    if value != value:
+        return "NaN"
+    if value in (float("inf"), float("-inf")):
+        return "Infinity" if value > 0 else "-Infinity"
+    return float.__repr__(value)
+
+
+def iter_json(obj: Any, indent: Optional[int] = None, ensure_ascii: bool = True,
+              separators: Optional[Tuple[str, str]] = None) -> Iterator[str]:
+    """Encode ``obj`` in chunks, producing exactly what ``json.dumps`` would.
+    
+    Lazy objects are walked field by field; every other value (block
+    content, product fields) is encoded in one call to an encoder built
+    once per ``iter_json`` call.
+    """
+    if separators is None:
+        separators = (",", ": ") if indent is not None else (", ", ": ")
+    item_separator, key_separator = separators
+    if isinstance(indent, int):
+        indent = " " * indent
+    encode_key = json.encoder.encode_basestring_ascii if ensure_ascii else json.encoder.encode_basestring
+    if indent is None:
+        # Compact output goes through the C encoder, which has no indent state
+        encode_compact = json.JSONEncoder(ensure_ascii=ensure_ascii, separators=separators).encode
+        encode = lambda value, level: encode_compact(value)
+    elif _make_iterencode is not None:
+        # JSONEncoder.encode rebuilds its encoder closures on every call, which
+        # dominates for small fields, so build them once and reuse them at any
+        # nesting level
+        iterencode = _make_iterencode(
+            None, json.JSONEncoder().default, encode_key, indent, _float_repr,
+            key_separator, item_separator, False, False, False
+        )
+        encode = lambda value, level: "".join(iterencode(value, level))
+    else:
+        # The public encoder always starts at nesting level 0. JSON text never
+        # holds a raw newline inside a string, so a value is moved to a deeper
+        # level by indenting every line after its first.
+        encode_indented = json.JSONEncoder(
+            ensure_ascii=ensure_ascii, indent=indent, separators=separators
+        ).encode
+        encode = lambda value, level: encode_indented(value).replace("\n", "\n" + indent * level)
+    
+    def iter_object(value: LazyObject, level: int) -> Iterator[str]:
+        if indent is not None:
+            newline = "\n" + indent * (level + 1)
+            closing = "\n" + indent * level
+        else:
+            newline = closing = ""
+        separator = "{" + newline
+        for key, item in value.items():
+            prefix = separator + encode_key(key) + key_separator
+            separator = item_separator + newline
+            if isinstance(item, LazyObject):
+                yield prefix
+                yield from iter_object(item, level + 1)
+            else:
+                yield prefix + encode(item, level + 1)
+        yield "{}" if separator[0] == "{" else closing + "}"
+    
+    if isinstance(obj, LazyObject):
+        return iter_object(obj, 0)
+    return iter([encode(obj, 0)])
+
+
+def write_json(obj: Any, fp, digest=None, **options: Any) -> int:
+    """Stream ``obj`` as UTF-8 JSON to the binary file ``fp``.
+    
+    Chunks are buffered and written in blocks of about ``WRITE_BUFFER_SIZE``
+    bytes; if a hashlib ``digest`` is given it is updated with the same
+    bytes. Returns the number of bytes written.
+    """
+    written = 0
+    pending = []
+    pending_size = 0
+    
+    def flush() -> None:
+        nonlocal written, pending_size
+        data = "".join(pending).encode("utf-8")
+        fp.write(data)
+        if digest is not None:
+            digest.update(data)
+        written += len(data)
+        pending.clear()
+        pending_size = 0
+    
+    for chunk in iter_json(obj, **options):
+        pending.append(chunk)
+        pending_size += len(chunk)
+        if pending_size >= WRITE_BUFFER_SIZE:
+            flush()
+    if pending:
+        flush()
+    return written
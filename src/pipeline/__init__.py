@@ -0,0 +1 @@
+# Pipeline runtime utilities
\ No newline at end of file
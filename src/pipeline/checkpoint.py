@@ -0,0 +1,106 @@
+"""Append-only progress manifest for resumable batch runs."""
+
+import json
+import os
+from typing import Callable, Dict, List, Optional
+
+COMPLETED = "done"
+FAILED = "failed"
+
+
+class ProgressManifest:
+    """Records completed product keys and their output hashes.
+    
+    Entries are appended as JSON lines and flushed in batches of
+    ``flush_every``; on load the last entry for a key wins, so a product that
+    failed and later succeeded is treated as completed. A torn final line left
+    by a crash is ignored and terminated, so the next entry starts on a line
+    of its own. ``before_flush`` runs before entries are written, so the
+    output they describe can be made durable first.
+    """
+    
+    def __init__(self, path: str, flush_every: int = 100,
+                 before_flush: Optional[Callable[[], None]] = None):
+        self.path = path
+        self.flush_every = flush_every
+        self.before_flush = before_flush
+        self._entries: Dict[str, Dict[str, Optional[str]]] = {}
+        self._pending: List[str] = []
+        self._completed = 0
+        self._load()
+    
+    def is_completed(self, key: str) -> bool:
+        """Whether ``key`` finished successfully in this or a previous run."""
+        entry = self._entries.get(key)
+        return entry is not None and entry["status"] == COMPLETED
+    
+    def output_hash(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        return entry["hash"] if entry else None
+    
+    def record(self, key: str, status: str = COMPLETED, output_hash: Optional[str] = None) -> None:
+        """Append an entry; it reaches disk on the next batch flush."""
+        self._count(self._entries.get(key), -1)
+        self._entries[key] = {"status": status, "hash": output_hash}
+        self._count(self._entries[key], 1)
+        self._pending.append(json.dumps(
+            {"key": key, "status": status, "hash": output_hash},
+            ensure_ascii=False, separators=(",", ":")
+        ))
+        if len(self._pending) >= self.flush_every:
+            self.flush()
+    
+    def flush(self) -> None:
+        """Write pending entries and fsync the manifest."""
+        if not self._pending:
+            return
+        if self.before_flush is not None:
+            self.before_flush()
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("\n".join(self._pending) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._pending.clear()
+    
+    def close(self) -> None:
+        self.flush()
+    
+    def __enter__(self) -> "ProgressManifest":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def __len__(self) -> int:
+        return self._completed
+    
+    def _count(self, entry: Optional[Dict[str, Optional[str]]], delta: int) -> None:
+        if entry is not None and entry["status"] == COMPLETED:
+            self._completed += delta
+    
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            return
+        
+        # A torn line may end inside a multi-byte character
+        with open(self.path, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Partially written line from an interrupted flush
+                    continue
+                self._count(self._entries.get(entry["key"]), -1)
+                self._entries[entry["key"]] = {"status": entry["status"], "hash": entry.get("hash")}
+                self._count(self._entries[entry["key"]], 1)
+        
+        # Terminate a torn final line so the next flush does not extend it
+        with open(self.path, "rb+") as f:
+            size = f.seek(0, os.SEEK_END)
+            if size:
+                f.seek(size - 1)
+                if f.read(1) != b"\n":
+                    f.write(b"\n")
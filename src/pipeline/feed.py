@@ -0,0 +1,40 @@
+"""Readers for product input feeds."""
+
+import json
+from typing import Any, Dict, Iterator, Union
+
+
+class MalformedRecord:
+    """Stands in for a feed record that is not valid JSON.
+    
+    Yielded instead of raising so the bad record fails on its own when it is
+    parsed, rather than aborting the whole batch.
+    """
+    
+    __slots__ = ("error",)
+    
+    def __init__(self, error: ValueError):
+        self.error = error
+    
+    def to_error(self) -> ValueError:
+        return ValueError(f"Malformed JSON record: {self.error}")
+
+
+def iter_feed(path: str) -> Iterator[Union[Dict[str, Any], MalformedRecord]]:
+    """Yield raw product records from a feed file.
+    
+    ``.json`` files hold a single record or an array of records; anything
+    else is read as JSON Lines, one record per non-blank line. A line that
+    is not valid JSON is yielded as a ``MalformedRecord``.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith(".json"):
+            data = json.load(f)
+            yield from (data if isinstance(data, list) else [data])
+            return
+        for line in f:
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except ValueError as e:
+                    yield MalformedRecord(e)
@@ -0,0 +1,153 @@
+"""Raw-record fingerprints for skipping unchanged products between runs."""
+
+import dataclasses
+import hashlib
+import json
+import mmap
+import os
+import re
+from functools import partial
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Set
+
+from .feed import MalformedRecord, iter_feed
+
+DIGEST_SIZE = 16
+
+_NON_BLANK = re.compile(rb"\S")
+
+
+def fingerprint(data: bytes) -> bytes:
+    """blake2b digest of one raw record."""
+    return hashlib.blake2b(data, digest_size=DIGEST_SIZE).digest()
+
+
+def _plain(value: Any) -> Any:
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {f.name: getattr(value, f.name) for f in dataclasses.fields(value)}
+    if isinstance(value, Mapping):
+        return dict(value)
+    raise TypeError(f"Cannot fingerprint {type(value).__name__}")
+
+
+def context_digest(context: Any) -> bytes:
+    """Digest of the settings and options an index was built under.
+    
+    ``context`` is JSON data, where mappings and dataclasses such as
+    ``Settings`` may stand in for objects.
+    """
+    encoded = json.dumps(context, sort_keys=True, ensure_ascii=False, separators=(",", ":"),
+                         default=_plain)
+    return fingerprint(encoded.encode("utf-8"))
+
+
+def load_fingerprints(path: str, context: bytes = b"") -> Set[bytes]:
+    """Digests stored by ``save_fingerprints`` under the same ``context`` digest.
+    
+    Empty if there is no index yet or it was saved under another context.
+    """
+    if not os.path.exists(path):
+        return set()
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:DIGEST_SIZE] != fingerprint(context):
+        return set()
+    return {data[i:i + DIGEST_SIZE] for i in range(DIGEST_SIZE, len(data) - DIGEST_SIZE + 1, DIGEST_SIZE)}
+
+
+def save_fingerprints(path: str, digests: Iterable[bytes], context: bytes = b"") -> None:
+    """Atomically replace the index at ``path`` with ``digests``, headed by the ``context`` digest."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(fingerprint(context))
+        for digest in digests:
+            f.write(digest)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _identity(record: Dict[str, Any]) -> Dict[str, Any]:
+    return record
+
+
+class FingerprintFilter:
+    """Pre-stage that passes on only feed records changed since the last run.
+    
+    Each raw record is hashed before it is parsed and looked up in the index
+    written by the previous run; records whose bytes are unchanged are never
+    decoded. JSON Lines feeds are memory-mapped and hashed line by line, so
+    parsing and generation scale with the change set. ``.json`` array feeds
+    have no record boundaries in the raw bytes and are parsed, then hashed
+    in a canonical encoding.
+    
+    The new index holds every record of the current feed, so deleted records
+    drop out of it. Call ``save`` after the batch, passing the positions of
+    records that failed so they are retried next time. A line that is not
+    valid JSON is passed on as a ``MalformedRecord``, which fails when parsed.
+    
+    ``context`` holds whatever else shapes the output (settings, generation
+    and writer options); an index saved under a different context is
+    discarded, so every record is regenerated.
+    """
+    
+    def __init__(self, index_path: str, context: Any = None):
+        self.index_path = index_path
+        self.context = context_digest(context)
+        self.previous = load_fingerprints(index_path, self.context)
+        self.total = 0
+        self.unchanged = 0
+        # Concatenated digests of this run's records (DIGEST_SIZE bytes each),
+        # and the digests of the records passed on, by position
+        self._current = bytearray()
+        self._passed: List[bytes] = []
+    
+    def iter_changed(self, feed_path: str) -> Iterator[Dict[str, Any]]:
+        """Yield the parsed records of ``feed_path`` that are new or changed."""
+        if feed_path.endswith(".json"):
+            records = self._iter_json_records(feed_path)
+        else:
+            records = self._iter_lines(feed_path)
+        
+        for digest, load in records:
+            self.total += 1
+            self._current += digest
+            if digest in self.previous:
+                self.unchanged += 1
+                continue
+            self._passed.append(digest)
+            try:
+                yield load()
+            except ValueError as e:
+                yield MalformedRecord(e)
+    
+    def save(self, failed: Iterable[int] = ()) -> None:
+        """Write this run's index, leaving out the passed-on records at ``failed`` positions."""
+        retry = {self._passed[position] for position in failed}
+        current = self._current
+        digests = (bytes(current[i:i + DIGEST_SIZE]) for i in range(0, len(current), DIGEST_SIZE))
+        save_fingerprints(self.index_path, (digest for digest in digests if digest not in retry),
+                          self.context)
+    
+    def _iter_lines(self, path: str):
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                start, end = 0, len(mapped)
+                while start < end:
+                    stop = mapped.find(b"\n", start)
+                    if stop < 0:
+                        stop = end
+                    # Blank lines are skipped without copying them out of the map
+                    if _NON_BLANK.search(mapped, start, stop):
+                        line = mapped[start:stop]
+                        yield fingerprint(line), partial(json.loads, line)
+                    start = stop + 1
+    
+    def _iter_json_records(self, path: str):
+        for record in iter_feed(path):
+            canonical = json.dumps(record, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+            yield fingerprint(canonical.encode("utf-8")), partial(_identity, record)
@@ -0,0 +1,57 @@
+"""Rate-limited progress reporting for batch runs."""
+
+import logging
+import time
+from typing import Optional
+
+
+class ProgressReporter:
+    """Aggregates per-item outcomes and logs a summary at a fixed rate.
+
+    Batch runs call ``update`` once per product; a log line is emitted at
+    most once every ``interval`` seconds regardless of catalog size.
+    """
+
+    def __init__(self, logger: logging.Logger, total: Optional[int] = None,
+                 interval: float = 5.0, label: str = "products"):
+        self.logger = logger
+        self.total = total
+        self.interval = interval
+        self.label = label
+        self.completed = 0
+        self.failed = 0
+        self.skipped = 0
+        self._started = time.monotonic()
+        self._last_emit = self._started
+
+    def update(self, succeeded: bool = True, skipped: bool = False) -> None:
+        """Record one processed item and emit progress if the interval elapsed."""
+        if skipped:
+            self.skipped += 1
+        elif succeeded:
+            self.completed += 1
+        else:
+            self.failed += 1
+
+        now = time.monotonic()
+        if now - self._last_emit >= self.interval:
+            self._last_emit = now
+            self._emit(now)
+
+    def finish(self) -> None:
+        """Emit the final summary line."""
+        self._emit(time.monotonic(), final=True)
+
+    @property
+    def processed(self) -> int:
+        return self.completed + self.failed + self.skipped
+
+    def _emit(self, now: float, final: bool = False) -> None:
+        elapsed = max(now - self._started, 1e-9)
+        rate = (self.completed + self.failed) / elapsed
+        position = f"{self.processed}/{self.total}" if self.total is not None else str(self.processed)
+        self.logger.info(
+            "%s %s %s (ok=%d failed=%d skipped=%d, %.1f/s, %.1fs elapsed)",
+            "Finished" if final else "Progress", position, self.label,
+            self.completed, self.failed, self.skipped, rate, elapsed
+        )
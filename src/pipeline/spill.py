@@ -0,0 +1,216 @@
+"""Memory budget accounting and spill-to-disk containers."""
+
+import pickle
+import struct
+import sys
+import tempfile
+from array import array
+from typing import Any, Generic, Iterable, Iterator, List, Optional, Set, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# Bytes per chunk in a packed (offset, length) chunk index
+CHUNK_ENTRY_SIZE = 2 * array('Q').itemsize
+
+# Length prefix of every chunk in the spill file
+_FRAME = struct.Struct("<Q")
+
+# Bytes copied at a time when regions are compacted
+_COPY_SIZE = 1024 * 1024
+
+
+def estimate_size(obj: Any) -> int:
+    """Approximate in-memory size of plain data (dicts, sequences, scalars)."""
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(estimate_size(key) + estimate_size(value) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item) for item in obj)
+    return size
+
+
+class MemoryBudget:
+    """Shared byte budget for catalog-wide intermediate structures.
+    
+    A ``limit`` of ``None`` means unbounded: reservations always succeed.
+    All containers under one budget spill into a single anonymous temp file,
+    so the number of open files does not grow with the number of containers.
+    Chunks are length-prefixed, so a region of the file holding several
+    consecutive chunks can be indexed by one ``(offset, length)`` entry.
+    """
+    
+    def __init__(self, limit: Optional[int] = None):
+        self.limit = limit
+        self.used = 0
+        self.spilled = 0
+        self._file = None
+        self._containers: Set['SpillableList'] = set()
+    
+    @classmethod
+    def from_megabytes(cls, megabytes: Optional[float]) -> 'MemoryBudget':
+        """Budget of ``megabytes`` MB; ``None`` is unbounded, zero or less is rejected."""
+        if megabytes is None:
+            return cls()
+        if megabytes <= 0:
+            raise ValueError(f"Memory budget must be positive, got {megabytes} MB")
+        return cls(int(megabytes * 1024 * 1024))
+    
+    def try_reserve(self, size: int) -> bool:
+        """Account for ``size`` more bytes if they fit in the budget."""
+        if self.limit is not None and self.used + size > self.limit:
+            return False
+        self.used += size
+        return True
+    
+    def release(self, size: int) -> None:
+        self.used = max(0, self.used - size)
+    
+    def spill_all(self) -> None:
+        """Move the in-memory items of every container under this budget to disk.
+        
+        Once chunk index entries take up half the budget, each container's
+        chunks are merged into one region so the index stops growing with
+        the number of spills; the old copies stay in the file as dead space
+        until the budget is closed.
+        """
+        for container in self._containers:
+            container.spill()
+        entries = sum(container.chunk_count for container in self._containers)
+        if (self.limit is not None and entries * CHUNK_ENTRY_SIZE > self.limit // 2
+                and entries > 2 * len(self._containers)):
+            for container in self._containers:
+                container.compact()
+    
+    def write_chunk(self, data: bytes) -> Tuple[int, int]:
+        """Append ``data`` as one chunk and return the ``(offset, length)`` of its region."""
+        offset = self._end()
+        self._file.write(_FRAME.pack(len(data)))
+        self._file.write(data)
+        return offset, _FRAME.size + len(data)
+    
+    def iter_chunks(self, offset: int, length: int) -> Iterator[bytes]:
+        """Chunks stored in the region at ``offset``, read one at a time."""
+        end = offset + length
+        while offset < end:
+            self._file.seek(offset)
+            size, = _FRAME.unpack(self._file.read(_FRAME.size))
+            data = self._file.read(size)
+            offset += _FRAME.size + size
+            yield data
+    
+    def copy_regions(self, regions: Iterable[Tuple[int, int]]) -> Tuple[int, int]:
+        """Copy ``regions`` back to back to the end of the file; returns the new region."""
+        start = position = self._end()
+        for offset, length in regions:
+            while length:
+                self._file.seek(offset)
+                data = self._file.read(min(length, _COPY_SIZE))
+                self._file.seek(position)
+                self._file.write(data)
+                offset += len(data)
+                position += len(data)
+                length -= len(data)
+        return start, position - start
+    
+    def close(self) -> None:
+        """Forget all containers and delete the spill file."""
+        self._containers.clear()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+    
+    def _end(self) -> int:
+        if self._file is None:
+            self._file = tempfile.TemporaryFile(prefix="spill-", buffering=0)
+        return self._file.seek(0, 2)
+
+
+class SpillableList(Generic[T]):
+    """Append-only list whose items move to disk when the budget is spent.
+    
+    Every item is charged to ``budget``. When an append does not fit, the
+    in-memory items of all lists under the budget are pickled to its spill
+    file, one chunk per list, which frees the whole budget at once and keeps
+    chunks large. Only a packed ``(offset, length)`` entry per chunk stays in
+    memory, and it stays charged to the budget: it is kept back from the
+    reservation of the items it replaces. Iteration streams the chunks back
+    in order, then the items still in memory.
+    """
+    
+    def __init__(self, budget: MemoryBudget):
+        self.budget = budget
+        self._items: List[T] = []
+        self._reserved = 0
+        # Flat offset, length, offset, length, ... of the spilled chunks
+        self._chunks = array('Q')
+        self._spilled = 0
+        budget._containers.add(self)
+    
+    def append(self, item: T) -> None:
+        size = estimate_size(item)
+        if not self.budget.try_reserve(size):
+            self.budget.spill_all()
+            if not self.budget.try_reserve(size):
+                # Too large to hold even with everything spilled: write it
+                # straight out, charging only its index entry
+                if not self.budget.try_reserve(CHUNK_ENTRY_SIZE):
+                    raise MemoryError("Memory budget is too small to index spilled items")
+                self._items.append(item)
+                self._reserved += CHUNK_ENTRY_SIZE
+                self.spill()
+                return
+        self._items.append(item)
+        self._reserved += size
+    
+    def __iter__(self) -> Iterator[T]:
+        for i in range(0, len(self._chunks), 2):
+            for data in self.budget.iter_chunks(self._chunks[i], self._chunks[i + 1]):
+                yield from pickle.loads(data)
+        yield from self._items
+    
+    def __len__(self) -> int:
+        return self._spilled + len(self._items)
+    
+    @property
+    def spilled(self) -> bool:
+        return self._spilled > 0
+    
+    @property
+    def chunk_count(self) -> int:
+        """Entries in the chunk index."""
+        return len(self._chunks) // 2
+    
+    def spill(self) -> None:
+        """Write the in-memory items to disk as one chunk."""
+        if not self._items:
+            return
+        self._chunks.extend(self.budget.write_chunk(
+            pickle.dumps(self._items, pickle.HIGHEST_PROTOCOL)
+        ))
+        self._spilled += len(self._items)
+        self.budget.spilled += len(self._items)
+        # Every item reserved at least CHUNK_ENTRY_SIZE bytes, so the index
+        # entry is paid for out of the reservation being freed
+        self.budget.release(self._reserved - CHUNK_ENTRY_SIZE)
+        self._items = []
+        self._reserved = 0
+    
+    def compact(self) -> None:
+        """Merge the spilled chunks into one region with a single index entry."""
+        if self.chunk_count < 2:
+            return
+        chunks = self._chunks
+        merged = self.budget.copy_regions(
+            (chunks[i], chunks[i + 1]) for i in range(0, len(chunks), 2)
+        )
+        self.budget.release((self.chunk_count - 1) * CHUNK_ENTRY_SIZE)
+        self._chunks = array('Q', merged)
+    
+    def close(self) -> None:
+        """Release the memory reservation and forget spilled chunks."""
+        self.budget.release(self._reserved + len(self._chunks) // 2 * CHUNK_ENTRY_SIZE)
+        self.budget._containers.discard(self)
+        self._items = []
+        self._reserved = 0
+        self._chunks = array('Q')
+        self._spilled = 0
@@ -0,0 +1,283 @@
+"""SQLite-backed work queue for splitting a catalog across worker processes."""
+
+import json
+import logging
+import multiprocessing
+import os
+import socket
+import sqlite3
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .progress import ProgressReporter
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS work_items (
+    product_key TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_work_items_claim ON work_items (status, lease_expires);
+"""
+
+
+class SQLiteWorkQueue:
+    """Work queue stored in a single SQLite file.
+    
+    Workers claim batches inside ``BEGIN IMMEDIATE`` transactions, so a batch
+    is handed to exactly one worker. Claims carry a lease that the worker
+    renews while it is busy; items whose lease expired (the worker crashed or
+    stalled) become claimable again, as do failed items, until
+    ``max_attempts`` is reached. An item whose lease expires on its last
+    attempt is marked failed, so a record that crashes its worker is not
+    retried forever. The database uses the
+    rollback journal rather than WAL because WAL's shared-memory index does
+    not work across hosts on a network filesystem.
+    """
+    
+    def __init__(self, path: str, lease_seconds: float = 300.0,
+                 max_attempts: int = 3, busy_timeout: float = 60.0):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.conn = sqlite3.connect(path, timeout=busy_timeout, isolation_level=None)
+        self.conn.executescript(_SCHEMA)
+    
+    def enqueue(self, items: Iterable[Tuple], chunk_size: int = 1000) -> int:
+        """Add ``(product_key, payload)`` items; keys already queued are left as they are.
+        
+        An item may carry a third element, an error message; it is stored as
+        failed with no attempts left.
+        """
+        added = 0
+        chunk: List[Tuple[str, str, str, int, Optional[str]]] = []
+        for key, payload, *error in items:
+            row = (key, json.dumps(payload, ensure_ascii=False))
+            if error and error[0] is not None:
+                chunk.append(row + (FAILED, self.max_attempts, error[0]))
+            else:
+                chunk.append(row + (PENDING, 0, None))
+            if len(chunk) >= chunk_size:
+                added += self._insert(chunk)
+                chunk = []
+        if chunk:
+            added += self._insert(chunk)
+        return added
+    
+    def claim(self, worker_id: str, batch_size: int = 50) -> List[Tuple[str, Dict[str, Any]]]:
+        """Atomically lease up to ``batch_size`` items for ``worker_id``."""
+        now = time.time()
+        with self._transaction():
+            self.conn.execute(
+                "UPDATE work_items SET status = ?, lease_expires = NULL, "
+                "error = 'lease expired on the last attempt' "
+                "WHERE status = ? AND lease_expires < ? AND attempts >= ?",
+                (FAILED, LEASED, now, self.max_attempts)
+            )
+            rows = self.conn.execute(
+                "SELECT product_key, payload FROM work_items "
+                "WHERE status = ? OR ((status = ? AND lease_expires < ?) OR status = ?) "
+                "AND attempts < ? LIMIT ?",
+                (PENDING, LEASED, now, FAILED, self.max_attempts, batch_size)
+            ).fetchall()
+            self.conn.executemany(
+                "UPDATE work_items SET status = ?, worker = ?, lease_expires = ?, "
+                "attempts = attempts + 1 WHERE product_key = ?",
+                [(LEASED, worker_id, now + self.lease_seconds, key) for key, _ in rows]
+            )
+        return [(key, json.loads(payload)) for key, payload in rows]
+    
+    def renew(self, worker_id: str, keys: Iterable[str], seconds: Optional[float] = None) -> int:
+        """Extend ``worker_id``'s leases on ``keys``; returns how many it still held."""
+        expires = time.time() + (self.lease_seconds if seconds is None else seconds)
+        with self._transaction():
+            before = self.conn.total_changes
+            self.conn.executemany(
+                "UPDATE work_items SET lease_expires = ? "
+                "WHERE product_key = ? AND worker = ? AND status = ?",
+                [(expires, key, worker_id, LEASED) for key in keys]
+            )
+            return self.conn.total_changes - before
+    
+    def complete(self, worker_id: str, keys: Iterable[str]) -> None:
+        """Mark items done; items whose lease moved to another worker are untouched."""
+        with self._transaction():
+            self.conn.executemany(
+                "UPDATE work_items SET status = ?, lease_expires = NULL, error = NULL "
+                "WHERE product_key = ? AND worker = ? AND status = ?",
+                [(DONE, key, worker_id, LEASED) for key in keys]
+            )
+    
+    def fail(self, worker_id: str, errors: Dict[str, str]) -> None:
+        """Mark items failed with their error messages so they can be retried."""
+        with self._transaction():
+            self.conn.executemany(
+                "UPDATE work_items SET status = ?, lease_expires = NULL, error = ? "
+                "WHERE product_key = ? AND worker = ? AND status = ?",
+                [(FAILED, error, key, worker_id, LEASED) for key, error in errors.items()]
+            )
+    
+    def counts(self) -> Dict[str, int]:
+        """Number of items in each status."""
+        rows = self.conn.execute("SELECT status, COUNT(*) FROM work_items GROUP BY status")
+        return dict(rows.fetchall())
+    
+    def close(self) -> None:
+        self.conn.close()
+    
+    def _insert(self, chunk: List[Tuple[str, str, str, int, Optional[str]]]) -> int:
+        with self._transaction():
+            before = self.conn.total_changes
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO work_items (product_key, payload, status, attempts, error) "
+                "VALUES (?, ?, ?, ?, ?)", chunk
+            )
+            return self.conn.total_changes - before
+    
+    def _transaction(self):
+        return _ImmediateTransaction(self.conn)
+
+
+class _ImmediateTransaction:
+    """``BEGIN IMMEDIATE`` ... ``COMMIT``/``ROLLBACK`` on an autocommit connection."""
+    
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+    
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+
+
+class QueueWorker:
+    """Claims batches from a SQLiteWorkQueue and runs them through the orchestrator.
+    
+    Without an ``orchestrator`` one is built from ``settings``; without a
+    ``writer`` pages go to the orchestrator's JSON writer under ``output_dir``.
+    """
+    
+    def __init__(self, work_queue: SQLiteWorkQueue, output_dir: str = "output",
+                 worker_id: Optional[str] = None, batch_size: int = 50, orchestrator=None,
+                 writer=None, settings=None):
+        if orchestrator is None:
+            from ..agents.orchestrator_agent import OrchestratorAgent
+            orchestrator = OrchestratorAgent(settings=settings)
+        if writer is None:
+            writer = orchestrator.create_writer(output_dir, durable=True)
+        
+        self.queue = work_queue
+        self.output_dir = output_dir
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.batch_size = batch_size
+        self.orchestrator = orchestrator
+        self.writer = writer
+        self.logger = logging.getLogger(f"Worker.{self.worker_id}")
+    
+    def run(self, progress_interval: float = 5.0) -> Dict[str, int]:
+        """Process batches until the queue has nothing left to claim."""
+        progress = ProgressReporter(self.logger, interval=progress_interval)
+        
+        while True:
+            batch = self.queue.claim(self.worker_id, self.batch_size)
+            if not batch:
+                break
+            
+            completed, errors = [], {}
+            renewed = time.monotonic()
+            for position, (key, payload) in enumerate(batch):
+                # Keep the rest of the batch leased while this worker is busy with it
+                if time.monotonic() - renewed > self.queue.lease_seconds / 2:
+                    self.queue.renew(self.worker_id, [k for k, _ in batch[position:]])
+                    renewed = time.monotonic()
+                try:
+                    pages = self.orchestrator.generate_pages(payload)
+                    self.writer.write(key, pages)
+                except Exception as e:
+                    errors[key] = str(e)
+                    progress.update(succeeded=False)
+                else:
+                    completed.append(key)
+                    progress.update()
+            
+            self.writer.flush()
+            self.queue.complete(self.worker_id, completed)
+            if errors:
+                self.queue.fail(self.worker_id, errors)
+        
+        progress.finish()
+        return {"completed": progress.completed, "failed": progress.failed}
+
+
+def enqueue_catalog(work_queue: SQLiteWorkQueue, product_records: Iterable[Dict[str, Any]]) -> int:
+    """Queue raw product records keyed by their product key.
+    
+    Records that do not parse are queued as failed under ``invalid-<position>``
+    with the parse error, instead of aborting the enqueue part way through.
+    """
+    from ..agents.data_parser_agent import DataParserAgent
+    from .feed import MalformedRecord
+    parser = DataParserAgent()
+    
+    def items():
+        for position, record in enumerate(product_records):
+            if isinstance(record, MalformedRecord):
+                # Nothing of the line survives parsing, so only the error is kept
+                yield f"invalid-{position}", None, str(record.to_error())
+                continue
+            try:
+                yield parser.process(dict(record)).key, record, None
+            except Exception as e:
+                yield f"invalid-{position}", record, str(e)
+    
+    return work_queue.enqueue(items())
+
+
+def _worker_main(queue_path: str, output_dir: str, batch_size: int, lease_seconds: float,
+                 config_path: str) -> None:
+    from ..settings import load_settings
+    work_queue = SQLiteWorkQueue(queue_path, lease_seconds=lease_seconds)
+    try:
+        QueueWorker(work_queue, output_dir, batch_size=batch_size,
+                    settings=load_settings(config_path)).run()
+    finally:
+        work_queue.close()
+
+
+def run_workers(queue_path: str, output_dir: str = "output", processes: int = 0,
+                batch_size: int = 50, lease_seconds: float = 300.0,
+                config_path: str = "config.json") -> Dict[str, int]:
+    """Drain the queue with ``processes`` local worker processes (default: CPU count).
+    
+    Each worker loads its settings from ``config_path``. Other hosts can run
+    the same function against the same queue file.
+    """
+    processes = processes or os.cpu_count() or 1
+    workers = [
+        multiprocessing.Process(
+            target=_worker_main,
+            args=(queue_path, output_dir, batch_size, lease_seconds, config_path)
+        )
+        for _ in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    
+    work_queue = SQLiteWorkQueue(queue_path)
+    try:
+        return work_queue.counts()
+    finally:
+        work_queue.close()
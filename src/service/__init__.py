@@ -0,0 +1 @@
+# Long-lived generation service
\ No newline at end of file
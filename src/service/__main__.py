@@ -0,0 +1,8 @@
+"""Run the generation service: ``python -m src.service --port 8765``."""
+
+import sys
+
+from ..cli import main
+
+if __name__ == "__main__":
+    sys.exit(main(["serve", *sys.argv[1:]]))
@@ -0,0 +1,124 @@
+"""Localhost HTTP service that keeps a warm orchestrator between requests."""
+
+import json
+import logging
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+from ..agents.orchestrator_agent import OrchestratorAgent
+from .latency import LatencyTracker
+from .micro_batcher import MicroBatcher
+
+
+class GenerationService:
+    """Owns one OrchestratorAgent and feeds it micro-batched requests."""
+
+    def __init__(self, orchestrator: Optional[OrchestratorAgent] = None,
+                 max_batch_size: int = 32, max_wait: float = 0.005,
+                 request_timeout: float = 30.0):
+        self.orchestrator = orchestrator or OrchestratorAgent()
+        self.latency = LatencyTracker()
+        self.request_timeout = request_timeout
+        self.batcher = MicroBatcher(self._handle_batch, max_batch_size, max_wait)
+
+    def generate(self, product_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Generate all pages for one product and return them as JSON-ready dicts."""
+        started = time.perf_counter()
+        try:
+            return self.batcher.submit(product_data).result(self.request_timeout)
+        finally:
+            self.latency.record(time.perf_counter() - started)
+
+    def stats(self) -> Dict[str, Any]:
+        """Latency percentiles and batching statistics."""
+        stats = self.latency.summary()
+        stats["batches"] = self.batcher.batches
+        stats["mean_batch_size"] = round(self.batcher.mean_batch_size, 2)
+        return stats
+
+    def close(self) -> None:
+        self.batcher.close()
+
+    def _handle_batch(self, batch: List[Dict[str, Any]]) -> List[Any]:
+        # The whole micro-batch shares one content logic pass
+        return [
+            pages if isinstance(pages, Exception)
+            else {page_type: page.to_dict() for page_type, page in pages.items()}
+            for pages in self.orchestrator.generate_pages_batch(batch)
+        ]
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """Routes ``POST /generate``, ``GET /stats`` and ``GET /health``."""
+
+    service: GenerationService = None
+    logger = logging.getLogger("Service.HTTP")
+
+    def do_GET(self):
+        if self.path == "/stats":
+            self._send_json(200, self.service.stats())
+        elif self.path == "/health":
+            self._send_json(200, {"status": "ok"})
+        else:
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+
+    def do_POST(self):
+        if self.path != "/generate":
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except (ValueError, UnicodeDecodeError) as e:
+            self._send_json(400, {"error": f"Invalid JSON body: {e}"})
+            return
+
+        product_data = payload.get("product_data", payload) if isinstance(payload, dict) else payload
+        try:
+            pages = self.service.generate(product_data)
+        except ValueError as e:
+            self._send_json(400, {"error": str(e)})
+        except Exception as e:
+            self.logger.error("Generation failed: %s", e)
+            self._send_json(500, {"error": str(e)})
+        else:
+            self._send_json(200, {"pages": pages})
+
+    def log_message(self, format, *args):
+        # Per-request access lines are hot-path chatter
+        self.logger.debug(format, *args)
+
+    def _send_json(self, status: int, body: Dict[str, Any]) -> None:
+        data = json.dumps(body, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def create_server(host: str = "127.0.0.1", port: int = 8765,
+                  service: Optional[GenerationService] = None) -> ThreadingHTTPServer:
+    """Build an HTTP server bound to ``host:port`` around a warm service."""
+    handler = type("RequestHandler", (_RequestHandler,), {"service": service or GenerationService()})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def serve(host: str = "127.0.0.1", port: int = 8765, max_batch_size: int = 32,
+          max_wait: float = 0.005, settings=None) -> None:
+    """Run the generation service until interrupted."""
+    service = GenerationService(OrchestratorAgent(settings=settings),
+                                max_batch_size=max_batch_size, max_wait=max_wait)
+    server = create_server(host, port, service)
+    logging.getLogger("Service.HTTP").info("Serving on http://%s:%d", host, server.server_port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
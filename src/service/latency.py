@@ -0,0 +1,38 @@
+"""Request latency tracking with percentile summaries."""
+
+import threading
+from collections import deque
+from typing import Dict
+
+
+class LatencyTracker:
+    """Keeps the most recent ``window`` latencies for percentile reporting."""
+
+    def __init__(self, window: int = 10000):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.total = 0
+
+    def record(self, seconds: float) -> None:
+        """Record one request latency in seconds."""
+        with self._lock:
+            self._samples.append(seconds)
+            self.total += 1
+
+    def percentile(self, pct: float) -> float:
+        """Nearest-rank percentile over the current window, in milliseconds."""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return 0.0
+        rank = max(0, min(len(samples) - 1, int(round(pct / 100.0 * len(samples))) - 1))
+        return samples[rank] * 1000.0
+
+    def summary(self) -> Dict[str, float]:
+        """Summary suitable for the stats endpoint."""
+        return {
+            "requests": self.total,
+            "window": len(self._samples),
+            "p50_ms": round(self.percentile(50), 3),
+            "p99_ms": round(self.percentile(99), 3)
+        }
@@ -0,0 +1,95 @@
+"""Micro-batching of concurrent requests onto a single warm worker."""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Tuple
+
+
+class MicroBatcher:
+    """Collects concurrently submitted items into small batches.
+
+    A single worker thread blocks for the first item, then keeps draining the
+    queue until ``max_batch_size`` items are collected or ``max_wait`` seconds
+    have passed. ``handler`` receives the batch and returns one result (or an
+    exception instance) per item, in order.
+    """
+
+    def __init__(self, handler: Callable[[List[Any]], List[Any]],
+                 max_batch_size: int = 32, max_wait: float = 0.005):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+
+        self.handler = handler
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.logger = logging.getLogger("Service.MicroBatcher")
+
+        self.batches = 0
+        self.items = 0
+
+        self._queue: "queue.SimpleQueue[Optional[Tuple[Any, Future]]]" = queue.SimpleQueue()
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, item: Any) -> Future:
+        """Queue one item and return a future resolved with its result."""
+        if self._closed:
+            raise RuntimeError("MicroBatcher is closed")
+        future: Future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Stop accepting items and wait for queued work to finish."""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+        self._worker.join(timeout)
+
+    @property
+    def mean_batch_size(self) -> float:
+        return self.items / self.batches if self.batches else 0.0
+
+    def _run(self) -> None:
+        while True:
+            entry = self._queue.get()
+            if entry is None:
+                return
+
+            batch = [entry]
+            stop = False
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    entry = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if entry is None:
+                    stop = True
+                    break
+                batch.append(entry)
+
+            self._dispatch(batch)
+            if stop:
+                return
+
+    def _dispatch(self, batch: List[Tuple[Any, Future]]) -> None:
+        self.batches += 1
+        self.items += len(batch)
+
+        try:
+            results = self.handler([item for item, _ in batch])
+        except Exception as e:
+            self.logger.error("Batch of %d failed: %s", len(batch), e)
+            results = [e] * len(batch)
+
+        for (_, future), result in zip(batch, results):
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
@@ -0,0 +1,56 @@
+"""Immutable application settings loaded from config.json."""
+
+import json
+import os
+from dataclasses import dataclass, field
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
+
+DEFAULT_CONFIG_PATH = "config.json"
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively convert dicts to read-only mappings and lists to tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Read-only view of the system configuration."""
+    name: str = "Multi-Agent Content Generation System"
+    version: str = "1.0.0"
+    output_directory: str = "output"
+    # Catalog-wide intermediate structures spill to disk beyond this; None is unbounded
+    memory_budget_mb: Optional[float] = None
+    agents: Mapping[str, Mapping[str, Any]] = field(default_factory=lambda: MappingProxyType({}))
+    output: Mapping[str, Any] = field(default_factory=lambda: MappingProxyType({}))
+    
+    @classmethod
+    def from_dict(cls, raw: Mapping[str, Any]) -> 'Settings':
+        system = raw.get("system", {})
+        return cls(
+            name=system.get("name", cls.name),
+            version=system.get("version", cls.version),
+            output_directory=system.get("output_directory", cls.output_directory),
+            memory_budget_mb=system.get("memory_budget_mb", cls.memory_budget_mb),
+            agents=_freeze(raw.get("agents", {})),
+            output=_freeze(raw.get("output", {}))
+        )
+    
+    def agent(self, name: str) -> Mapping[str, Any]:
+        """Settings block for one agent (empty if not configured)."""
+        return self.agents.get(name, MappingProxyType({}))
+
+
+@lru_cache(maxsize=None)
+def load_settings(path: str = DEFAULT_CONFIG_PATH) -> Settings:
+    """Read ``path`` once per process; a missing file yields the defaults."""
+    if not os.path.exists(path):
+        return Settings()
+    with open(path, "r", encoding="utf-8") as f:
+        return Settings.from_dict(json.load(f))
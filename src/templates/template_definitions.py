@@ -145,4 +145,76 @@ class TemplateDefinitions:
             required_blocks=["comparison"],
             structure=structure,
             formatting_rules=formatting_rules
+        )
+    
+    @staticmethod
+    def get_multi_comparison_template() -> PageTemplate:
+        """Template for comparing one product against several competitors."""
+        structure = {
+            "page_type": "multi_comparison",
+            "title": "{product_name} vs Competitors",
+            "products": {
+                "primary": "{product_summary}",
+                "competitors": "{competitor_summaries}"
+            },
+            "comparison_analysis": {
+                "pairwise": "{pairwise_comparisons}",
+                "price_ranking": "{price_ranking}",
+                "shared_ingredients": "{shared_ingredients}"
+            },
+            "recommendation": {
+                "summary": "Choose based on your specific skin needs and budget",
+                "factors": ["price", "concentration", "skin_type_match", "ingredient_preferences"]
+            },
+            "metadata": {
+                "generated_at": "{timestamp}",
+                "source": "automated_generation"
+            }
+        }
+        
+        formatting_rules = {
+            "comparison_format": "one_vs_many",
+            "highlight_differences": True,
+            "show_recommendations": True
+        }
+        
+        return PageTemplate(
+            template_type="multi_comparison",
+            required_blocks=["multi_comparison"],
+            structure=structure,
+            formatting_rules=formatting_rules
+        )
+    
+    @staticmethod
+    def get_aggregate_template() -> PageTemplate:
+        """Template for catalog-level aggregate page generation."""
+        structure = {
+            "page_type": "aggregate",
+            "title": "{group_title}",
+            "group": {
+                "id": "{group_id}",
+                "dimension": "{dimension}"
+            },
+            "summary": {
+                "product_count": "{product_count}",
+                "price_range": "{price_range}"
+            },
+            "products": "{products}",
+            "shared_faqs": "{shared_faqs}",
+            "metadata": {
+                "generated_at": "{timestamp}",
+                "source": "automated_generation"
+            }
+        }
+        
+        formatting_rules = {
+            "product_list_format": "name_price",
+            "shared_faq_format": "Q: {question}\nA: {answer}"
+        }
+        
+        return PageTemplate(
+            template_type="aggregate",
+            required_blocks=["aggregate"],
+            structure=structure,
+            formatting_rules=formatting_rules
         )
\ No newline at end of file
@@ -1,8 +1,57 @@
 """Simple test to verify the multi-agent system works correctly."""
 
+import bz2
+import contextlib
+import io
+import gzip
 import json
+import logging
+import lzma
 import os
+import tempfile
+import threading
+import urllib.error
+import urllib.request
+import tracemalloc
 from src.agents.orchestrator_agent import OrchestratorAgent
+from src.agents.async_orchestrator_agent import AsyncOrchestratorAgent
+from src.agents.question_generator_agent import QuestionGeneratorAgent
+from src.pipeline.checkpoint import ProgressManifest, FAILED
+from src.pipeline.progress import ProgressReporter
+from src.cli import main, setup_logging
+from src.service.micro_batcher import MicroBatcher
+from src.service.http_service import GenerationService, create_server
+from src.pipeline.fingerprint import FingerprintFilter
+from src.pipeline.feed import iter_feed
+from src.output.sqlite_store import SQLitePageStore
+from src.output.delta import DeltaWriter
+from src.output.compact import CompactCatalogWriter, expand_catalog
+from src.output.compressed import CODECS, CompressedStreamWriter
+from src.output.base import OutputWriter
+from src.content_logic.content_blocks import ContentLogicBlocks
+from src.content_logic.product_facts import ComparisonFacts
+from src.output.json_patch import make_patch, apply_patch
+from src.pipeline.work_queue import SQLiteWorkQueue, QueueWorker, enqueue_catalog
+from src.settings import Settings
+from src.models import ProductModel, GeneratedPage
+from src.content_logic.aggregate_blocks import CatalogIndex, generate_aggregate_blocks
+from src.pipeline.spill import MemoryBudget, SpillableList
+from src.output import streaming
+from src.output.streaming import iter_json
+
+
+def make_product(name='GlowBoost Vitamin C Serum', price='₹699'):
+    """Raw product record in the input feed format."""
+    return {
+        'Product Name': name,
+        'Concentration': '10% Vitamin C',
+        'Skin Type': 'Oily, Combination',
+        'Key Ingredients': 'Vitamin C, Hyaluronic Acid',
+        'Benefits': 'Brightening, Fades dark spots',
+        'How to Use': 'Apply 2–3 drops in the morning before sunscreen',
+        'Side Effects': 'Mild tingling for sensitive skin',
+        'Price': price
+    }
 
 
 def test_system():
@@ -48,5 +97,821 @@ def test_system():
     return True
 
 
+def test_async_batch_matches_serial_output():
+    """The async pipeline writes the same pages as the serial batch."""
+    records = [make_product(f"Serum {i}") for i in range(20)] + [{'Price': '₹1'}]
+    
+    with tempfile.TemporaryDirectory() as serial_dir, tempfile.TemporaryDirectory() as async_dir:
+        serial = OrchestratorAgent().process_batch(records, serial_dir)
+        overlapped = AsyncOrchestratorAgent(queue_size=2).process_batch(records, async_dir)
+        
+        assert serial["completed"] == overlapped["completed"] == 20
+        assert [f["index"] for f in overlapped["failed"]] == [20]
+        assert sorted(os.listdir(serial_dir)) == sorted(os.listdir(async_dir))
+        
+        serum_3 = ProductModel.from_raw_data({'name': 'Serum 3'}).key
+        with open(os.path.join(async_dir, serum_3, 'faq.json'), encoding='utf-8') as f:
+            assert json.load(f)['content']['title'] == "Serum 3 - Frequently Asked Questions"
+
+
+def test_batch_resumes_from_manifest():
+    """A restarted batch skips products the manifest lists as completed."""
+    records = [make_product(f"Serum {i}") for i in range(10)]
+    
+    with tempfile.TemporaryDirectory() as output_dir:
+        manifest_path = os.path.join(output_dir, 'manifest.jsonl')
+        with ProgressManifest(manifest_path, flush_every=3) as manifest:
+            OrchestratorAgent().process_batch(records[:6], output_dir, manifest=manifest)
+        
+        with ProgressManifest(manifest_path) as manifest:
+            assert len(manifest) == 6
+            result = OrchestratorAgent().process_batch(records, output_dir, manifest=manifest)
+        
+        assert result["completed"] == 4
+        assert len(ProgressManifest(manifest_path)) == 10
+
+
+def test_disabled_stages_are_skipped():
+    """Stages switched off in config produce no blocks, pages or metadata."""
+    settings = Settings.from_dict({
+        "agents": {
+            "question_generator": {"enabled": False},
+            "content_logic": {"content_blocks": ["benefits", "usage"]},
+            "template_engine": {"templates": ["product"]}
+        },
+        "output": {"include_metadata": False}
+    })
+    orchestrator = OrchestratorAgent(settings=settings)
+    
+    pages = orchestrator.generate_pages(make_product())
+    assert list(pages) == ['product']
+    assert 'metadata' not in pages['product'].content
+    assert pages['product'].content['safety']['precautions'] == []
+    assert not orchestrator.questions_enabled
+
+
+def test_catalog_index_spills_beyond_memory_budget():
+    """Index postings stay under the memory budget and read back intact."""
+    budget = MemoryBudget(256 * 1024)
+    
+    tracemalloc.start()
+    index = CatalogIndex(budget)
+    for i in range(5000):
+        index.add(ProductModel(
+            f"Product {i} Serum", "10% Vitamin C", ["Oily", "Dry"],
+            ["Vitamin C", f"Extract {i % 20}"], ["Brightening"], "Apply daily", "None", f"₹{i}"
+        ))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    try:
+        assert budget.spilled > 0
+        assert peak < budget.limit
+        blocks = generate_aggregate_blocks(index)
+        serums = blocks["product-type-serum"].content
+        assert serums["product_count"] == len(serums["products"]) == 5000
+        assert serums["products"][4999]["name"] == "Product 4999 Serum"
+        assert serums["products"][4999]["key"].startswith("product-4999-serum-")
+        assert serums["price_range"] == {"min": "₹0", "max": "₹4999"}
+    finally:
+        index.close()
+
+
+def test_content_logic_batch_matches_per_product():
+    """Batch block generation produces the same blocks as one call per product."""
+    orchestrator = OrchestratorAgent(competitors=[make_product('Rival Cream', '₹450')])
+    products = [
+        orchestrator.parse_product(make_product()),
+        orchestrator.parse_product({**make_product('Calm Night Cream', '₹1,299'),
+                                    'Key Ingredients': 'Vitamin C, Ceramides',
+                                    'Benefits': 'Hydrating',
+                                    'Side Effects': 'None'}),
+        # Shares every cached string with the first product
+        orchestrator.parse_product(make_product('GlowBoost Night Serum'))
+    ]
+    questions = [orchestrator.question_generator.process(product) for product in products]
+    shared = {
+        'comparison_product': orchestrator.comparison_facts,
+        'competitors': orchestrator.competitor_facts
+    }
+    
+    batch = orchestrator.content_logic.process_batch({'products': products, 'questions': questions, **shared})
+    for product, product_questions, blocks in zip(products, questions, batch):
+        single = orchestrator.content_logic.process({'product': product, 'questions': product_questions, **shared})
+        assert list(blocks) == list(single)
+        assert all(blocks[name].content == single[name].content for name in single)
+
+
+def test_streamed_pages_match_generated_pages():
+    """Lazy page views encode to exactly the JSON of the materialized pages."""
+    orchestrator = OrchestratorAgent(
+        competitors=[make_product('Rival Cream', '₹450')],
+        settings=Settings.from_dict({"output": {"include_metadata": False}})
+    )
+    product = orchestrator.parse_product(make_product())
+    pages = orchestrator._build_pages(product)
+    views = orchestrator._build_pages(product, views=True)
+    
+    assert list(views) == list(pages)
+    # The fast indented path needs json's private encoder factory; the public fallback must agree
+    assert streaming._make_iterencode is not None, "json.encoder._make_iterencode is gone"
+    fast = streaming._make_iterencode
+    try:
+        for make_iterencode in (fast, None):
+            streaming._make_iterencode = make_iterencode
+            for page_type, page in pages.items():
+                for options in ({"indent": 2, "ensure_ascii": False}, {"indent": "\t"},
+                                {"separators": (",", ":")}):
+                    expected = json.dumps(page.to_dict(), **options)
+                    assert "".join(iter_json(views[page_type], **options)) == expected
+    finally:
+        streaming._make_iterencode = fast
+
+
+def test_fingerprints_pass_only_changed_records():
+    """Unchanged feed records are skipped on the next run; failed ones are retried."""
+    records = [make_product(f"Serum {i}") for i in range(5)] + [{'Price': '₹1'}]
+    
+    with tempfile.TemporaryDirectory() as output_dir:
+        feed_path = os.path.join(output_dir, 'feed.jsonl')
+        index_path = os.path.join(output_dir, 'feed.fp')
+        
+        def run_batch():
+            fingerprints = FingerprintFilter(index_path)
+            result = OrchestratorAgent().process_batch(fingerprints.iter_changed(feed_path), output_dir)
+            fingerprints.save(failure["index"] for failure in result["failed"])
+            return result["completed"], len(result["failed"])
+        
+        def write_feed():
+            with open(feed_path, 'w', encoding='utf-8') as f:
+                f.write("\n".join(json.dumps(record, ensure_ascii=False) for record in records))
+                # A torn line fails on its own instead of aborting the batch
+                f.write('\n{"Product Name": "Torn')
+        
+        write_feed()
+        assert run_batch() == (5, 2)
+        
+        records[2]['Price'] = '₹799'
+        write_feed()
+        assert run_batch() == (1, 2)
+        
+        for flags in (('--manifest', os.path.join(output_dir, 'run.manifest')),
+                      ('--writer', 'compact'), ('--writer', 'compressed-stream')):
+            code, _, err = run_cli('batch', feed_path, '--fingerprints', index_path, *flags)
+            assert code == 2 and flags[0] in err
+
+
+def test_product_keys_do_not_collide():
+    """Names that slug alike still get distinct, stable keys."""
+    serum = ProductModel.from_raw_data({'name': 'Serum'})
+    serum_plus = ProductModel.from_raw_data({'name': 'Serum+'})
+    assert serum.key != serum_plus.key
+    assert serum.key.startswith('serum-') and serum_plus.key.startswith('serum-')
+    assert serum.key == ProductModel.from_raw_data({'name': 'Serum'}).key
+
+
+def test_progress_reporter_counts_and_rate_limits():
+    """Outcomes are counted and progress is logged at most once per interval."""
+    logger = logging.getLogger('test.progress')
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    try:
+        progress = ProgressReporter(logger, total=4, interval=3600)
+        progress.update()
+        progress.update(succeeded=False)
+        progress.update(skipped=True)
+        progress.update()
+        assert records == []
+        progress.finish()
+    finally:
+        logger.removeHandler(handler)
+    
+    assert (progress.completed, progress.failed, progress.skipped) == (2, 1, 1)
+    assert len(records) == 1
+    assert "Finished 4/4" in records[0].getMessage()
+
+
+def test_setup_logging_writes_through_queue_listener():
+    """Records logged through the queue handler reach the log file once formatted."""
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as work_dir:
+        os.chdir(work_dir)
+        try:
+            listener = setup_logging()
+            logging.getLogger('test.logging').info("hello %s", "queue")
+            listener.stop()
+            for handler in listener.handlers:
+                handler.close()
+            with open(os.path.join('logs', 'system.log'), encoding='utf-8') as f:
+                lines = f.read().splitlines()
+        finally:
+            os.chdir(cwd)
+            root.handlers[:] = saved_handlers
+            root.setLevel(saved_level)
+    
+    assert len(lines) == 1
+    assert lines[0].endswith(" - test.logging - INFO - hello queue")
+
+
+def test_micro_batcher_flushes_on_size_and_time():
+    """Full batches dispatch without waiting; partial ones dispatch after max_wait."""
+    sizes = []
+    def handler(items):
+        sizes.append(len(items))
+        return [item * 2 for item in items]
+    
+    by_size = MicroBatcher(handler, max_batch_size=4, max_wait=60)
+    try:
+        futures = [by_size.submit(i) for i in range(8)]
+        assert [future.result(timeout=5) for future in futures] == [i * 2 for i in range(8)]
+        assert sizes == [4, 4]
+    finally:
+        by_size.close(timeout=5)
+    
+    sizes.clear()
+    by_time = MicroBatcher(handler, max_batch_size=100, max_wait=0.05)
+    try:
+        futures = [by_time.submit(i) for i in range(3)]
+        assert [future.result(timeout=5) for future in futures] == [0, 2, 4]
+        assert sum(sizes) == 3 and max(sizes) < 100
+    finally:
+        by_time.close(timeout=5)
+
+
+def test_generation_service_http_round_trip():
+    """POST /generate returns the same pages as a direct call; bad records get 400."""
+    orchestrator = OrchestratorAgent(settings=Settings.from_dict({"output": {"include_metadata": False}}))
+    service = GenerationService(orchestrator, max_batch_size=8, max_wait=0.01)
+    server = create_server("127.0.0.1", 0, service)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    
+    def post(payload):
+        request = urllib.request.Request(
+            f"http://127.0.0.1:{server.server_port}/generate",
+            data=json.dumps(payload).encode("utf-8"),
+            headers={"Content-Type": "application/json"}
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=10) as response:
+                return response.status, json.load(response)
+        except urllib.error.HTTPError as e:
+            return e.code, json.load(e)
+    
+    try:
+        status, body = post({"product_data": make_product()})
+        assert status == 200
+        expected = orchestrator.generate_pages(make_product())
+        assert body["pages"] == as_json({page_type: page.to_dict() for page_type, page in expected.items()})
+        
+        status, body = post({"product_data": {"Price": "₹1"}})
+        assert status == 400 and "Missing required fields" in body["error"]
+    finally:
+        server.shutdown()
+        server.server_close()
+        service.close()
+
+
+def test_manifest_recovers_from_torn_last_line():
+    """Entries appended after a torn line are kept and the count stays right."""
+    with tempfile.TemporaryDirectory() as output_dir:
+        manifest_path = os.path.join(output_dir, 'manifest.jsonl')
+        with ProgressManifest(manifest_path) as manifest:
+            manifest.record('a')
+            manifest.record('b', FAILED)
+        with open(manifest_path, 'a', encoding='utf-8') as f:
+            f.write('{"key": "c", "sta')
+        
+        with ProgressManifest(manifest_path) as manifest:
+            assert len(manifest) == 1
+            manifest.record('b')
+            manifest.record('d')
+            assert len(manifest) == 3
+        
+        reloaded = ProgressManifest(manifest_path)
+        assert len(reloaded) == 3
+        assert reloaded.is_completed('d') and not reloaded.is_completed('c')
+
+
+def test_work_queue_bounds_attempts_and_renews_leases():
+    """Expired leases are retried up to max_attempts, and a renewed lease is not reclaimed."""
+    with tempfile.TemporaryDirectory() as output_dir:
+        work_queue = SQLiteWorkQueue(os.path.join(output_dir, 'queue.db'),
+                                     lease_seconds=0, max_attempts=2)
+        try:
+            assert enqueue_catalog(work_queue, [make_product('Serum A'), make_product('Serum B')]) == 2
+            
+            # Lease expires at once: the second worker takes over, then the item is given up
+            [(key, _), _] = work_queue.claim('w1', 2)
+            assert len(work_queue.claim('w2', 2)) == 2
+            assert work_queue.claim('w3', 2) == []
+            assert work_queue.counts() == {'failed': 2}
+            assert work_queue.renew('w2', [key]) == 0
+        finally:
+            work_queue.close()
+        
+        work_queue = SQLiteWorkQueue(os.path.join(output_dir, 'renew.db'), lease_seconds=0)
+        try:
+            enqueue_catalog(work_queue, [make_product('Serum A')])
+            [(key, _)] = work_queue.claim('w1')
+            assert work_queue.renew('w1', [key], seconds=60) == 1
+            assert work_queue.renew('w2', [key], seconds=60) == 0
+            assert work_queue.claim('w2') == []
+        finally:
+            work_queue.close()
+
+
+def test_work_queue_records_invalid_rows_and_drains():
+    """Unparseable rows are queued as failed; a worker completes the rest."""
+    with tempfile.TemporaryDirectory() as output_dir:
+        work_queue = SQLiteWorkQueue(os.path.join(output_dir, 'queue.db'))
+        try:
+            records = [make_product('Serum A'), {'Price': '₹1'}, make_product('Serum B')]
+            assert enqueue_catalog(work_queue, records) == 3
+            assert work_queue.counts() == {'pending': 2, 'failed': 1}
+            
+            result = QueueWorker(work_queue, output_dir, worker_id='w1', batch_size=1).run()
+            assert result == {'completed': 2, 'failed': 0}
+            assert work_queue.counts() == {'done': 2, 'failed': 1}
+            assert work_queue.claim('w1') == []
+            key = ProductModel.from_raw_data({'name': 'Serum A'}).key
+            assert os.path.exists(os.path.join(output_dir, key, 'product_page.json'))
+        finally:
+            work_queue.close()
+
+
+def test_sqlite_store_commits_before_manifest_and_tracks_changes():
+    """Manifest entries only name committed pages; unchanged pages keep their changed run."""
+    records = [make_product(f"Serum {i}") for i in range(5)]
+    
+    with tempfile.TemporaryDirectory() as output_dir:
+        store_path = os.path.join(output_dir, 'pages.db')
+        store = SQLitePageStore(store_path)
+        with ProgressManifest(os.path.join(output_dir, 'manifest.jsonl'), flush_every=2) as manifest:
+            OrchestratorAgent().process_batch(records, output_dir, manifest=manifest, writer=store)
+            # Read through a second connection before the store is closed
+            reader = SQLitePageStore(store_path, start_run=False)
+            keys = {key for key, _, _ in reader.changed_since(0)}
+            assert keys == {ProductModel.from_raw_data({'name': f"Serum {i}"}).key for i in range(5)}
+            reader.close()
+        store.close()
+        first_run = store.run_id
+        
+        store = SQLitePageStore(store_path)
+        OrchestratorAgent().process_batch(
+            records[:4] + [make_product('Serum 4', price='₹799')], output_dir, writer=store
+        )
+        store.close()
+        
+        reader = SQLitePageStore(store_path, start_run=False)
+        try:
+            assert reader.latest_run_id() == store.run_id
+            changed = list(reader.changed_since(first_run))
+            assert {key for key, _, _ in changed} == {ProductModel.from_raw_data({'name': 'Serum 4'}).key}
+            key, page_type, page_hash = changed[0]
+            assert (key, page_type) in reader.find_by_hash(page_hash)
+            assert reader.get_page(key, 'product')
+        finally:
+            reader.close()
+
+
+def test_json_patch_round_trips():
+    """Patches rebuild the new document exactly, keeping bools and numbers apart."""
+    cases = [
+        ({'a': {'b': [1, 2, 3], 'c': 'x'}}, {'a': {'b': [1, 2], 'c': 'y', 'd': {'e': None}}}),
+        ({'items': [{'n': 1}]}, {'items': [{'n': 1}, {'n': 2}, {'n': 3}]}),
+        ({'keep': 1, 'drop': [1], 'a/b~c': 0}, {'keep': 1, 'a/b~c': 1}),
+        ({'flag': 1, 'count': 1, 'list': [0]}, {'flag': True, 'count': 1.0, 'list': [False]}),
+        ([1, 2], {'now': 'object'}),
+    ]
+    for old, new in cases:
+        patched = apply_patch(old, make_patch(old, new))
+        assert json.dumps(patched, sort_keys=True) == json.dumps(new, sort_keys=True)
+    assert make_patch({'a': [1, {'b': 2}]}, {'a': [1, {'b': 2}]}) == []
+    assert make_patch({'a': 1}, {'a': True}) == [{'op': 'replace', 'path': '/a', 'value': True}]
+    # A stored page read back from JSON matches the shared summary it was written from
+    summary = ComparisonFacts.from_product(ProductModel.from_raw_data({'name': 'Serum A'})).summary
+    assert make_patch(as_json({'s': summary}), {'s': summary}) == []
+
+
+def test_delta_patches_replay_in_file_order():
+    """Patches apply against the store's latest version, even within one run."""
+    versions = [{'items': [1, 2, 3], 'name': 'a'}, {'items': [1]}, {'items': [1, 2], 'name': 'b'}]
+    
+    def pages(content):
+        return {'product': GeneratedPage(page_type='product', content=content, metadata={})}
+    
+    with tempfile.TemporaryDirectory() as output_dir:
+        store_path = os.path.join(output_dir, 'pages.db')
+        with SQLitePageStore(store_path) as store:
+            store.write('serum', pages(versions[0]))
+        
+        patch_path = os.path.join(output_dir, 'delta.ndjson')
+        with DeltaWriter(SQLitePageStore(store_path), patch_path) as writer:
+            for content in versions[1:]:
+                writer.write('serum', pages(content))
+        assert writer.patched == 2
+        
+        document = versions[0]
+        with open(patch_path, encoding='utf-8') as f:
+            for line in f:
+                document = apply_patch(document, json.loads(line)['patch'])
+        assert document == versions[-1]
+
+
+def test_compact_catalog_round_trips_across_resets_and_resume():
+    """Decoded pages match the originals when the table resets and a run is resumed."""
+    orchestrator = OrchestratorAgent()
+    # Two distinct products, so most FAQ text repeats and fills the table
+    generated = {f"serum-{i}": orchestrator.generate_pages(make_product(f"Serum {i % 2}")) for i in range(6)}
+    
+    with tempfile.TemporaryDirectory() as output_dir:
+        path = os.path.join(output_dir, 'catalog.ndjson')
+        keys = list(generated)
+        with CompactCatalogWriter(path, table_limit=32) as writer:
+            for key in keys[:3]:
+                writer.write(key, generated[key])
+            assert 0 < len(writer.table)
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write('{"k": "torn')
+        with CompactCatalogWriter(path, table_limit=32) as writer:
+            for key in keys[3:]:
+                writer.write(key, generated[key])
+        
+        decoded = {}
+        for key, page in expand_catalog(path):
+            decoded.setdefault(key, {})[page.page_type] = page.content
+        assert decoded == as_json({
+            key: {page_type: page.content for page_type, page in pages.items()}
+            for key, pages in generated.items()
+        })
+        with open(path, encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        assert sum(1 for line in lines if '"r":1' in line) >= 3
+
+
+def test_compressed_shards_are_durable_on_flush_and_resume_in_new_shards():
+    """Every codec round-trips; flushed pages are readable and a resumed run adds shards."""
+    pages = OrchestratorAgent().generate_pages(make_product())
+    openers = {'.gz': gzip.open, '.bz2': bz2.open, '.xz': lzma.open}
+    
+    def read_keys(output_dir, suffix):
+        keys = []
+        for name in sorted(os.listdir(output_dir)):
+            if name.endswith(suffix):
+                with openers[suffix](os.path.join(output_dir, name), 'rt', encoding='utf-8') as f:
+                    keys.extend(json.loads(line)['product_key'] for line in f)
+        return keys
+    
+    for codec, (suffix, _) in CODECS.items():
+        with tempfile.TemporaryDirectory() as output_dir:
+            writer = CompressedStreamWriter(output_dir, codec, shard_size=2, threaded=True)
+            for key in ('a', 'b', 'c'):
+                writer.write(key, pages)
+            writer.flush()
+            assert read_keys(output_dir, suffix) == ['a'] * 3 + ['b'] * 3 + ['c'] * 3
+            writer.write('d', pages)
+            writer.close()
+            
+            with CompressedStreamWriter(output_dir, codec, shard_size=2) as writer:
+                locations = writer.write('e', pages)
+            assert locations['faq'].endswith(f"pages-00002.ndjson{suffix}")
+            assert read_keys(output_dir, suffix) == [key for key in 'abcde' for _ in range(3)]
+
+
+class _MemoryWriter(OutputWriter):
+    """Keeps pages in memory and fails products whose key contains ``broken``."""
+    
+    def __init__(self):
+        self.pages = {}
+    
+    def write(self, product_key, generated_pages, digest=None):
+        if 'broken' in product_key:
+            raise IOError("disk full")
+        self.pages.setdefault(product_key, {}).update(generated_pages)
+        return {}
+
+
+def test_aggregates_skip_failed_writes_and_split_currencies():
+    """Aggregate pages list only written products and keep currencies apart."""
+    records = [make_product('Serum A', '₹699'), make_product('Broken Serum', '₹99'),
+               make_product('Serum B', '₹899'), make_product('Serum C', '$20')]
+    
+    for orchestrator in (OrchestratorAgent(), AsyncOrchestratorAgent()):
+        writer = _MemoryWriter()
+        with tempfile.TemporaryDirectory() as output_dir:
+            result = orchestrator.process_batch(records, output_dir, writer=writer, aggregate=True)
+        assert result["completed"] == 3 and len(result["failed"]) == 1
+        
+        summary = writer.pages['_aggregates']['product-type-serum'].content['summary']
+        names = [p['name'] for p in writer.pages['_aggregates']['product-type-serum'].content['products']]
+        assert sorted(names) == ['Serum A', 'Serum B', 'Serum C']
+        assert summary['price_range'] == {'min': '₹699', 'max': '₹899'}
+        assert summary['price_ranges']['$'] == {'min': '$20', 'max': '$20'}
+
+
+def test_multi_comparison_block_ranks_competitors_and_shares_summaries():
+    """The multi-comparison block ranks by price and shares one immutable summary per product."""
+    def product(name, price, ingredients):
+        return ProductModel.from_raw_data({'name': name, 'price': price, 'key_ingredients': ingredients,
+                                           'benefits': 'Brightening', 'skin_type': 'Oily'})
+    
+    primary = product('Serum A', '₹699', 'Vitamin C, Hyaluronic Acid')
+    competitors = [ComparisonFacts.from_product(product('Serum B', '₹499', 'Vitamin C, Niacinamide')),
+                   ComparisonFacts.from_product(product('Serum C', '₹999', 'Vitamin C'))]
+    assert len({*competitors, *competitors}) == 2
+    
+    content = ContentLogicBlocks.generate_multi_comparison_block(primary, competitors).content
+    assert content['price_ranking'] == {'₹': ['Serum B', 'Serum A', 'Serum C']}
+    assert content['shared_ingredients'] == ['Vitamin C']
+    assert [c['competitor'] for c in content['comparisons']] == ['Serum B', 'Serum C']
+    assert content['products']['competitors'][0]['key_ingredients'] == ('Vitamin C', 'Niacinamide')
+    
+    # Summaries are built once per facts object, shared read-only, and encode as plain JSON
+    other = ContentLogicBlocks.generate_multi_comparison_block(primary, competitors).content
+    assert other['products']['competitors'][0] is competitors[0].summary
+    summary = content['products']['primary']
+    for mutate in (lambda: summary.update(name='Other'), lambda: summary.__setitem__('price', '₹1')):
+        try:
+            mutate()
+        except TypeError:
+            pass
+        else:
+            raise AssertionError("a shared summary was modified")
+    assert summary['key_ingredients'] == ('Vitamin C', 'Hyaluronic Acid')
+    assert json.loads(json.dumps(summary))['key_ingredients'] == ['Vitamin C', 'Hyaluronic Acid']
+    assert hash(summary) == hash(ComparisonFacts.from_product(primary).summary)
+    
+    # Prices in another currency are ranked on their own, never against rupees
+    mixed = [product('Rival', '$30', 'Vitamin C'), product('Other', '₹100', 'Vitamin C')]
+    content = ContentLogicBlocks.generate_multi_comparison_block(primary, mixed).content
+    assert content['price_ranking'] == {'₹': ['Other', 'Serum A'], '$': ['Rival']}
+
+
+def test_english_locale_matches_default_output():
+    """Pages for locale ``en`` equal the pages written without locales, serial and async."""
+    records = [make_product('Serum A'), make_product('Serum B', '₹799')]
+    
+    def stable(all_pages, suffix=''):
+        return {
+            key[:len(key) - len(suffix)]: {
+                page_type: {k: v for k, v in page.content.items() if k != 'metadata'}
+                for page_type, page in pages.items()
+            }
+            for key, pages in all_pages.items() if key.endswith(suffix)
+        }
+    
+    for orchestrator in (OrchestratorAgent(), AsyncOrchestratorAgent()):
+        plain, localized = _MemoryWriter(), _MemoryWriter()
+        with tempfile.TemporaryDirectory() as output_dir:
+            orchestrator.process_batch(records, output_dir, writer=plain)
+            result = orchestrator.process_batch(records, output_dir, writer=localized, locales=['en', 'es'])
+        assert result["completed"] == 2
+        assert stable(localized.pages, '/en') == stable(plain.pages)
+        assert sum(key.endswith('/es') for key in localized.pages) == 2
+
+
+def as_json(value):
+    """``value`` as it reads back from JSON; shared summaries hold tuples, which come back as lists."""
+    return json.loads(json.dumps(value, ensure_ascii=False))
+
+
+def run_cli(*argv):
+    """Run the CLI in-process; returns ``(exit code, stdout, stderr)``."""
+    stdout, stderr = io.StringIO(), io.StringIO()
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        code = main(list(argv))
+    return code, stdout.getvalue(), stderr.getvalue()
+
+
+def test_cli_batch_and_validate_smoke():
+    """batch and validate run end to end; conflicting flags are rejected with exit code 2."""
+    with tempfile.TemporaryDirectory() as output_dir:
+        feed = os.path.join(output_dir, 'feed.jsonl')
+        with open(feed, 'w', encoding='utf-8') as f:
+            for record in (make_product('Serum A'), {'Price': '₹1'}, make_product('Serum B')):
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        
+        code, out, _ = run_cli('validate', feed)
+        assert code == 1 and 'Valid: 2  Invalid: 1' in out
+        
+        pages_dir = os.path.join(output_dir, 'pages')
+        code, out, _ = run_cli('batch', feed, '--output-dir', pages_dir, '--writer', 'sqlite')
+        assert code == 1 and 'Completed: 2  Failed: 1' in out
+        assert os.path.exists(os.path.join(pages_dir, 'pages.db'))
+        
+        code, _, err = run_cli('batch', feed, '--fingerprints', os.path.join(output_dir, 'fp'), '--aggregate')
+        assert code == 2 and '--aggregate' in err
+    
+    try:
+        MemoryBudget.from_megabytes(0)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("a zero memory budget was accepted")
+    assert MemoryBudget.from_megabytes(None).limit is None
+
+
+def test_spill_index_stays_within_budget():
+    """Spill index entries are charged to the budget, which is never overdrawn."""
+    budget = MemoryBudget(4096)
+    lists = [SpillableList(budget) for _ in range(50)]
+    for i in range(2000):
+        lists[i % 50].append(('product', i))
+        assert budget.used <= budget.limit
+    lists[0].append('x' * 10000)
+    assert budget.used <= budget.limit
+    
+    assert [item for _, item in lists[1]] == list(range(1, 2000, 50))
+    assert list(lists[0])[-1] == 'x' * 10000
+    for spillable in lists:
+        spillable.close()
+    assert budget.used == 0
+    budget.close()
+
+
+def test_json_writer_fsyncs_pages_before_manifest_records_them():
+    """With a manifest, every page file is fsynced before its product is recorded."""
+    records = [make_product(f"Serum {i}") for i in range(5)]
+    synced = []
+    real_fsync = os.fsync
+    
+    def recording_fsync(fd):
+        synced.append(os.readlink(f"/proc/self/fd/{fd}") if os.path.exists("/proc/self/fd") else fd)
+        real_fsync(fd)
+    
+    with tempfile.TemporaryDirectory() as output_dir:
+        manifest_path = os.path.join(output_dir, 'manifest.jsonl')
+        os.fsync = recording_fsync
+        try:
+            with ProgressManifest(manifest_path, flush_every=2) as manifest:
+                OrchestratorAgent().process_batch(records, output_dir, manifest=manifest)
+        finally:
+            os.fsync = real_fsync
+        
+        for record in records:
+            key = ProductModel.from_raw_data({'name': record['Product Name']}).key
+            for filename in ('faq.json', 'product_page.json', 'comparison_page.json'):
+                path = os.path.join(output_dir, key, filename)
+                assert os.path.realpath(path) in synced or not os.path.exists("/proc/self/fd")
+        
+        # Without a manifest nothing asks for durability, so nothing is tracked
+        writer = OrchestratorAgent().create_writer(output_dir)
+        writer.write('plain', OrchestratorAgent().generate_pages(records[0]))
+        assert not writer._unsynced
+
+
+def test_queue_workers_use_the_configured_settings():
+    """Worker processes build their pipeline and writer from --config."""
+    with tempfile.TemporaryDirectory() as output_dir:
+        config_path = os.path.join(output_dir, 'config.json')
+        with open(config_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'agents': {'template_engine': {'templates': ['product']}},
+                'output': {'indent': None, 'include_metadata': False}
+            }, f)
+        feed_path = os.path.join(output_dir, 'feed.jsonl')
+        with open(feed_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(make_product('Serum A')) + '\n')
+        
+        code, stdout, _ = run_cli('--config', config_path, 'work', os.path.join(output_dir, 'queue.db'),
+                                  '--feed', feed_path,
+                                  '--output-dir', output_dir, '--processes', '1')
+        assert code == 0 and 'Done: 1' in stdout
+        
+        product_dir = os.path.join(output_dir, ProductModel.from_raw_data({'name': 'Serum A'}).key)
+        assert os.listdir(product_dir) == ['product_page.json']
+        with open(os.path.join(product_dir, 'product_page.json'), encoding='utf-8') as f:
+            text = f.read()
+        assert '\n' not in text and 'metadata' not in json.loads(text)
+
+
+def test_malformed_feed_lines_fail_one_record():
+    """A line that is not JSON is one invalid record for validate, batch and work."""
+    with tempfile.TemporaryDirectory() as output_dir:
+        feed = os.path.join(output_dir, 'feed.jsonl')
+        with open(feed, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(make_product('Serum A'), ensure_ascii=False) + '\n')
+            f.write('{"Product Name": "Serum B", \n')
+            f.write(json.dumps(make_product('Serum C'), ensure_ascii=False) + '\n')
+        
+        code, out, _ = run_cli('validate', feed)
+        assert code == 1 and 'Valid: 2  Invalid: 1' in out and '#1: Malformed JSON record' in out
+        
+        for extra in ((), ('--async',)):
+            pages_dir = os.path.join(output_dir, 'pages', *extra)
+            code, out, _ = run_cli('batch', feed, '--output-dir', pages_dir, *extra)
+            assert code == 1 and 'Completed: 2  Failed: 1' in out
+        
+        work_queue = SQLiteWorkQueue(os.path.join(output_dir, 'queue.db'))
+        try:
+            assert enqueue_catalog(work_queue, iter_feed(feed)) == 3
+            assert work_queue.counts() == {'pending': 2, 'failed': 1}
+        finally:
+            work_queue.close()
+
+
+def test_catalog_index_spills_whole_groups_within_budget():
+    """Many small groups with real FAQs stay under the budget and merge back like an unbounded index."""
+    questions = QuestionGeneratorAgent()
+    
+    def fill(index):
+        for i in range(5000):
+            product = ProductModel(
+                f"Product {i} Serum", "10% Vitamin C", ["Oily", "Dry"],
+                ["Vitamin C", f"Extract {i}"], ["Brightening"], "Apply daily", "None", f"₹{i}"
+            )
+            index.add(product, questions.process(product))
+            assert index.budget.limit is None or index.budget.used <= index.budget.limit
+    
+    budget = MemoryBudget(256 * 1024)
+    index, unbounded = CatalogIndex(budget), CatalogIndex()
+    tracemalloc.start()
+    fill(index)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    fill(unbounded)
+    
+    try:
+        assert budget.spilled > 0 and peak < budget.limit
+        assert len(index) == len(unbounded) == 5006
+        blocks = generate_aggregate_blocks(index)
+        expected = generate_aggregate_blocks(unbounded)
+        assert {k: b.content for k, b in blocks.items()} == {k: b.content for k, b in expected.items()}
+        extract = blocks["ingredient-extract-4321"].content
+        assert extract["product_count"] == 1 and extract["price_range"] == {"min": "₹4321", "max": "₹4321"}
+        assert extract["shared_faqs"]
+        assert [p["name"] for p in blocks["product-type-serum"].content["products"]][:2] == \
+            ["Product 0 Serum", "Product 1 Serum"]
+    finally:
+        index.close()
+        unbounded.close()
+
+
+def test_fingerprint_index_is_discarded_when_settings_change():
+    """A fingerprint index only skips records generated under the same settings and options."""
+    with tempfile.TemporaryDirectory() as output_dir:
+        feed_path = os.path.join(output_dir, 'feed.jsonl')
+        with open(feed_path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(json.dumps(make_product(f"Serum {i}"), ensure_ascii=False) for i in range(3)))
+        config_path = os.path.join(output_dir, 'config.json')
+        with open(config_path, 'w', encoding='utf-8') as f:
+            json.dump({'output': {'include_metadata': False}}, f)
+        index_path = os.path.join(output_dir, 'feed.fp')
+        pages_dir = os.path.join(output_dir, 'pages')
+        
+        def run_batch(*flags):
+            code, out, _ = run_cli(*flags, 'batch', feed_path, '--fingerprints', index_path,
+                                   '--output-dir', pages_dir)
+            assert code == 0
+            return out.splitlines()[0]
+        
+        assert run_batch() == 'Unchanged: 0 of 3'
+        assert run_batch() == 'Unchanged: 3 of 3'
+        assert run_batch('--config', config_path) == 'Unchanged: 0 of 3'
+        assert run_batch('--config', config_path) == 'Unchanged: 3 of 3'
+        
+        # Generation options other than the config count too
+        code, out, _ = run_cli('--config', config_path, 'batch', feed_path, '--fingerprints', index_path,
+                               '--output-dir', pages_dir, '--locales', 'en')
+        assert code == 0 and out.startswith('Unchanged: 0 of 3')
+        assert FingerprintFilter(index_path, {'other': 'options'}).previous == set()
+
+
 if __name__ == "__main__":
-    test_system()
\ No newline at end of file
+    test_system()
+    test_async_batch_matches_serial_output()
+    test_batch_resumes_from_manifest()
+    test_disabled_stages_are_skipped()
+    test_catalog_index_spills_beyond_memory_budget()
+    test_content_logic_batch_matches_per_product()
+    test_streamed_pages_match_generated_pages()
+    test_fingerprints_pass_only_changed_records()
+    test_product_keys_do_not_collide()
+    test_progress_reporter_counts_and_rate_limits()
+    test_setup_logging_writes_through_queue_listener()
+    test_micro_batcher_flushes_on_size_and_time()
+    test_generation_service_http_round_trip()
+    test_manifest_recovers_from_torn_last_line()
+    test_work_queue_bounds_attempts_and_renews_leases()
+    test_work_queue_records_invalid_rows_and_drains()
+    test_sqlite_store_commits_before_manifest_and_tracks_changes()
+    test_json_patch_round_trips()
+    test_delta_patches_replay_in_file_order()
+    test_compact_catalog_round_trips_across_resets_and_resume()
+    test_compressed_shards_are_durable_on_flush_and_resume_in_new_shards()
+    test_aggregates_skip_failed_writes_and_split_currencies()
+    test_multi_comparison_block_ranks_competitors_and_shares_summaries()
+    test_english_locale_matches_default_output()
+    test_cli_batch_and_validate_smoke()
+    test_spill_index_stays_within_budget()
+    test_json_writer_fsyncs_pages_before_manifest_records_them()
+    test_queue_workers_use_the_configured_settings()
+    test_malformed_feed_lines_fail_one_record()
+    test_catalog_index_spills_whole_groups_within_budget()
+    test_fingerprint_index_is_discarded_when_settings_change()